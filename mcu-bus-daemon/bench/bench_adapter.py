@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+BusEvent -> proto conversion cost per event: previous adapter (datetime,
+Timestamp, sub-messages and CopyFrom) vs fields filled in place.
+
+    PYTHONPATH=src python bench/bench_adapter.py
+"""
+
+import time
+import timeit
+
+from datetime import datetime, timedelta, timezone
+
+from domain.mcu_bus import BusEvent, SensorDataEvent, ControlStatusEvent, AlertEvent
+from generated.mcubus.v1 import events_pb2
+from google.protobuf.timestamp_pb2 import Timestamp
+from infrastructure.servicer.bus_enevt_adapter import to_proto
+
+N = 100_000
+
+
+def to_proto_before(event: BusEvent, timestamp: datetime) -> events_pb2.BusEvent:
+    """
+    The previous to_proto, fed the naive UTC datetime BusEvent used to carry.
+    """
+    proto = events_pb2.BusEvent(event_id=event.event_id, module_id=event.module_id, seq=event.seq)
+
+    ts = Timestamp()
+    ts.FromDatetime(timestamp.replace(tzinfo=timezone.utc))
+    proto.timestamp.CopyFrom(ts)
+
+    payload = event.payload
+    match payload:
+        case SensorDataEvent():
+            proto.sensor_data.CopyFrom(
+                events_pb2.SensorData(
+                    temperature=payload.temperature,
+                    humidity=payload.humidity,
+                    soil_moisture=payload.soil_moisture,
+                    light_level=payload.light_level,
+                    water_level=payload.water_level,
+                    ph_value=payload.ph_value,
+                )
+            )
+        case ControlStatusEvent():
+            proto.control_status.CopyFrom(
+                events_pb2.ControlStatus(
+                    device=payload.device,
+                    is_active=payload.is_active,
+                    power_level=payload.power_level,
+                    reason=payload.reason,
+                )
+            )
+        case AlertEvent():
+            proto.alert.CopyFrom(
+                events_pb2.AlertEvent(severity=payload.severity, code=payload.code, message=payload.message)
+            )
+    return proto
+
+
+def per_call_ns(fn, *args) -> float:
+    return min(timeit.repeat(lambda: fn(*args), number=N, repeat=3)) / N * 1e9
+
+
+def main():
+    # Whole microseconds, so the datetime holds the same instant
+    now_ns = time.time_ns() // 1000 * 1000
+    timestamp = datetime(1970, 1, 1) + timedelta(microseconds=now_ns // 1000)
+    payloads = {
+        "sensor_data": SensorDataEvent(25.0, 60.0, 50.0, 800.0, 75.0, 6.5),
+        "control_status": ControlStatusEvent("water_pump", True, 80.0, "auto_regulation"),
+        "alert": AlertEvent("warning", "LOW_WATER", "Water level below 30%"),
+    }
+
+    print(f"{'payload':>16} {'before ns':>10} {'after ns':>10} {'speedup':>8}")
+    for kind, payload in payloads.items():
+        event = BusEvent("mcu_1_1767225600000000", "mcu_1", now_ns, payload, seq=123456)
+
+        assert to_proto_before(event, timestamp) == to_proto(event)
+
+        before = per_call_ns(lambda: to_proto_before(event, timestamp).SerializeToString())
+        after = per_call_ns(lambda: to_proto(event).SerializeToString())
+        print(f"{kind:>16} {before:>10.0f} {after:>10.0f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
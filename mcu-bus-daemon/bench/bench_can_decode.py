@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+CAN decode throughput on one core, best of 5 runs: previous per-type unpack functions
+(before), catalogue single-frame decode and catalogue batch decode.
+
+Traffic mix is mostly sensor data from 32 MCUs with some control/alert frames.
+
+    PYTHONPATH=src python bench/bench_can_decode.py
+"""
+
+import random
+import struct
+import time
+
+from datetime import datetime, timezone
+
+from domain.mcu_bus import BusEvent, SensorDataEvent
+from infrastructure.bus.can_codec import (
+    decode_frame,
+    decode_frames,
+    SENSOR_DATA_ID,
+    CONTROL_STATUS_ID,
+    ALERT_ID,
+)
+
+NODES = 32
+BATCH = 64
+
+
+def decode_before(arbitration_id: int, data: bytes, timestamp: float) -> BusEvent:
+    """
+    The previous decoder for sensor frames: struct.unpack_from on a format
+    string and a datetime per frame.
+    """
+    temperature, humidity, soil, light, water, ph = struct.unpack_from("<hBBHBB", data)
+    module_id = f"mcu_{arbitration_id & 0x7F}"
+    return BusEvent(
+        event_id=f"{module_id}_{int(timestamp * 1_000_000)}",
+        module_id=module_id,
+        timestamp_ns=int(datetime.fromtimestamp(timestamp, timezone.utc).timestamp() * 1e9),
+        payload=SensorDataEvent(
+            temperature * 0.01, humidity * 0.5, soil * 0.5, float(light), water * 0.5, ph * 0.1,
+        ),
+    )
+
+
+def build_frames(n: int, sensor_only: bool = False) -> list:
+    rng = random.Random(7)
+    now = time.time()
+    frames = []
+    for i in range(n):
+        node = i % NODES
+        roll = 0 if sensor_only else rng.random()
+        if roll < 0.9:
+            data = struct.pack("<hBBHBB", rng.randint(1500, 3000), 120, 90, rng.randint(0, 1000), 150, 65)
+            frames.append((SENSOR_DATA_ID | node, data, now))
+        elif roll < 0.97:
+            frames.append((CONTROL_STATUS_ID | node, struct.pack("<BBHB", 1, 1, 500, 1), now))
+        else:
+            frames.append((ALERT_ID | node, struct.pack("<BH", 1, 3), now))
+    return frames
+
+
+def measure(decode, frames, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        decode(frames)
+        best = min(best, time.perf_counter() - started)
+    return len(frames) / best
+
+
+def single(frames):
+    for frame in frames:
+        decode_frame(*frame)
+
+
+def batched(frames):
+    for i in range(0, len(frames), BATCH):
+        decode_frames(frames[i:i + BATCH])
+
+
+def before(frames):
+    for frame in frames:
+        decode_before(*frame)
+
+
+def main():
+    print(f"{'traffic':>12} {'decoder':>10} {'frames/s':>12}")
+    for label, frames in (("sensor", build_frames(50_000, sensor_only=True)), ("mixed", build_frames(50_000))):
+        if label == "sensor":
+            print(f"{label:>12} {'before':>10} {measure(before, frames):>12,.0f}")
+        print(f"{label:>12} {'single':>10} {measure(single, frames):>12,.0f}")
+        print(f"{label:>12} {'batch':>10} {measure(batched, frames):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
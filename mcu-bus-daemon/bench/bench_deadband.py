@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Report by exception on a stable greenhouse: modules report SensorData at
+1 Hz, values wander by sensor noise plus a slow drift and are quantized
+like the CAN frames. Shows the share of samples still published, the
+filter cost, and publish time with 10 subscribers with and without it.
+
+    PYTHONPATH=src python bench/bench_deadband.py
+"""
+
+import math
+import random
+import time
+
+from domain.deadband import DeadbandFilter
+from domain.event_queue import EventQueue
+from domain.mcu_bus import BusEvent, SensorDataEvent, Subscriber
+from infrastructure.bus.can_bus_handler import CanBusHandler
+
+MODULES = 50
+SECONDS = 3600
+
+# (base, noise sigma, drift amplitude over the day, CAN resolution)
+FIELDS = {
+    "temperature": (24.0, 0.05, 4.0, 0.01),
+    "humidity": (65.0, 0.3, 10.0, 0.5),
+    "soil_moisture": (50.0, 0.2, 5.0, 0.5),
+    "light_level": (800.0, 8.0, 300.0, 1.0),
+    "water_level": (75.0, 0.2, 2.0, 0.5),
+    "ph_value": (6.5, 0.01, 0.1, 0.1),
+}
+
+
+def samples() -> list:
+    random.seed(11)
+    start_ns = time.time_ns()
+    events = []
+    for second in range(SECONDS):
+        day = math.sin(2 * math.pi * second / 86_400)
+        for module in range(MODULES):
+            values = {
+                name: round((base + drift * day + random.gauss(0, sigma)) / step) * step
+                for name, (base, sigma, drift, step) in FIELDS.items()
+            }
+            module_id = f"mcu_{module}"
+            events.append(BusEvent(module_id, module_id, start_ns + second * 1_000_000_000, SensorDataEvent(**values)))
+    return events
+
+
+def publish_all(events: list, deadband) -> float:
+    handler = CanBusHandler()
+    for _ in range(10):
+        handler.handle_subscriber(Subscriber(queue=EventQueue(capacity=len(events))))
+
+    started = time.perf_counter()
+    for event in events:
+        if deadband is None or deadband.admit(event):
+            handler.publish(event)
+    return time.perf_counter() - started
+
+
+def main():
+    events = samples()
+
+    deadband = DeadbandFilter()
+    started = time.perf_counter()
+    passed = sum(deadband.admit(event) for event in events)
+    filter_ns = (time.perf_counter() - started) / len(events) * 1e9
+
+    print(f"{len(events):,} samples ({MODULES} modules, {SECONDS}s at 1 Hz)")
+    print(f"published {passed:,} ({passed / len(events):.1%}), suppressed {deadband.stats.suppressed:,}")
+    print(f"filter cost {filter_ns:.0f} ns/sample")
+
+    without = publish_all(events, None)
+    with_deadband = publish_all(events, DeadbandFilter())
+    print(f"publish to 10 subscribers: {without:.2f}s -> {with_deadband:.2f}s ({without / with_deadband:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
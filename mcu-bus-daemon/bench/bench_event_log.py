@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Event log append throughput vs a saturated 500 kbit/s CAN bus.
+Point --dir at the SD card to measure the real device.
+
+    PYTHONPATH=src python bench/bench_event_log.py --dir /var/lib/mcu-bus/bench
+"""
+
+import argparse
+import dataclasses
+import json
+import shutil
+import tempfile
+import time
+
+from pathlib import Path
+
+from domain.mcu_bus import BusEvent, SensorDataEvent
+from infrastructure.persistence.segmented_event_log import SegmentedEventLog, EventLogConfig
+from infrastructure.servicer.bus_enevt_adapter import encode
+
+# Standard 11-bit frame, 8 data bytes, no stuffing: 111 bits + 3 bits interframe space
+CAN_BITRATE = 500_000
+CAN_MAX_FRAMES_PER_S = CAN_BITRATE // (111 + 3)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dir", default=None, help="Log directory (default: a temp dir)")
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--commit-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    directory = Path(args.dir) if args.dir else Path(tempfile.mkdtemp(prefix="event-log-bench-"))
+    shutil.rmtree(directory, ignore_errors=True)
+
+    events = []
+    for i in range(args.events):
+        payload = SensorDataEvent(25.0, 60.0, 50.0, 800.0, 75.0, 6.5)
+        event = BusEvent(str(i), f"mcu_{i % 16}", time.time_ns(), payload, seq=i + 1)
+        events.append(dataclasses.replace(event, wire=encode(event)))
+
+    log = SegmentedEventLog(directory, EventLogConfig(commit_interval=args.commit_ms / 1000))
+    started = time.perf_counter()
+    for event in events:
+        log.append(event)
+    append_s = time.perf_counter() - started
+    log.close()
+    durable_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    replayed = sum(1 for _ in SegmentedEventLog(directory).replay())
+    replay_s = time.perf_counter() - started
+
+    durable_rate = log.appended / durable_s
+    print(json.dumps({
+        "events": args.events,
+        "dropped": log.dropped,
+        "commits": log.commits,
+        "append_calls_per_s": round(args.events / append_s),
+        "durable_events_per_s": round(durable_rate),
+        "replay_events_per_s": round(replayed / replay_s),
+        "can_max_frames_per_s": CAN_MAX_FRAMES_PER_S,
+        "headroom": round(durable_rate / CAN_MAX_FRAMES_PER_S, 1),
+    }, indent=2))
+
+    if not args.dir:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
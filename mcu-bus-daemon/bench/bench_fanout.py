@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Serialization cost per published event as subscribers are added:
+to_proto + SerializeToString per stream (before) vs encode once (after).
+
+    PYTHONPATH=src python bench/bench_fanout.py
+"""
+
+import time
+
+from domain.mcu_bus import BusEvent, SensorDataEvent
+from infrastructure.servicer.bus_enevt_adapter import to_proto, encode
+
+EVENTS = 2000
+
+
+def yield_to_stream(data: bytes) -> bytes:
+    return data
+
+
+def per_stream(event: BusEvent, subscribers: int) -> None:
+    for _ in range(subscribers):
+        yield_to_stream(to_proto(event).SerializeToString())
+
+
+def serialize_once(event: BusEvent, subscribers: int) -> None:
+    wire = encode(event)
+    for _ in range(subscribers):
+        yield_to_stream(wire)
+
+
+def measure(fanout, subscribers: int) -> float:
+    event = BusEvent("evt", "mcu_1", time.time_ns(), SensorDataEvent(25.0, 60.0, 50.0, 800.0, 75.0, 6.5))
+    started = time.process_time()
+    for _ in range(EVENTS):
+        fanout(event, subscribers)
+    return (time.process_time() - started) / EVENTS * 1e6
+
+
+def main():
+    print(f"{'subscribers':>12} {'before cpu us/evt':>18} {'after cpu us/evt':>17}")
+    for n in (1, 10, 50, 100):
+        print(f"{n:>12} {measure(per_stream, n):>18.1f} {measure(serialize_once, n):>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
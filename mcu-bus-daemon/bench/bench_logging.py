@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Log call overhead on the publish path: every publish logs one line, as a
+misbehaving module would. The sink stalls now and then like an SD card or
+a busy journald. Direct StreamHandler (before) vs queue handler, with and
+without rate limiting (after).
+
+    PYTHONPATH=src python bench/bench_logging.py
+"""
+
+import logging
+import queue
+import time
+
+from logging.handlers import QueueListener
+
+from domain.mcu_bus import BusEvent, SensorDataEvent
+from infrastructure.bus.can_bus_handler import CanBusHandler
+from infrastructure.logger import NonBlockingQueueHandler, RateLimitFilter
+from infrastructure.servicer.bus_enevt_adapter import encode
+
+EVENTS = 20_000
+
+# Every STALL_EVERY-th write to the sink takes STALL_SECONDS
+STALL_EVERY = 500
+STALL_SECONDS = 0.02
+
+logger = logging.getLogger("bench.publish")
+
+
+class StallingSink:
+    """
+    Discards what it is given, sometimes slowly.
+    """
+
+    def __init__(self, stall: bool):
+        self.stall = stall
+        self.writes = 0
+
+    def write(self, text: str) -> None:
+        self.writes += 1
+        if self.stall and self.writes % STALL_EVERY == 0:
+            time.sleep(STALL_SECONDS)
+
+    def flush(self) -> None:
+        ...
+
+
+def direct(sink: StallingSink):
+    return logging.StreamHandler(sink), None
+
+
+def queued(sink: StallingSink):
+    records = queue.Queue(10_000)
+    listener = QueueListener(records, logging.StreamHandler(sink))
+    listener.start()
+    return NonBlockingQueueHandler(records), listener
+
+
+def measure(setup, stall: bool, rate_limit: bool) -> dict:
+    sink = StallingSink(stall)
+    handler, listener = setup(sink)
+    handler.setFormatter(logging.Formatter("%(levelname)s: %(asctime)s [%(name)s] %(message)s"))
+    logger.handlers = [handler]
+    logger.filters = [RateLimitFilter(rate=100.0)] if rate_limit else []
+
+    bus = CanBusHandler(encoder=encode)
+    payload = SensorDataEvent(25.0, 60.0, 50.0, 800.0, 75.0, 6.5)
+    events = [BusEvent(str(i), f"mcu_{i % 50}", time.time_ns(), payload) for i in range(EVENTS)]
+
+    samples = []
+    for event in events:
+        started = time.perf_counter()
+        bus.publish(event)
+        logger.info("Published %s from %s", event.event_id, event.module_id)
+        samples.append(time.perf_counter() - started)
+
+    if listener:
+        listener.stop()
+    samples.sort()
+    return {
+        "mean_us": sum(samples) / len(samples) * 1e6,
+        "p99_us": samples[int(len(samples) * 0.99)] * 1e6,
+        "max_ms": samples[-1] * 1e3,
+        "written": sink.writes,
+        "dropped": getattr(handler, "dropped", 0),
+    }
+
+
+def main():
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+
+    cases = [
+        ("direct, fast sink", direct, False, False),
+        ("direct, stalling sink", direct, True, False),
+        ("queued, stalling sink", queued, True, False),
+        ("queued + rate limit", queued, True, True),
+    ]
+
+    print(f"{'':>24} {'mean us':>8} {'p99 us':>8} {'max ms':>7} {'written':>8} {'dropped':>8}")
+    for name, setup, stall, rate_limit in cases:
+        r = measure(setup, stall, rate_limit)
+        print(f"{name:>24} {r['mean_us']:>8.1f} {r['p99_us']:>8.1f} {r['max_ms']:>7.2f} "
+              f"{r['written']:>8} {r['dropped']:>8}")
+
+    # The floor: what publish costs when the line is filtered by level
+    logger.setLevel(logging.WARNING)
+    r = measure(direct, False, False)
+    print(f"{'disabled by level':>24} {r['mean_us']:>8.1f} {r['p99_us']:>8.1f} {r['max_ms']:>7.2f} "
+          f"{r['written']:>8} {r['dropped']:>8}")
+
+
+if __name__ == "__main__":
+    main()
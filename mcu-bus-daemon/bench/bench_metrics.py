@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Cost of metric updates, and what they add to one publish.
+
+    PYTHONPATH=src python bench/bench_metrics.py
+"""
+
+import time
+import timeit
+
+from domain.event_queue import EventQueue
+from domain.mcu_bus import Subscriber, BusEvent, SensorDataEvent
+from domain.metrics import MetricsRegistry
+from infrastructure.bus.can_bus_handler import CanBusHandler
+from infrastructure.servicer.bus_enevt_adapter import encode
+
+N = 500_000
+
+
+def per_call_ns(stmt, **namespace) -> float:
+    return min(timeit.repeat(stmt, globals=namespace, number=N, repeat=3)) / N * 1e9
+
+
+def main():
+    registry = MetricsRegistry()
+    counter = registry.counter("c_total", "c")
+    child = registry.counter("l_total", "l", ("type",)).labels("sensor_data")
+    histogram = registry.histogram("h_seconds", "h")
+
+    print(f"{'operation':>28} {'ns':>8}")
+    print(f"{'counter.inc()':>28} {per_call_ns('counter.inc()', counter=counter):>8.0f}")
+    print(f"{'labelled child.inc()':>28} {per_call_ns('child.inc()', child=child):>8.0f}")
+    print(f"{'histogram.observe()':>28} {per_call_ns('histogram.observe(0.0003)', histogram=histogram):>8.0f}")
+    print(
+        f"{'perf_counter pair + observe':>28} "
+        f"{per_call_ns('s = pc(); histogram.observe(pc() - s)', histogram=histogram, pc=time.perf_counter):>8.0f}"
+    )
+
+    # Instrumented publish, 10 subscribers, ~4 updates per event
+    handler = CanBusHandler(encoder=encode, metrics=registry)
+    for _ in range(10):
+        handler.handle_subscriber(Subscriber(queue=EventQueue(capacity=64)))
+    event = BusEvent("e", "mcu_1", time.time_ns(), SensorDataEvent(25.0, 60.0, 50.0, 800.0, 75.0, 6.5))
+    started = time.perf_counter()
+    for _ in range(50_000):
+        handler.publish(event)
+    publish_ns = (time.perf_counter() - started) / 50_000 * 1e9
+    print(f"{'publish, 10 subscribers':>28} {publish_ns:>8.0f}")
+
+    started = time.perf_counter()
+    for _ in range(100):
+        registry.render()
+    print(f"{'render (scrape)':>28} {(time.perf_counter() - started) / 100 * 1e9:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
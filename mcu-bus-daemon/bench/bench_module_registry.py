@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Lease bookkeeping cost: per-event admit (traffic renewal) and per-tick
+expiry with many registered modules, all alive and chatty, against a
+scan of every lease per tick.
+
+    PYTHONPATH=src python bench/bench_module_registry.py
+"""
+
+import random
+import timeit
+
+from application.module_registry import ModuleRegistry
+from infrastructure.bus.can_bus_handler import CanBusHandler
+
+TICK = 0.1
+LEASE = 30.0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def run(n_modules: int) -> tuple:
+    clock = FakeClock()
+    registry = ModuleRegistry(CanBusHandler(), default_lease=LEASE, tick=TICK, clock=clock)
+    module_ids = [f"mcu_{i}" for i in range(n_modules)]
+    for i, module_id in enumerate(module_ids):
+        # Spread the deadlines so every tick has some leases due
+        registry.register(module_id, lease=LEASE + i % 300 * TICK)
+
+    admit = registry.admit
+    sample = random.choices(module_ids, k=100_000)
+    admit_ns = min(timeit.repeat(lambda: [admit(m) for m in sample], number=1, repeat=3)) / len(sample) * 1e9
+
+    # Ten simulated minutes: every module sends an event each second, nothing expires
+    ticks = int(600 / TICK)
+    per_tick = n_modules // 10
+    tick_s = 0.0
+    for t in range(ticks):
+        clock.now += TICK
+        for module_id in module_ids[t % 10 * per_tick:(t % 10 + 1) * per_tick]:
+            admit(module_id)
+        tick_s += timeit.timeit(registry.expire, number=1)
+
+    assert len(registry) == n_modules
+
+    # What a tick would cost scanning every lease instead
+    leases = registry.modules()
+    scan_s = min(timeit.repeat(lambda: [l for l in leases if l.expires_at <= clock.now], number=100, repeat=3)) / 100
+    return admit_ns, tick_s / ticks * 1e6, scan_s * 1e6
+
+
+def main():
+    random.seed(5)
+    print(f"{'modules':>8} {'admit ns':>9} {'tick us':>8} {'scan us':>8}")
+    for n_modules in (100, 1_000, 10_000):
+        admit_ns, tick_us, scan_us = run(n_modules)
+        print(f"{n_modules:>8} {admit_ns:>9.0f} {tick_us:>8.1f} {scan_us:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Subscriber throughput of the multi-process mode against the number of gRPC
+worker processes. This process is the ingest process: it publishes at a
+fixed rate into the shared event ring. The workers share one port and serve
+the subscriber streams, which client processes hold on one connection each,
+so the kernel spreads them over the workers. Scaling needs a free core per
+worker plus some for the clients.
+
+    PYTHONPATH=src python bench/bench_multiprocess.py
+    PYTHONPATH=src python bench/bench_multiprocess.py --workers 1 2 4 --subscribers 32 --mode aio
+"""
+
+import argparse
+import multiprocessing
+import re
+import socket
+import threading
+import time
+import urllib.request
+
+from typing import Dict, List
+
+import grpc
+
+from domain.mcu_bus import BusEvent, SensorDataEvent
+from generated.mcubus.v1 import mcu_bus_pb2_grpc
+from generated.mcubus.v1.messages_pb2 import SubscribeRequest
+from infrastructure.bus.ring_bus import RingBusHandler
+from infrastructure.bus.shm_ring import SharedEventRing
+from infrastructure.servicer.bus_enevt_adapter import encode
+from main import serve_worker
+
+QUEUE_CAPACITY = 4096
+CLIENT_PROCESSES = 4
+METRICS_BASE_PORT = 19300
+
+# Published per wakeup, the rest of the time the ingest process sleeps
+BURST = 100
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def scrape(port: int, name: str) -> float:
+    """
+    Value of an unlabelled metric on a worker, -1 while it is not up yet.
+    """
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=1) as response:
+            text = response.read().decode()
+    except OSError:
+        return -1
+    match = re.search(rf"^{name} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else -1
+
+
+def client(port: int, subscribers: int, warmup: float, duration: float, results) -> None:
+    """
+    Client process: one channel and stream per subscriber, counts events
+    received during the measurement window.
+    """
+    received = [0] * subscribers
+    calls = []
+
+    def consume(i: int, call):
+        try:
+            for _ in call:
+                received[i] += 1
+        except grpc.RpcError:
+            # Cancelled at the end of the run
+            pass
+
+    channels = [grpc.insecure_channel(f"127.0.0.1:{port}") for _ in range(subscribers)]
+    for i, channel in enumerate(channels):
+        call = mcu_bus_pb2_grpc.MCUBusServiceStub(channel).SubscribeEvents(SubscribeRequest())
+        calls.append(call)
+        threading.Thread(target=consume, args=(i, call), daemon=True).start()
+
+    time.sleep(warmup)
+    before = sum(received)
+    time.sleep(duration)
+    results.put(sum(received) - before)
+
+    for call in calls:
+        call.cancel()
+    for channel in channels:
+        channel.close()
+
+
+def publish(handler: RingBusHandler, rate: float, stop: threading.Event, published: List[int]) -> None:
+    event = BusEvent("evt", "mcu_1", time.time_ns(), SensorDataEvent(25.0, 60.0, 50.0, 800.0, 75.0, 6.5))
+    started = time.perf_counter()
+    n = 0
+    while not stop.is_set():
+        for _ in range(BURST):
+            handler.publish(event)
+        n += BURST
+        delay = started + n / rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    published.append(n)
+
+
+def run_case(workers: int, args) -> Dict:
+    context = multiprocessing.get_context("spawn")
+    port = free_port()
+    ring = SharedEventRing.create(16 * 1024 * 1024)
+    handler = RingBusHandler(ring, encoder=encode)
+
+    metrics_ports = [METRICS_BASE_PORT + i for i in range(workers)]
+    processes = [
+        context.Process(
+            target=serve_worker,
+            args=(i, ring.name),
+            kwargs=dict(
+                port=port,
+                mode=args.mode,
+                max_workers=args.subscribers + 4,
+                replay_options=dict(max_events=1000),
+                queue_options=dict(capacity=QUEUE_CAPACITY),
+                metrics_port=metrics_ports[i],
+            ),
+            daemon=True,
+        )
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    # Every worker relaying and its port bound, before any client connects
+    while any(scrape(p, "mcubus_ring_relayed_total") < 0 for p in metrics_ports):
+        time.sleep(0.1)
+    time.sleep(0.5)
+
+    stop, published = threading.Event(), []
+    publisher = threading.Thread(target=publish, args=(handler, args.rate, stop, published))
+    publisher.start()
+
+    results = context.Queue()
+    per_client = args.subscribers // CLIENT_PROCESSES
+    clients = [
+        context.Process(target=client, args=(port, per_client, args.warmup, args.duration, results), daemon=True)
+        for _ in range(CLIENT_PROCESSES)
+    ]
+    for process in clients:
+        process.start()
+
+    delivered = sum(results.get() for _ in clients)
+    spread = [int(scrape(p, "mcubus_subscribers_added_total")) for p in metrics_ports]
+
+    stop.set()
+    publisher.join()
+    lost = sum(int(scrape(p, "mcubus_ring_lost_total")) for p in metrics_ports)
+    for process in clients + processes:
+        process.terminate()
+    for process in clients + processes:
+        process.join()
+    ring.close()
+
+    return {
+        "workers": workers,
+        "subscribers": per_client * CLIENT_PROCESSES,
+        "spread": spread,
+        "published": published[0],
+        "ring_lost": lost,
+        "delivered_per_s": round(delivered / args.duration),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--subscribers", type=int, default=32, help="Split over 4 client processes")
+    parser.add_argument("--rate", type=float, default=5000, help="Events per second published")
+    parser.add_argument("--mode", choices=("thread", "aio"), default="aio")
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{multiprocessing.cpu_count()} cores, {args.rate:.0f} events/s, {args.mode} workers")
+    print(f"{'workers':>8} {'subs':>5} {'spread':>16} {'ring lost':>10} {'delivered/s':>12} {'scaling':>8}")
+    first = None
+    for workers in args.workers:
+        r = run_case(workers, args)
+        first = first or r["delivered_per_s"]
+        print(f"{r['workers']:>8} {r['subscribers']:>5} {str(r['spread']):>16} {r['ring_lost']:>10} "
+              f"{r['delivered_per_s']:>12} {r['delivered_per_s'] / first:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Publish cost with predicate subscribers: decoding and filtering in every
+consumer (before) vs predicates evaluated in publish, each distinct one
+once per event however many subscribers share it (after).
+
+    PYTHONPATH=src python bench/bench_predicates.py
+"""
+
+import random
+import time
+
+from domain.event_queue import EventQueue
+from domain.mcu_bus import BusEvent, SensorDataEvent, Subscriber
+from domain.predicate import compile_predicate
+from infrastructure.bus.can_bus_handler import CanBusHandler
+from infrastructure.servicer.bus_enevt_adapter import encode
+from generated.mcubus.v1 import events_pb2
+
+EVENTS = 2000
+SUBSCRIBERS = 500
+
+
+def predicates(distinct: int):
+    fields = ("temperature", "humidity", "water_level")
+    return [f"{fields[i % 3]} > {34 + i * 0.001:.3f}" for i in range(distinct)]
+
+
+def events():
+    rng = random.Random(1)
+    return [
+        BusEvent(str(i), f"mcu_{i % 50}", time.time_ns(),
+                 SensorDataEvent(rng.uniform(15, 35), rng.uniform(0, 35), 50.0, 800.0, rng.uniform(0, 35), 6.5))
+        for i in range(EVENTS)
+    ]
+
+
+def drain(subscribers) -> int:
+    delivered = 0
+    for subscriber in subscribers:
+        delivered += len(subscriber.queue.get_many(EVENTS, timeout=0))
+    return delivered
+
+
+def in_consumers(texts, evts) -> tuple:
+    # Every consumer gets every event, decodes it and checks its condition
+    handler = CanBusHandler(encoder=encode)
+    subscribers = [Subscriber(queue=EventQueue(capacity=EVENTS)) for _ in texts]
+    for s in subscribers:
+        handler.handle_subscriber(s)
+    tests = [compile_predicate(t).test for t in texts]
+
+    started = time.process_time()
+    delivered = 0
+    for event in evts:
+        handler.publish(event)
+    for subscriber, test in zip(subscribers, tests):
+        for event in subscriber.queue.get_many(EVENTS, timeout=0):
+            if test(events_pb2.BusEvent.FromString(event.wire).sensor_data):
+                delivered += 1
+    return (time.process_time() - started) / len(evts) * 1e6, delivered
+
+
+def in_publish(texts, evts) -> tuple:
+    handler = CanBusHandler(encoder=encode)
+    subscribers = [Subscriber(queue=EventQueue(capacity=EVENTS), predicate=compile_predicate(t)) for t in texts]
+    for s in subscribers:
+        handler.handle_subscriber(s)
+
+    started = time.process_time()
+    for event in evts:
+        handler.publish(event)
+    delivered = drain(subscribers)
+    return (time.process_time() - started) / len(evts) * 1e6, delivered
+
+
+def main():
+    evts = events()
+    print(f"{SUBSCRIBERS} subscribers, {EVENTS} events")
+    print(f"{'distinct':>9} {'consumers cpu us/evt':>21} {'publish cpu us/evt':>19} {'delivered':>10}")
+    for distinct in (1, 10, 100, SUBSCRIBERS):
+        texts = [predicates(distinct)[i % distinct] for i in range(SUBSCRIBERS)]
+        before, n_before = in_consumers(texts, evts)
+        after, n_after = in_publish(texts, evts)
+        assert n_before == n_after
+        print(f"{distinct:>9} {before:>21.1f} {after:>19.1f} {n_after:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Publish cost benchmark: broadcast-to-all (before) vs indexed routing (after).
+
+Every subscriber watches one module out of N, like one dashboard per MCU.
+
+    PYTHONPATH=src python bench/bench_publish.py
+"""
+
+import threading
+import time
+
+from domain.event_queue import EventQueue, OverflowPolicy
+from domain.mcu_bus import Subscriber, BusEvent, SensorDataEvent
+from infrastructure.bus.can_bus_handler import CanBusHandler
+
+MODULES = 50
+
+
+class BroadcastPublisher:
+    """
+    The previous BusHandler.publish: lock, copy, put into every queue.
+    """
+
+    def __init__(self, subscribers):
+        self._lock = threading.RLock()
+        self.subscribers = {s.id: s for s in subscribers}
+
+    def publish(self, event: BusEvent) -> None:
+        with self._lock:
+            subscribers = list(self.subscribers.values())
+
+        for subscriber in subscribers:
+            subscriber.queue.put(event)
+
+
+def build_subscribers(n: int) -> list:
+    return [
+        Subscriber(
+            queue=EventQueue(capacity=64, policy=OverflowPolicy.DROP_OLDEST),
+            module_ids={f"mcu_{i % MODULES}"},
+        )
+        for i in range(n)
+    ]
+
+
+def build_events(n: int) -> list:
+    payload = SensorDataEvent(25.0, 60.0, 50.0, 800.0, 75.0, 6.5)
+    return [
+        BusEvent(
+            event_id=str(i),
+            module_id=f"mcu_{i % MODULES}",
+            timestamp_ns=time.time_ns(),
+            payload=payload,
+        )
+        for i in range(n)
+    ]
+
+
+def measure(publish, events) -> float:
+    started = time.perf_counter()
+    for event in events:
+        publish(event)
+    return (time.perf_counter() - started) / len(events) * 1e6
+
+
+def main():
+    events = build_events(5000)
+    print(f"{'subscribers':>12} {'before us/evt':>14} {'after us/evt':>13} {'speedup':>8}")
+
+    for n in (1, 100, 1000):
+        before = BroadcastPublisher(build_subscribers(n))
+
+        after = CanBusHandler()
+        for subscriber in build_subscribers(n):
+            after.handle_subscriber(subscriber)
+
+        before_us = measure(before.publish, events)
+        after_us = measure(after.publish, events)
+        print(f"{n:>12} {before_us:>14.2f} {after_us:>13.2f} {before_us / after_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
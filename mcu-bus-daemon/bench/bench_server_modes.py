@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Thread-pool vs grpc.aio server: attach N streaming subscribers, publish a
+burst of events and measure delivery. A unary probe shows worker starvation.
+
+    PYTHONPATH=src python bench/bench_server_modes.py --subscribers 8 32 128
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+
+from concurrent import futures
+from functools import partial
+
+import grpc
+
+from application.module_registry import ModuleRegistry
+from domain.event_queue import EventQueue, AsyncEventQueue
+from domain.mcu_bus import BusEvent, SensorDataEvent
+from generated.mcubus.v1 import mcu_bus_pb2_grpc
+from generated.mcubus.v1.messages_pb2 import RegisterRequest, SubscribeRequest
+from infrastructure.bus.async_can_bus_handler import AsyncCanBusHandler
+from infrastructure.bus.can_bus_handler import CanBusHandler
+from infrastructure.servicer.async_mcu_bus_servicer import AsyncMCUBusServer
+from infrastructure.servicer.bus_enevt_adapter import encode
+from infrastructure.servicer.mcu_bus_servicer import MCUBusServer, add_mcu_bus_servicer_to_server
+
+QUEUE_CAPACITY = 100_000
+
+
+def start_thread_server(max_workers: int):
+    handler = CanBusHandler(encoder=encode)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+    add_mcu_bus_servicer_to_server(
+        MCUBusServer(
+            handler,
+            queue_factory=partial(EventQueue, capacity=QUEUE_CAPACITY),
+            module_registry=ModuleRegistry(handler),
+        ),
+        server,
+    )
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    return handler, port, lambda: server.stop(grace=None)
+
+
+def start_aio_server():
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    state = {}
+
+    async def run():
+        handler = AsyncCanBusHandler(loop, encoder=encode)
+        server = grpc.aio.server()
+        add_mcu_bus_servicer_to_server(
+            AsyncMCUBusServer(
+                handler,
+                queue_factory=partial(AsyncEventQueue, capacity=QUEUE_CAPACITY),
+                module_registry=ModuleRegistry(handler),
+            ),
+            server,
+        )
+        state.update(handler=handler, server=server, port=server.add_insecure_port("127.0.0.1:0"))
+        await server.start()
+        ready.set()
+        await server.wait_for_termination()
+
+    threading.Thread(target=loop.run_until_complete, args=(run(),), daemon=True).start()
+    ready.wait()
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(state["server"].stop(grace=None), loop).result()
+
+    return state["handler"], state["port"], stop
+
+
+def run_case(mode: str, subscribers: int, events: int, max_workers: int) -> dict:
+    if mode == "aio":
+        handler, port, stop = start_aio_server()
+    else:
+        handler, port, stop = start_thread_server(max_workers)
+
+    channel = grpc.insecure_channel(f"127.0.0.1:{port}")
+    stub = mcu_bus_pb2_grpc.MCUBusServiceStub(channel)
+    received = [0] * subscribers
+    done = threading.Event()
+    streams = []
+
+    def consume(i: int):
+        stream = stub.SubscribeEvents(SubscribeRequest())
+        streams.append(stream)
+        try:
+            for _ in stream:
+                received[i] += 1
+                if sum(received) >= subscribers * events:
+                    done.set()
+        except grpc.RpcError:
+            pass
+
+    for i in range(subscribers):
+        threading.Thread(target=consume, args=(i,), daemon=True).start()
+
+    deadline = time.monotonic() + 3
+    while len(handler.subscribers) < subscribers and time.monotonic() < deadline:
+        time.sleep(0.01)
+    attached = len(handler.subscribers)
+
+    # Unary probe: answered (UNIMPLEMENTED) or starved (DEADLINE_EXCEEDED)
+    try:
+        stub.Register(RegisterRequest(), timeout=1)
+        probe = "ok"
+    except grpc.RpcError as e:
+        probe = "ok" if e.code() == grpc.StatusCode.UNIMPLEMENTED else e.code().name
+
+    event = BusEvent("evt", "mcu_1", time.time_ns(), SensorDataEvent(25.0, 60.0, 50.0, 800.0, 75.0, 6.5))
+    started = time.perf_counter()
+    for _ in range(events):
+        handler.publish(event)
+    done.wait(timeout=30)
+    elapsed = time.perf_counter() - started
+
+    for stream in streams:
+        stream.cancel()
+    channel.close()
+    stop()
+
+    return {
+        "mode": mode,
+        "subscribers": subscribers,
+        "attached": attached,
+        "unary_probe": probe,
+        "delivered_per_s": round(sum(received) / elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[8, 32, 128])
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--max-workers", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'mode':>6} {'subs':>5} {'attached':>9} {'unary':>18} {'delivered/s':>12}")
+    for n in args.subscribers:
+        for mode in ("thread", "aio"):
+            r = run_case(mode, n, args.events, args.max_workers)
+            print(f"{r['mode']:>6} {r['subscribers']:>5} {r['attached']:>9} "
+                  f"{r['unary_probe']:>18} {r['delivered_per_s']:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Load generation and latency benchmark against the real MCUBusServer.
+
+MockEventGenerator builds a pool of mixed events, a paced publisher
+replays it at the target rate over many modules, N gRPC subscribers
+measure publish-to-receive latency. The result is one JSON document;
+pass --baseline with an earlier result to see the relative change.
+
+    PYTHONPATH=src python bench/loadgen.py --rate 20000 --subscribers 8 --duration 10
+    PYTHONPATH=src python bench/loadgen.py --stream batches --out run.json --baseline before.json
+    PYTHONPATH=src python bench/loadgen.py --fleet --modules 5000 --rate 20000
+"""
+
+import argparse
+import json
+import queue
+import random
+import resource
+import sys
+import threading
+import time
+
+from typing import Dict, List
+
+import grpc
+
+from bench_server_modes import start_aio_server, start_thread_server
+from domain.mcu_bus import BusEvent
+from generated.mcubus.v1 import mcu_bus_pb2_grpc
+from generated.mcubus.v1.messages_pb2 import SubscribeRequest, FlowRequest
+from infrastructure.servicer.bus_enevt_adapter import from_proto
+from mock_mcu_daemon import MockEventGenerator, MockMCUBusServicer
+
+POOL_SIZE = 4096
+
+# Credits a flow subscriber keeps outstanding, topped up every half window
+FLOW_WINDOW = 512
+
+# Keys compared by --baseline, (path, higher is better)
+COMPARED = (
+    (("throughput_events_per_s",), True),
+    (("latency_ms", "p50"), False),
+    (("latency_ms", "p99"), False),
+    (("latency_ms", "p999"), False),
+    (("cpu", "percent"), False),
+    (("rss_mb", "max"), False),
+)
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        mix[kind.strip()] = float(weight)
+    return mix
+
+
+def build_pool(mix: Dict[str, float], modules: int, seed: int) -> List:
+    """
+    Payloads from the mock generator, spread over module ids.
+    """
+    random.seed(seed)
+    generator = MockEventGenerator(MockMCUBusServicer())
+    makers = {
+        "sensor_data": generator.next_sensor_event,
+        "control_status": generator.next_control_event,
+        "alert": generator.next_alert_event,
+    }
+
+    kinds = random.choices(list(mix), weights=list(mix.values()), k=POOL_SIZE)
+    return [(f"mcu_{i % modules}", from_proto(makers[kind]()).payload) for i, kind in enumerate(kinds)]
+
+
+def build_fleet_pool(modules: int, seed: int) -> List:
+    """
+    Whole VirtualFleet ticks (readings plus failure alerts), at least POOL_SIZE events.
+    """
+    from mock_fleet import FleetConfig, VirtualFleet
+
+    fleet = VirtualFleet(FleetConfig(modules=modules, failure_rate=1e-3, seed=seed))
+    pool = []
+    while len(pool) < POOL_SIZE:
+        pool.extend((event.module_id, from_proto(event).payload) for event in fleet.tick_events())
+    return pool
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Subscriber(threading.Thread):
+    def __init__(self, stub, stream: str, sent_at: List[float]):
+        super().__init__(daemon=True)
+        self.stub = stub
+        self.stream_kind = stream
+        self.sent_at = sent_at
+        self.latencies: List[float] = []
+        self.call = None
+        self.started = threading.Event()
+
+    def run(self):
+        latencies, sent_at, clock = self.latencies, self.sent_at, time.perf_counter
+        try:
+            if self.stream_kind == "batches":
+                self.call = self.stub.SubscribeEventBatches(SubscribeRequest(max_batch_size=256, max_linger_ms=5))
+                self.started.set()
+                for batch in self.call:
+                    now = clock()
+                    latencies.extend(now - sent_at[int(event.event_id)] for event in batch.events)
+            elif self.stream_kind == "flow":
+                requests = queue.Queue()
+                requests.put(FlowRequest(subscribe=SubscribeRequest(), credits=FLOW_WINDOW))
+                self.call = self.stub.SubscribeEventsFlow(iter(requests.get, None))
+                self.started.set()
+                for n, event in enumerate(self.call, 1):
+                    latencies.append(clock() - sent_at[int(event.event_id)])
+                    if not n % (FLOW_WINDOW // 2):
+                        requests.put(FlowRequest(credits=FLOW_WINDOW // 2))
+            else:
+                self.call = self.stub.SubscribeEvents(SubscribeRequest())
+                self.started.set()
+                for event in self.call:
+                    latencies.append(clock() - sent_at[int(event.event_id)])
+        except grpc.RpcError:
+            # Cancelled at the end of the run
+            pass
+
+
+def publish_paced(handler, pool: List, rate: float, duration: float, sent_at: List[float]) -> int:
+    """
+    Publish pool events at rate per second for duration seconds.
+    Sleeps in small steps when ahead, publishes back to back when behind.
+    """
+    total = int(rate * duration)
+    clock = time.perf_counter
+    started = clock()
+    pool_size = len(pool)
+
+    for i in range(total):
+        due = started + i / rate
+        delay = due - clock()
+        if delay > 0.001:
+            time.sleep(delay)
+
+        module_id, payload = pool[i % pool_size]
+        event = BusEvent(str(i), module_id, time.time_ns(), payload)
+        sent_at[i] = clock()
+        handler.publish(event)
+    return total
+
+
+def cpu_seconds() -> tuple:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime, usage.ru_stime
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * resource.getpagesize() / 1024 / 1024
+
+
+def run(args) -> dict:
+    mix = parse_mix(args.mix)
+    pool = build_fleet_pool(args.modules, args.seed) if args.fleet else build_pool(mix, args.modules, args.seed)
+    total = int(args.rate * args.duration)
+    sent_at = [0.0] * total
+
+    if args.mode == "aio":
+        handler, port, stop = start_aio_server()
+    else:
+        handler, port, stop = start_thread_server(args.max_workers)
+
+    channel = grpc.insecure_channel(f"127.0.0.1:{port}")
+    stub = mcu_bus_pb2_grpc.MCUBusServiceStub(channel)
+    subscribers = [Subscriber(stub, args.stream, sent_at) for _ in range(args.subscribers)]
+    for subscriber in subscribers:
+        subscriber.start()
+        subscriber.started.wait()
+    deadline = time.monotonic() + 10
+    while len(handler.subscribers) < args.subscribers:
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"Only {len(handler.subscribers)} of {args.subscribers} subscribers connected")
+        time.sleep(0.01)
+
+    cpu_before, rss_before = cpu_seconds(), rss_mb()
+    started = time.perf_counter()
+    published = publish_paced(handler, pool, args.rate, args.duration, sent_at)
+    publish_elapsed = time.perf_counter() - started
+
+    # Let the streams drain
+    deadline = time.monotonic() + args.drain
+    expected = published * args.subscribers
+    while sum(len(s.latencies) for s in subscribers) < expected and time.monotonic() < deadline:
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - started
+    cpu_after, rss_after = cpu_seconds(), rss_mb()
+
+    for subscriber in subscribers:
+        subscriber.call.cancel()
+    dropped = sum(stats.dropped + stats.conflated for stats in handler.subscriber_stats().values())
+    channel.close()
+    stop()
+
+    latencies = sorted(latency * 1000 for s in subscribers for latency in s.latencies)
+    delivered = len(latencies)
+    cpu_used = (cpu_after[0] - cpu_before[0]) + (cpu_after[1] - cpu_before[1])
+
+    return {
+        "config": {
+            "mode": args.mode,
+            "stream": args.stream,
+            "rate": args.rate,
+            "duration_s": args.duration,
+            "subscribers": args.subscribers,
+            "modules": args.modules,
+            "mix": "fleet" if args.fleet else mix,
+        },
+        "published": published,
+        "publish_rate": published / publish_elapsed,
+        "delivered": delivered,
+        "delivery_ratio": delivered / expected if expected else 0.0,
+        "dropped": dropped,
+        "throughput_events_per_s": delivered / elapsed,
+        "latency_ms": {
+            "p50": percentile(latencies, 0.50),
+            "p99": percentile(latencies, 0.99),
+            "p999": percentile(latencies, 0.999),
+            "max": latencies[-1] if latencies else 0.0,
+            "mean": sum(latencies) / delivered if delivered else 0.0,
+        },
+        "cpu": {
+            "user_s": cpu_after[0] - cpu_before[0],
+            "system_s": cpu_after[1] - cpu_before[1],
+            "percent": cpu_used / elapsed * 100,
+        },
+        "rss_mb": {
+            "start": rss_before,
+            "end": rss_after,
+            "max": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        },
+    }
+
+
+def compare(result: dict, baseline: dict) -> None:
+    for path, higher_is_better in COMPARED:
+        now, before = result, baseline
+        for key in path:
+            now, before = now[key], before[key]
+        change = (now - before) / before * 100 if before else 0.0
+        better = (change > 0) == higher_is_better
+        verdict = "better" if better and change else "worse" if change else "same"
+        print(f"{'.'.join(path):>26} {before:>12.3f} -> {now:>12.3f} {change:>+8.1f}% {verdict}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=("thread", "aio"), default="thread")
+    parser.add_argument("--stream", choices=("events", "batches", "flow"), default="events")
+    parser.add_argument("--rate", type=float, default=5000, help="Published events per second")
+    parser.add_argument("--duration", type=float, default=5, help="Seconds of publishing")
+    parser.add_argument("--subscribers", type=int, default=4)
+    parser.add_argument("--modules", type=int, default=32, help="Distinct module ids events are spread over")
+    parser.add_argument("--fleet", action="store_true", help="Events from a simulated fleet of --modules MCUs")
+    parser.add_argument("--mix", default="sensor_data=0.9,control_status=0.07,alert=0.03")
+    parser.add_argument("--max-workers", type=int, default=64, help="Server threads in thread mode")
+    parser.add_argument("--drain", type=float, default=10, help="Max seconds to wait for delivery after publishing")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default=None, help="Write the JSON result here as well")
+    parser.add_argument("--baseline", default=None, help="Earlier JSON result to compare with")
+    args = parser.parse_args()
+
+    result = run(args)
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(result, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
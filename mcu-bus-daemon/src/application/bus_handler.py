@@ -1,46 +1,344 @@
+import itertools
 import threading
+import time
 
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from domain.mcu_bus import Subscriber, BusEvent
+from application.bus_metrics import BusMetrics
+from domain.event_log import EventLog
+from domain.event_queue import QueueStats
+from domain.latest_values import LatestValueStore
+from domain.mcu_bus import Subscriber, BusEvent, PAYLOAD_KINDS
+from domain.metrics import MetricsRegistry
+from domain.predicate import Predicate
+from domain.replay_ring import ReplayRing
+
+# Wildcard route key for subscribers without a module / event type filter
+ANY = "*"
+
+RouteKey = Tuple[str, str]
+Routes = Dict[RouteKey, Tuple[Subscriber, ...]]
+
+# Subscribers with a predicate, grouped by it: one evaluation per group and event
+PredicateGroups = Tuple[Tuple[Predicate, Tuple[Subscriber, ...]], ...]
+PredicateRoutes = Dict[RouteKey, PredicateGroups]
+
+
+def route_kinds(subscriber: Subscriber) -> Tuple[str, ...]:
+    """
+    Payload kinds a subscriber is routed on. A predicate narrows them to
+    the kinds having its fields, so other events never evaluate it.
+    """
+    predicate = subscriber.predicate
+    if predicate is None:
+        return tuple(subscriber.event_types) or (ANY,)
+    if subscriber.event_types:
+        return tuple(kind for kind in subscriber.event_types if kind in predicate.kinds)
+    return tuple(predicate.kinds)
+
+
+def route_keys(subscriber: Subscriber) -> Iterator[RouteKey]:
+    """
+    Every (module_id, payload kind) bucket a subscriber lives in.
+    An event matches exactly one bucket per subscriber, so no dedupe needed.
+    """
+    kinds = route_kinds(subscriber)
+    for module_id in subscriber.module_ids or (ANY,):
+        for kind in kinds:
+            yield module_id, kind
+
+
+def join_group(groups: PredicateGroups, subscriber: Subscriber) -> PredicateGroups:
+    for i, (predicate, members) in enumerate(groups):
+        if predicate == subscriber.predicate:
+            return groups[:i] + ((predicate, members + (subscriber,)),) + groups[i + 1:]
+    return groups + ((subscriber.predicate, (subscriber,)),)
+
+
+def leave_group(groups: PredicateGroups, subscriber: Subscriber) -> PredicateGroups:
+    remaining = ((predicate, tuple(s for s in members if s is not subscriber)) for predicate, members in groups)
+    return tuple((predicate, members) for predicate, members in remaining if members)
 
 
 class BusHandler(ABC):
-    def __init__(self):
+    def __init__(
+            self,
+            encoder: Optional[Callable[[BusEvent], bytes]] = None,
+            replay_ring: Optional[ReplayRing] = None,
+            event_log: Optional[EventLog] = None,
+            first_seq: Optional[int] = None,
+            metrics: Optional[MetricsRegistry] = None,
+    ):
         self._lock = threading.RLock()
+        self._encoder = encoder
         self.subscribers: Dict[str, Subscriber] = {}
 
+        # Sequencing is separate from the registry lock, publish never waits on subscribers
+        self._seq_lock = threading.Lock()
+        if first_seq is None:
+            # Continue where the durable log left off
+            first_seq = event_log.last_seq() + 1 if event_log is not None else 1
+        self._next_seq = itertools.count(first_seq)
+        self._last_seq = first_seq - 1
+        self.replay_ring = replay_ring
+        self.event_log = event_log
+        self.latest_values = LatestValueStore()
+
+        # Copy-on-write routing index, replaced (never mutated) under the lock
+        self._routes: Routes = {}
+        self._predicate_routes: PredicateRoutes = {}
+
+        # Always on, a private registry when nobody scrapes it
+        self.metrics = BusMetrics(metrics or MetricsRegistry(), lambda: self.subscribers)
+
+        # Per event module check, set by ModuleRegistry, None routes every module
+        self.admission: Optional[Callable[[str], bool]] = None
+
     def handle_subscriber(self, subscriber: Subscriber) -> None:
+        unknown = set(subscriber.event_types) - set(PAYLOAD_KINDS.values())
+        if unknown:
+            raise ValueError(f"Unsupported event types: {sorted(unknown)}")
+        if not route_kinds(subscriber):
+            raise ValueError(f"Predicate {subscriber.predicate.source!r} matches none of the subscribed event types")
+
         with self._lock:
             self.subscribers[subscriber.id] = subscriber
+
+            if subscriber.predicate is None:
+                routes = dict(self._routes)
+                for key in route_keys(subscriber):
+                    routes[key] = routes.get(key, ()) + (subscriber,)
+                self._routes = routes
+            else:
+                predicate_routes = dict(self._predicate_routes)
+                for key in route_keys(subscriber):
+                    predicate_routes[key] = join_group(predicate_routes.get(key, ()), subscriber)
+                self._predicate_routes = predicate_routes
+
             self._on_subscriber_added(subscriber)
+            self.metrics.subscribers_added.inc()
 
     def remove_subscriber(self, subscriber_id: str) -> None:
         with self._lock:
             subscriber = self.subscribers.pop(subscriber_id, None)
-            if subscriber:
-                self._on_subscriber_removed(subscriber)
+            if not subscriber:
+                return
+
+            if subscriber.predicate is None:
+                routes = dict(self._routes)
+                for key in route_keys(subscriber):
+                    remaining = tuple(s for s in routes.get(key, ()) if s is not subscriber)
+                    if remaining:
+                        routes[key] = remaining
+                    else:
+                        routes.pop(key, None)
+                self._routes = routes
+            else:
+                predicate_routes = dict(self._predicate_routes)
+                for key in route_keys(subscriber):
+                    remaining = leave_group(predicate_routes.get(key, ()), subscriber)
+                    if remaining:
+                        predicate_routes[key] = remaining
+                    else:
+                        predicate_routes.pop(key, None)
+                self._predicate_routes = predicate_routes
+
+            self._on_subscriber_removed(subscriber)
+            self.metrics.subscriber_removed(subscriber)
 
     def has_subscriber(self, subscriber_id: str) -> bool:
         with self._lock:
             return subscriber_id in self.subscribers
 
-    def take_event(self, subscriber_id: str) -> BusEvent:
+    def take_event(self, subscriber_id: str, timeout: Optional[float] = None) -> Optional[BusEvent]:
+        """
+        Wait for the subscriber's next event.
+        Waits up to timeout, returns None if none arrived.
+        """
+        with self._lock:
+            subscriber = self.subscribers.get(subscriber_id)
+
+        if not subscriber:
+            raise KeyError(subscriber_id)
+
+        started = time.perf_counter()
+        try:
+            return self._take_event_for(subscriber, timeout)
+        finally:
+            self.metrics.take_wait_seconds.observe(time.perf_counter() - started)
+
+    def take_events(self, subscriber_id: str, max_n: int, timeout: Optional[float] = None) -> List[BusEvent]:
+        """
+        Drain up to max_n queued events with one queue lock acquisition.
+        Waits up to timeout for the first one, returns [] if none arrived.
+        """
+        with self._lock:
+            subscriber = self.subscribers.get(subscriber_id)
+
+        if not subscriber:
+            raise KeyError(subscriber_id)
+
+        started = time.perf_counter()
+        try:
+            return self._take_events_for(subscriber, max_n, timeout)
+        finally:
+            self.metrics.take_wait_seconds.observe(time.perf_counter() - started)
+
+    def publish(self, event: BusEvent) -> bool:
+        """
+        Sequence the event and deliver it to every matching subscriber.
+        :return: False if it was refused, its module is offline
+        """
+        if not self._admit(event):
+            return False
+
+        started = time.perf_counter()
+        self._deliver(self._stamp(event))
+        self.metrics.publish_seconds.observe(time.perf_counter() - started)
+        return True
+
+    @property
+    def last_seq(self) -> int:
+        """
+        Seq of the newest event on the bus, 0 before the first.
+        """
+        return self._last_seq
+
+    def latest(self, module_ids: Optional[Iterable[str]] = None) -> Tuple[List[BusEvent], int]:
+        """
+        Newest event per (module, payload kind) of the given modules (all if empty).
+        :return: (events, seq they are current as of), consistent with each other
+        """
+        with self._seq_lock:
+            return self.latest_values.latest(module_ids), self._last_seq
+
+    def forget_module(self, module_id: str) -> None:
+        """
+        Drop the latest values of a module that went away.
+        """
+        with self._seq_lock:
+            self.latest_values.forget(module_id)
+
+    def replay(
+            self,
+            subscriber_id: str,
+            after_seq: int = 0,
+            since_ns: Optional[int] = None,
+    ) -> Iterator[BusEvent]:
+        """
+        Past events after after_seq (and not older than since_ns) that the
+        subscriber's filters match, oldest first. The in-memory ring serves
+        recent history, older events are read back from the event log.
+        Register the subscriber first, then replay, then skip live events
+        with seq <= the last replayed one: nothing is missed in between.
+        """
         with self._lock:
             subscriber = self.subscribers.get(subscriber_id)
 
         if not subscriber:
             raise KeyError(subscriber_id)
 
-        return self._take_event_for(subscriber)
+        ring = self.replay_ring
+        covered_by_ring = ring is not None and len(ring) > 0 and since_ns is None and after_seq + 1 >= ring.first_seq
 
-    def publish(self, event: BusEvent) -> None:
+        if self.event_log is not None and not covered_by_ring:
+            for event in self.event_log.replay(after_seq, since_ns):
+                after_seq = event.seq
+                if subscriber.matches(event):
+                    yield event
+
+        if ring is not None:
+            for event in ring.since(after_seq):
+                if since_ns is not None and event.timestamp_ns < since_ns:
+                    continue
+                if subscriber.matches(event):
+                    yield event
+
+    def _admit(self, event: BusEvent) -> bool:
+        """
+        Renews the module lease, False for events of offline modules.
+        """
+        admission = self.admission
+        return admission is None or admission(event.module_id)
+
+    def relay(self, event: BusEvent) -> None:
+        """
+        Serve an event another process already sequenced and encoded, e.g.
+        read from the shared event ring. Seq and wire are kept as they are.
+        """
+        started = time.perf_counter()
+        with self._seq_lock:
+            self._record(event)
+        self._deliver(event)
+        self.metrics.publish_seconds.observe(time.perf_counter() - started)
+
+    def _stamp(self, event: BusEvent) -> BusEvent:
+        """
+        Assign the bus seq, serialize once, keep it for replay and as latest value.
+        One lock so the ring and the log stay in seq order with concurrent publishers.
+        """
+        with self._seq_lock:
+            seq = next(self._next_seq)
+            # Direct construction, dataclasses.replace costs twice as much
+            event = BusEvent(event.event_id, event.module_id, event.timestamp_ns, event.payload, seq)
+            if self._encoder:
+                # Fresh copy nobody else holds yet, safe to fill in place
+                started = time.perf_counter()
+                object.__setattr__(event, "wire", self._encoder(event))
+                self.metrics.encode_seconds.observe(time.perf_counter() - started)
+            self._record(event)
+        return event
+
+    def _record(self, event: BusEvent) -> None:
+        """
+        Keep a sequenced event for replay and as latest value, under _seq_lock.
+        """
+        self._last_seq = event.seq
+        if self.replay_ring is not None:
+            self.replay_ring.append(event)
+        if self.event_log is not None:
+            self.event_log.append(event)
+        self.latest_values.update(event)
+
+    def _deliver(self, event: BusEvent) -> None:
+        """
+        Hand a sequenced event to the subscriber queues.
+        """
+        self._dispatch(event)
+
+    def _dispatch(self, event: BusEvent) -> None:
+        # Lock free: the routing table is an immutable snapshot
+        routes = self._routes
+        module_id = event.module_id
+        kind = PAYLOAD_KINDS[type(event.payload)]
+        self.metrics.published[kind].inc()
+
+        keys = ((module_id, kind), (module_id, ANY), (ANY, kind), (ANY, ANY))
+        for key in keys:
+            for subscriber in routes.get(key, ()):
+                subscriber.queue.put(event)
+
+        predicate_routes = self._predicate_routes
+        if predicate_routes:
+            # A predicate in several buckets is still evaluated once,
+            # keyed by identity as compile_predicate interns them
+            payload = event.payload
+            results = {}
+            for key in keys:
+                for predicate, members in predicate_routes.get(key, ()):
+                    matched = results.get(id(predicate))
+                    if matched is None:
+                        matched = results[id(predicate)] = predicate.test(payload)
+                    if matched:
+                        for subscriber in members:
+                            subscriber.queue.put(event)
+
+    def subscriber_stats(self) -> Dict[str, QueueStats]:
         with self._lock:
             subscribers = list(self.subscribers.values())
 
-        for subscriber in subscribers:
-            subscriber.queue.put(event)
+        return {subscriber.id: subscriber.queue.stats() for subscriber in subscribers}
 
     # ---- hooks ----
     @abstractmethod
@@ -52,5 +350,9 @@ class BusHandler(ABC):
         ...
 
     @abstractmethod
-    def _take_event_for(self, subscriber: Subscriber) -> BusEvent:
+    def _take_event_for(self, subscriber: Subscriber, timeout: Optional[float]) -> Optional[BusEvent]:
+        ...
+
+    @abstractmethod
+    def _take_events_for(self, subscriber: Subscriber, max_n: int, timeout: Optional[float]) -> List[BusEvent]:
         ...
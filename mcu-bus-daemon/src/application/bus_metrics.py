@@ -0,0 +1,69 @@
+from typing import Callable, Dict
+
+from domain.metrics import MetricsRegistry
+from domain.mcu_bus import Subscriber, PAYLOAD_KINDS
+
+
+class BusMetrics:
+    """
+    The BusHandler metrics, children resolved up front so the publish path
+    only does attribute lookups and increments.
+    """
+
+    def __init__(self, registry: MetricsRegistry, subscribers: Callable[[], Dict[str, Subscriber]]):
+        """
+        :param registry: where the metrics are registered
+        :param subscribers: current subscribers, read at scrape time
+        """
+        self.registry = registry
+        self._subscribers = subscribers
+
+        published = registry.counter("mcubus_events_published_total", "Events published on the bus", ("type",))
+        self.published = {kind: published.labels(kind) for kind in PAYLOAD_KINDS.values()}
+
+        self.publish_seconds = registry.histogram(
+            "mcubus_publish_seconds",
+            "Time to sequence, encode, store and route one event",
+        )
+        self.encode_seconds = registry.histogram(
+            "mcubus_encode_seconds",
+            "to_proto and serialization time per event",
+        )
+        self.take_wait_seconds = registry.histogram(
+            "mcubus_take_event_wait_seconds",
+            "Time a stream waited for its next events",
+        )
+
+        self.subscribers_added = registry.counter("mcubus_subscribers_added_total", "Subscribers connected")
+        self.subscribers_removed = registry.counter("mcubus_subscribers_removed_total", "Subscribers disconnected")
+        self.subscribers = registry.gauge("mcubus_subscribers", "Subscribers currently connected")
+        self.queue_depth = registry.gauge(
+            "mcubus_subscriber_queue_depth",
+            "Events waiting in a subscriber queue",
+            ("subscriber",),
+        )
+        self.dropped = registry.counter(
+            "mcubus_events_dropped_total",
+            "Events a full subscriber queue dropped or conflated",
+        )
+
+        # Drops of subscribers already gone, keeps the counter monotonic
+        self._retired_dropped = 0
+        registry.on_collect(self._collect)
+
+    def subscriber_removed(self, subscriber: Subscriber) -> None:
+        stats = subscriber.queue.stats()
+        self._retired_dropped += stats.dropped + stats.conflated
+        self.subscribers_removed.inc()
+
+    def _collect(self) -> None:
+        subscribers = list(self._subscribers().values())
+
+        self.subscribers.set(len(subscribers))
+        self.queue_depth.clear()
+        dropped = self._retired_dropped
+        for subscriber in subscribers:
+            self.queue_depth.labels(subscriber.id).set(subscriber.queue.qsize())
+            stats = subscriber.queue.stats()
+            dropped += stats.dropped + stats.conflated
+        self.dropped.labels().value = dropped
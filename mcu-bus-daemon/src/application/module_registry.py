@@ -0,0 +1,212 @@
+import logging
+import threading
+import time
+import uuid
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Mapping, Optional, Set
+
+from application.bus_handler import BusHandler
+from domain.mcu_bus import AlertEvent, BusEvent
+from domain.timing_wheel import TimingWheel
+
+logger = logging.getLogger(__name__)
+
+# Alert code published for a module whose lease ran out
+OFFLINE_ALERT_CODE = "MODULE_OFFLINE"
+
+
+@dataclass
+class ModuleLease:
+    module_id: str
+    module_type: str
+    metadata: Dict[str, str]
+
+    # Seconds of silence allowed
+    duration: float
+
+    # Registry clock time the lease runs out, pushed forward by every renewal
+    expires_at: float
+    registered_at_ns: int = field(default_factory=time.time_ns)
+
+
+class ModuleRegistry:
+    """
+    Registered modules and their leases.
+
+    A lease is renewed by Heartbeat and by every event the module publishes.
+    Renewing only moves expires_at: the lease's wheel timer is checked when it
+    fires and scheduled again if the lease moved, so publish does no wheel work.
+    A module silent for a whole lease is expired: its latest values are
+    dropped, an offline alert is published and its events are not routed until
+    it registers again. Modules that never registered (plain CAN nodes) are
+    always routed.
+    """
+
+    def __init__(
+            self,
+            bus_handler: BusHandler,
+            default_lease: float = 30.0,
+            max_lease: float = 3600.0,
+            tick: float = 0.1,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param bus_handler: bus whose admission hook the registry becomes
+        :param default_lease: seconds granted when the module does not ask
+        :param max_lease: longest lease granted
+        :param tick: expiry resolution in seconds
+        :param clock: monotonic clock, injectable for tests
+        """
+        self.bus_handler = bus_handler
+        self.default_lease = default_lease
+        self.max_lease = max_lease
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._leases: Dict[str, ModuleLease] = {}
+        self._offline: Set[str] = set()
+
+        # Coarse clock for traffic renewals, moved on by every tick
+        self._now = clock()
+        self._wheel: TimingWheel[ModuleLease] = TimingWheel(tick, self._now)
+
+        self._stopping = threading.Event()
+        self._ticker = threading.Thread(target=self._tick_loop, daemon=True, name="ModuleLeaseTicker")
+
+        registry = bus_handler.metrics.registry
+        self._expired = registry.counter("mcubus_modules_expired_total", "Module leases that ran out")
+        self._rejected = registry.counter("mcubus_offline_events_dropped_total", "Events of offline modules dropped")
+        modules = registry.gauge("mcubus_modules_registered", "Modules holding a lease")
+        registry.on_collect(lambda: modules.set(len(self._leases)))
+
+        bus_handler.admission = self.admit
+
+    def __len__(self) -> int:
+        return len(self._leases)
+
+    def start(self) -> None:
+        self._ticker.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._ticker.is_alive():
+            self._ticker.join()
+
+    def register(
+            self,
+            module_id: str = "",
+            module_type: str = "",
+            metadata: Optional[Mapping[str, str]] = None,
+            lease: float = 0.0,
+    ) -> ModuleLease:
+        """
+        Grant a lease, a new one if the module is registered already.
+        :param module_id: wanted id, one is assigned if empty
+        :param lease: seconds asked for, 0 for the default
+        """
+        duration = min(max(lease or self.default_lease, self._wheel.tick), self.max_lease)
+        module_id = module_id or f"module_{uuid.uuid4().hex[:8]}"
+        now = self._clock()
+        granted = ModuleLease(module_id, module_type, dict(metadata or {}), duration, now + duration)
+
+        with self._lock:
+            self._now = max(self._now, now)
+            self._leases[module_id] = granted
+            self._offline.discard(module_id)
+            self._wheel.schedule(granted, granted.expires_at)
+
+        logger.info("Module %s (%s) registered, lease %.1fs", module_id, module_type, duration)
+        return granted
+
+    def unregister(self, module_id: str) -> bool:
+        """
+        Drop the lease, the module's events are not routed any more.
+        :return: False if the module held no lease
+        """
+        with self._lock:
+            if self._leases.pop(module_id, None) is None:
+                return False
+            self._offline.add(module_id)
+
+        self.bus_handler.forget_module(module_id)
+        logger.info("Module %s unregistered", module_id)
+        return True
+
+    def heartbeat(self, module_id: str) -> Optional[ModuleLease]:
+        """
+        Renew a lease.
+        :return: the lease, None if the module has to register (again)
+        """
+        lease = self._leases.get(module_id)
+        if lease is not None:
+            lease.expires_at = self._clock() + lease.duration
+        return lease
+
+    def admit(self, module_id: str) -> bool:
+        """
+        Called for every published event: renews the module's lease and
+        tells if its events are routed. Lock free, one dict lookup.
+        """
+        lease = self._leases.get(module_id)
+        if lease is not None:
+            lease.expires_at = self._now + lease.duration
+            return True
+
+        if module_id in self._offline:
+            self._rejected.inc()
+            return False
+        return True
+
+    def modules(self) -> List[ModuleLease]:
+        with self._lock:
+            return list(self._leases.values())
+
+    def expire(self, now: Optional[float] = None) -> List[str]:
+        """
+        Advance the wheel to now and take modules whose lease ran out offline.
+        Runs every tick on the ticker thread.
+        :return: ids of the expired modules
+        """
+        now = self._clock() if now is None else now
+        expired = []
+
+        with self._lock:
+            self._now = max(self._now, now)
+            for lease in self._wheel.advance(now):
+                # Unregistered or registered again since the timer was set
+                if self._leases.get(lease.module_id) is not lease:
+                    continue
+                if lease.expires_at > now:
+                    self._wheel.schedule(lease, lease.expires_at)
+                    continue
+                del self._leases[lease.module_id]
+                expired.append(lease)
+
+        # Publish outside the lock, it may wait on slow subscribers
+        for lease in expired:
+            self._go_offline(lease)
+        return [lease.module_id for lease in expired]
+
+    def _go_offline(self, lease: ModuleLease) -> None:
+        module_id = lease.module_id
+        self.bus_handler.forget_module(module_id)
+
+        now_ns = time.time_ns()
+        alert = AlertEvent("critical", OFFLINE_ALERT_CODE, f"No heartbeat or event for {lease.duration:g}s")
+        self.bus_handler.publish(BusEvent(f"{module_id}_{now_ns // 1000}", module_id, now_ns, alert))
+
+        with self._lock:
+            # Unless it registered again meanwhile
+            if module_id not in self._leases:
+                self._offline.add(module_id)
+
+        self._expired.inc()
+        logger.warning("Module %s lease of %.1fs ran out, offline", module_id, lease.duration)
+
+    def _tick_loop(self) -> None:
+        while not self._stopping.wait(self._wheel.tick):
+            try:
+                self.expire()
+            except Exception as e:
+                logger.error("Lease expiry failed: %s", e)
@@ -0,0 +1,142 @@
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Union
+
+from domain.mcu_bus import BusEvent, SensorDataEvent
+
+NANOS_PER_SECOND = 1_000_000_000
+
+SENSOR_FIELDS = tuple(f.name for f in fields(SensorDataEvent))
+
+
+@dataclass(frozen=True)
+class Deadband:
+    """
+    How far a field may move before it is worth reporting: an absolute
+    step, a percentage of the last reported value, or the larger of both.
+    """
+
+    absolute: float = 0.0
+    percent: float = 0.0
+
+    @classmethod
+    def parse(cls, value: Union[str, float]) -> "Deadband":
+        """
+        "0.5" or 0.5 is absolute, "2%" is relative.
+        """
+        if isinstance(value, str) and value.strip().endswith("%"):
+            return cls(percent=float(value.strip()[:-1]))
+        return cls(absolute=float(value))
+
+
+# Sensor noise of a typical greenhouse node, below this nothing changed
+DEFAULT_DEADBANDS: Dict[str, Deadband] = {
+    "temperature": Deadband(absolute=0.2),
+    "humidity": Deadband(absolute=1.0),
+    "soil_moisture": Deadband(absolute=1.0),
+    "light_level": Deadband(percent=5.0),
+    "water_level": Deadband(absolute=1.0),
+    "ph_value": Deadband(absolute=0.05),
+}
+
+# (last passed sample, sample) -> True if some field left its deadband
+_Comparator = Callable[[SensorDataEvent, SensorDataEvent], bool]
+
+
+@dataclass
+class DeadbandStats:
+    passed: int = 0
+    suppressed: int = 0
+
+
+class DeadbandFilter:
+    """
+    Report by exception for SensorData. A sample passes when a field moved
+    past its deadband since the module's last passed sample, or when
+    max_silence went by without one; otherwise it is suppressed and counted.
+    Comparing with the last passed sample, not the last seen, keeps a slow
+    drift from creeping through unreported. Other payloads always pass.
+    Not thread safe, one ingest thread owns it.
+    """
+
+    def __init__(
+            self,
+            deadbands: Optional[Mapping[str, Deadband]] = None,
+            modules: Optional[Mapping[str, Mapping[str, Deadband]]] = None,
+            max_silence: float = 60.0,
+    ):
+        """
+        :param deadbands: per field, fields left out report any change
+        :param modules: per module overrides of single fields
+        :param max_silence: seconds after which a sample passes regardless
+        """
+        deadbands = DEFAULT_DEADBANDS if deadbands is None else deadbands
+        unknown = set(deadbands).union(*(modules or {}).values()) - set(SENSOR_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown sensor fields: {sorted(unknown)}")
+
+        self._default = self._compile(deadbands)
+        self._modules = {module_id: self._compile({**deadbands, **bands}) for module_id, bands in (modules or {}).items()}
+        self._max_silence_ns = int(max_silence * NANOS_PER_SECOND)
+        self._last: Dict[str, Tuple[SensorDataEvent, int]] = {}
+        self.stats = DeadbandStats()
+        self.suppressed_by_module: Dict[str, int] = {}
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any], max_silence: float = 60.0) -> "DeadbandFilter":
+        """
+        From a dict like {"fields": {"temperature": 0.2, "light_level": "5%"},
+        "modules": {"mcu_3": {"temperature": 0.5}}, "max_silence": 60}.
+        Without "fields" the defaults apply.
+        """
+        deadbands = None
+        if "fields" in config:
+            deadbands = {name: Deadband.parse(value) for name, value in config["fields"].items()}
+        modules = {
+            module_id: {name: Deadband.parse(value) for name, value in bands.items()}
+            for module_id, bands in config.get("modules", {}).items()
+        }
+        return cls(deadbands, modules, config.get("max_silence", max_silence))
+
+    @staticmethod
+    def _compile(deadbands: Mapping[str, Deadband]) -> _Comparator:
+        """
+        One generated expression per set of deadbands, a loop over the
+        fields with getattr costs several times more per sample.
+        """
+        checks = []
+        for name in SENSOR_FIELDS:
+            band = deadbands.get(name, Deadband())
+            delta = f"abs(sample.{name} - last.{name})"
+            relative = f"abs(last.{name}) * {band.percent / 100!r}"
+            if not band.percent:
+                checks.append(f"{delta} > {band.absolute!r}")
+            elif not band.absolute:
+                checks.append(f"{delta} > {relative}")
+            else:
+                checks.append(f"{delta} > max({band.absolute!r}, {relative})")
+
+        source = "def moved(last, sample):\n    return " + " or ".join(checks) + "\n"
+        namespace = {}
+        exec(compile(source, "<deadband>", "exec"), namespace)
+        return namespace["moved"]
+
+    def admit(self, event: BusEvent) -> bool:
+        """
+        :return: True if the event should be published
+        """
+        payload = event.payload
+        if type(payload) is not SensorDataEvent:
+            self.stats.passed += 1
+            return True
+
+        module_id = event.module_id
+        last = self._last.get(module_id)
+        if last is not None and event.timestamp_ns - last[1] < self._max_silence_ns:
+            if not self._modules.get(module_id, self._default)(last[0], payload):
+                self.stats.suppressed += 1
+                self.suppressed_by_module[module_id] = self.suppressed_by_module.get(module_id, 0) + 1
+                return False
+
+        self._last[module_id] = (payload, event.timestamp_ns)
+        self.stats.passed += 1
+        return True
@@ -0,0 +1,27 @@
+from typing import Iterator, Optional, Protocol
+
+from domain.mcu_bus import BusEvent
+
+
+class EventLog(Protocol):
+    """
+    Durable history of published events, survives daemon restarts.
+    """
+
+    def append(self, event: BusEvent) -> None:
+        """
+        Queue an event for writing, must never block the publisher.
+        """
+        ...
+
+    def replay(self, after_seq: int = 0, since_ns: Optional[int] = None) -> Iterator[BusEvent]:
+        """
+        Stored events with seq > after_seq and timestamp_ns >= since_ns, oldest first.
+        """
+        ...
+
+    def last_seq(self) -> int:
+        ...
+
+    def close(self) -> None:
+        ...
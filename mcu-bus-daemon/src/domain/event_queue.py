@@ -0,0 +1,304 @@
+import asyncio
+import threading
+import time
+
+from collections import deque
+from dataclasses import dataclass, asdict
+from enum import Enum
+from typing import Deque, Dict, Hashable, List, Optional
+
+
+class OverflowPolicy(str, Enum):
+    """
+    What a full subscriber queue does with the next event.
+    """
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    CONFLATE = "conflate"
+
+
+@dataclass
+class QueueStats:
+    enqueued: int = 0
+    delivered: int = 0
+    dropped: int = 0
+    conflated: int = 0
+    block_timeouts: int = 0
+    high_watermark: int = 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def conflation_key(event) -> Hashable:
+    return event.module_id, type(event.payload)
+
+
+class _Slot:
+    __slots__ = ("key", "event")
+
+    def __init__(self, key: Hashable, event):
+        self.key = key
+        self.event = event
+
+
+class EventBuffer:
+    """
+    Bounded FIFO applying an overflow policy. Not thread-safe on its own,
+    the queue wrappers own the locking.
+    """
+
+    def __init__(self, capacity: int, policy: OverflowPolicy):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self.policy = policy
+        self.stats = QueueStats()
+        self._slots: Deque[_Slot] = deque()
+        self._pending: Dict[Hashable, _Slot] = {}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def is_full(self) -> bool:
+        return len(self._slots) >= self.capacity
+
+    def offer(self, event) -> bool:
+        """
+        Add an event, applying the overflow policy when full.
+        :return: False if the event itself was dropped
+        """
+        policy = self.policy
+        stats = self.stats
+        key = None
+
+        if policy is OverflowPolicy.CONFLATE:
+            key = conflation_key(event)
+
+        if len(self._slots) >= self.capacity:
+            if key is not None and key in self._pending:
+                # Replace the queued value in place, keeps its position
+                self._pending[key].event = event
+                stats.conflated += 1
+                return True
+
+            if policy is OverflowPolicy.DROP_NEWEST or policy is OverflowPolicy.BLOCK:
+                stats.dropped += 1
+                return False
+
+            # DROP_OLDEST, or CONFLATE with nothing to conflate into
+            self._evict()
+            stats.dropped += 1
+
+        slot = _Slot(key, event)
+        self._slots.append(slot)
+        if key is not None:
+            self._pending[key] = slot
+
+        stats.enqueued += 1
+        if len(self._slots) > stats.high_watermark:
+            stats.high_watermark = len(self._slots)
+        return True
+
+    def pop(self):
+        slot = self._evict()
+        self.stats.delivered += 1
+        return slot.event
+
+    def pop_many(self, max_n: int) -> list:
+        events = []
+        while self._slots and len(events) < max_n:
+            events.append(self._evict().event)
+        self.stats.delivered += len(events)
+        return events
+
+    def _evict(self) -> _Slot:
+        slot = self._slots.popleft()
+        if slot.key is not None and self._pending.get(slot.key) is slot:
+            del self._pending[slot.key]
+        return slot
+
+
+class EventQueue:
+    """
+    Thread-safe bounded subscriber queue.
+    Closing wakes every waiter, and get() then returns None once drained.
+    """
+
+    def __init__(
+            self,
+            capacity: int = 1024,
+            policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+            block_timeout: float = 0.05,
+    ):
+        self._buffer = EventBuffer(capacity, policy)
+        self._block_timeout = block_timeout
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._closed = False
+
+    @property
+    def capacity(self) -> int:
+        return self._buffer.capacity
+
+    @property
+    def policy(self) -> OverflowPolicy:
+        return self._buffer.policy
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def qsize(self) -> int:
+        return len(self._buffer)
+
+    def stats(self) -> QueueStats:
+        with self._lock:
+            return QueueStats(**self._buffer.stats.as_dict())
+
+    def put(self, event) -> bool:
+        """
+        Enqueue an event according to the overflow policy.
+        :return: False if the event was dropped
+        """
+        with self._lock:
+            if self._closed:
+                return False
+
+            buffer = self._buffer
+            if buffer.policy is OverflowPolicy.BLOCK and buffer.is_full():
+                deadline = time.monotonic() + self._block_timeout
+                while buffer.is_full() and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        buffer.stats.block_timeouts += 1
+                        break
+                    self._not_full.wait(remaining)
+
+            accepted = buffer.offer(event)
+            if accepted:
+                self._not_empty.notify()
+            return accepted
+
+    def get(self, timeout: Optional[float] = None):
+        """
+        Take the next event.
+        :return: the event, or None if the queue was closed (or timed out)
+        """
+        with self._lock:
+            if not self._wait_not_empty(timeout):
+                return None
+
+            event = self._buffer.pop()
+            self._not_full.notify()
+            return event
+
+    def get_many(self, max_n: int, timeout: Optional[float] = None) -> List:
+        """
+        Wait for at least one event, then drain up to max_n in one go.
+        """
+        with self._lock:
+            if not self._wait_not_empty(timeout):
+                return []
+
+            events = self._buffer.pop_many(max_n)
+            self._not_full.notify_all()
+            return events
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+    def _wait_not_empty(self, timeout: Optional[float]) -> bool:
+        buffer = self._buffer
+        if timeout is None:
+            while not len(buffer) and not self._closed:
+                self._not_empty.wait()
+        elif not len(buffer) and not self._closed:
+            deadline = time.monotonic() + timeout
+            while not len(buffer) and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._not_empty.wait(remaining)
+
+        return len(buffer) > 0
+
+
+class AsyncEventQueue:
+    """
+    asyncio flavour of EventQueue, only touched from the event loop thread.
+    put() never waits, so the block policy behaves like drop_newest here.
+    """
+
+    def __init__(
+            self,
+            capacity: int = 1024,
+            policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+            block_timeout: float = 0.0,
+    ):
+        self._buffer = EventBuffer(capacity, policy)
+        self._not_empty = asyncio.Event()
+        self._closed = False
+
+    @property
+    def capacity(self) -> int:
+        return self._buffer.capacity
+
+    @property
+    def policy(self) -> OverflowPolicy:
+        return self._buffer.policy
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def qsize(self) -> int:
+        return len(self._buffer)
+
+    def stats(self) -> QueueStats:
+        return QueueStats(**self._buffer.stats.as_dict())
+
+    def put(self, event) -> bool:
+        if self._closed:
+            return False
+
+        accepted = self._buffer.offer(event)
+        if accepted:
+            self._not_empty.set()
+        return accepted
+
+    async def get(self, timeout: Optional[float] = None):
+        if not await self._wait_not_empty(timeout):
+            return None
+        return self._pop(lambda buffer: buffer.pop())
+
+    async def get_many(self, max_n: int, timeout: Optional[float] = None) -> List:
+        if not await self._wait_not_empty(timeout):
+            return []
+        return self._pop(lambda buffer: buffer.pop_many(max_n))
+
+    def close(self) -> None:
+        self._closed = True
+        self._not_empty.set()
+
+    def _pop(self, take):
+        result = take(self._buffer)
+        if not len(self._buffer) and not self._closed:
+            self._not_empty.clear()
+        return result
+
+    async def _wait_not_empty(self, timeout: Optional[float]) -> bool:
+        if not len(self._buffer) and not self._closed:
+            try:
+                await asyncio.wait_for(self._not_empty.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        return len(self._buffer) > 0
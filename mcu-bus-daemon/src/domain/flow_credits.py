@@ -0,0 +1,86 @@
+import asyncio
+import threading
+
+# Most credits a stream holds at once, larger grants are clamped
+MAX_CREDITS = 1 << 20
+
+
+class CreditGate:
+    """
+    Events a flow controlled subscriber is ready for, thread-safe.
+    The client grants credits, the stream spends one per event it sends
+    and waits while none are left. Closing stops new grants: credits still
+    held are spent, then acquire() returns False.
+    """
+
+    def __init__(self, credits: int = 0):
+        self._credits = min(credits, MAX_CREDITS)
+        self._lock = threading.Lock()
+        self._granted = threading.Condition(self._lock)
+        self._closed = False
+
+    @property
+    def available(self) -> int:
+        return self._credits
+
+    def grant(self, n: int) -> None:
+        if n <= 0:
+            return
+        with self._lock:
+            self._credits = min(self._credits + n, MAX_CREDITS)
+            self._granted.notify()
+
+    def acquire(self) -> bool:
+        """
+        Wait for a credit and spend it.
+        :return: False if the gate was closed with no credit left
+        """
+        with self._lock:
+            while not self._credits and not self._closed:
+                self._granted.wait()
+            if not self._credits:
+                return False
+            self._credits -= 1
+            return True
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._granted.notify_all()
+
+
+class AsyncCreditGate:
+    """
+    asyncio flavour of CreditGate, only touched from the event loop thread.
+    """
+
+    def __init__(self, credits: int = 0):
+        self._credits = min(credits, MAX_CREDITS)
+        self._granted = asyncio.Event()
+        if self._credits:
+            self._granted.set()
+        self._closed = False
+
+    @property
+    def available(self) -> int:
+        return self._credits
+
+    def grant(self, n: int) -> None:
+        if n > 0:
+            self._credits = min(self._credits + n, MAX_CREDITS)
+            self._granted.set()
+
+    async def acquire(self) -> bool:
+        while not self._credits and not self._closed:
+            await self._granted.wait()
+        if not self._credits:
+            return False
+
+        self._credits -= 1
+        if not self._credits and not self._closed:
+            self._granted.clear()
+        return True
+
+    def close(self) -> None:
+        self._closed = True
+        self._granted.set()
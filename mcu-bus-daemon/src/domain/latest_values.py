@@ -0,0 +1,40 @@
+from typing import Dict, Iterable, List, Optional
+
+from domain.mcu_bus import BusEvent, PAYLOAD_KINDS
+
+
+class LatestValueStore:
+    """
+    Newest event per (module_id, payload kind), bounded by the number of
+    modules. Updated at publish under the BusHandler seq lock; reads copy
+    the dicts so they are safe from any thread.
+    """
+
+    def __init__(self):
+        self._modules: Dict[str, Dict[str, BusEvent]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(kinds) for kinds in list(self._modules.values()))
+
+    def update(self, event: BusEvent) -> None:
+        kinds = self._modules.get(event.module_id)
+        if kinds is None:
+            kinds = self._modules[event.module_id] = {}
+        kinds[PAYLOAD_KINDS[type(event.payload)]] = event
+
+    def forget(self, module_id: str) -> None:
+        self._modules.pop(module_id, None)
+
+    def latest(self, module_ids: Optional[Iterable[str]] = None) -> List[BusEvent]:
+        """
+        Newest events of the given modules (all if empty), oldest seq first.
+        """
+        modules = self._modules
+        if module_ids:
+            selected = [modules[m] for m in set(module_ids) if m in modules]
+        else:
+            selected = list(modules.values())
+
+        events = [event for kinds in selected for event in list(kinds.values())]
+        events.sort(key=lambda event: event.seq)
+        return events
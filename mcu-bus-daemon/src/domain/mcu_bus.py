@@ -1,20 +1,37 @@
-import queue
 import uuid
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Set, Union
+from typing import TYPE_CHECKING, Dict, Optional, Set, Union
+
+from domain.event_queue import EventQueue
+
+if TYPE_CHECKING:
+    from domain.predicate import Predicate
 
 
 @dataclass
 class Subscriber:
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    queue: queue.Queue = field(default_factory=queue.Queue)
+    queue: EventQueue = field(default_factory=EventQueue)
     module_ids: Set[str] = field(default_factory=set)
     event_types: Set[str] = field(default_factory=set)
     created_at: datetime = field(default_factory=datetime.now)
     active: bool = True
 
+    # Value filter on the payload, evaluated at publish
+    predicate: Optional["Predicate"] = None
+
+    def matches(self, event: "BusEvent") -> bool:
+        """
+        Same filter the routing index applies, for events not routed through it.
+        """
+        if self.module_ids and event.module_id not in self.module_ids:
+            return False
+        if self.event_types and payload_kind(event.payload) not in self.event_types:
+            return False
+        return self.predicate is None or self.predicate(event.payload)
+
 
 @dataclass(frozen=True)
 class SensorDataEvent:
@@ -47,10 +64,29 @@ BusPayload = Union[
     AlertEvent,
 ]
 
+# Payload kind names, same as the proto oneof field names
+PAYLOAD_KINDS: Dict[type, str] = {
+    SensorDataEvent: "sensor_data",
+    ControlStatusEvent: "control_status",
+    AlertEvent: "alert",
+}
+
+
+def payload_kind(payload: BusPayload) -> str:
+    return PAYLOAD_KINDS[type(payload)]
+
 
 @dataclass(frozen=True)
 class BusEvent:
     event_id: str
     module_id: str
-    timestamp: datetime
+
+    # Epoch nanoseconds, UTC
+    timestamp_ns: int
     payload: BusPayload
+
+    # Monotonic bus sequence number, assigned at publish (0 = not published yet)
+    seq: int = 0
+
+    # Serialized proto, filled once at publish and shared by every stream
+    wire: Optional[bytes] = field(default=None, compare=False, repr=False)
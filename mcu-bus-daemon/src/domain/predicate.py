@@ -0,0 +1,151 @@
+import ast
+
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet
+
+from domain.mcu_bus import BusPayload, PAYLOAD_KINDS
+
+# Payload kind -> its field names
+KIND_FIELDS: Dict[str, FrozenSet[str]] = {
+    kind: frozenset(f.name for f in fields(payload)) for payload, kind in PAYLOAD_KINDS.items()
+}
+
+# Field name -> its type, the same in every payload kind that has it
+FIELD_TYPES: Dict[str, type] = {
+    f.name: f.type for payload in PAYLOAD_KINDS for f in fields(payload)
+}
+
+# Longest expression accepted, predicates are meant to be short
+MAX_PREDICATE_LENGTH = 512
+
+_COMPARISONS = (ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq)
+_LITERALS = {"true": True, "false": False}
+
+
+@dataclass(frozen=True)
+class Predicate:
+    """
+    A compiled value filter, e.g. "temperature > 30 and humidity < 40".
+    It applies to the payload kinds having every field it names, events of
+    other kinds never match. Equal when the normalized source is, so
+    subscribers with the same filter share one evaluation per event.
+    """
+    source: str
+    kinds: FrozenSet[str]
+    test: Callable[[BusPayload], bool] = field(compare=False, repr=False)
+
+    def __call__(self, payload: BusPayload) -> bool:
+        return PAYLOAD_KINDS[type(payload)] in self.kinds and self.test(payload)
+
+
+class _FieldAccess(ast.NodeTransformer):
+    """
+    Checks the expression only compares fields with literals, and turns
+    field names into attribute reads on the payload.
+    """
+
+    def __init__(self):
+        self.names = set()
+
+    def visit_Expression(self, node: ast.Expression) -> ast.Expression:
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> ast.BoolOp:
+        node.values = [self.visit(value) for value in node.values]
+        return node
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.UnaryOp:
+        if not isinstance(node.op, ast.Not):
+            self._reject(node)
+        node.operand = self.visit(node.operand)
+        return node
+
+    def visit_Compare(self, node: ast.Compare) -> ast.Compare:
+        if not all(isinstance(op, _COMPARISONS) for op in node.ops):
+            self._reject(node)
+        operands = [self._operand(value) for value in (node.left, *node.comparators)]
+        if not any(isinstance(operand, ast.Attribute) for operand in operands):
+            raise ValueError(f"Comparison without a field: {ast.unparse(node)}")
+
+        # Checked here, a str compared with a float would raise in publish
+        types = {self._type(operand) for operand in operands}
+        if len(types) > 1:
+            raise ValueError(f"Comparison of different types: {ast.unparse(node)}")
+        node.left, *node.comparators = operands
+        return node
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        return self._reject(node)
+
+    def _operand(self, node: ast.AST) -> ast.AST:
+        if isinstance(node, ast.Name):
+            if node.id in _LITERALS:
+                return ast.Constant(_LITERALS[node.id])
+            self.names.add(node.id)
+            return ast.Attribute(ast.Name("p", ast.Load()), node.id, ast.Load())
+
+        # Negative numbers parse as unary minus, only numbers can be negated
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            value = getattr(node.operand, "value", None)
+            if not isinstance(node.operand, ast.Constant) or not _is_number(value):
+                return self._reject(node)
+            node = ast.Constant(-value)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str, bool)):
+            return node
+        return self._reject(node)
+
+    @staticmethod
+    def _type(operand: ast.AST) -> type:
+        if isinstance(operand, ast.Attribute):
+            kind = FIELD_TYPES.get(operand.attr)
+            if kind is None:
+                raise ValueError(f"Unknown payload fields: {[operand.attr]}")
+        else:
+            kind = type(operand.value)
+        return float if kind is int else kind
+
+    @staticmethod
+    def _reject(node: ast.AST):
+        raise ValueError(f"Unsupported predicate syntax: {ast.unparse(node)}")
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+@lru_cache(maxsize=1024)
+def compile_predicate(text: str) -> Predicate:
+    """
+    Parse and compile a predicate once, comparisons of payload fields with
+    literals joined by and / or / not, with parentheses.
+    :raise ValueError: bad syntax, unknown field or no payload kind has all fields
+    """
+    if len(text) > MAX_PREDICATE_LENGTH:
+        raise ValueError(f"Predicate longer than {MAX_PREDICATE_LENGTH} characters")
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid predicate {text!r}: {e.msg}") from None
+
+    # Spellings of one expression share one instance, publish memoizes by identity
+    return _compile(ast.unparse(tree))
+
+
+@lru_cache(maxsize=1024)
+def _compile(source: str) -> Predicate:
+    tree = ast.parse(source, mode="eval")
+    access = _FieldAccess()
+    body = access.visit(tree).body
+
+    kinds = frozenset(kind for kind, names in KIND_FIELDS.items() if access.names <= names)
+    if not kinds:
+        raise ValueError(f"No payload kind has all of {sorted(access.names)}")
+
+    # One generated function, like the other compiled hot paths
+    code = f"def test(p):\n    return {ast.unparse(body)}\n"
+    namespace = {}
+    exec(compile(code, f"<predicate {source}>", "exec"), namespace)
+    return Predicate(source, kinds, namespace["test"])
+
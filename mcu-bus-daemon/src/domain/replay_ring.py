@@ -0,0 +1,68 @@
+import threading
+
+from bisect import bisect_right
+from collections import deque
+from itertools import islice
+from typing import Deque, List
+
+# Rough per-event cost of the Python objects on top of the serialized bytes
+EVENT_OVERHEAD_BYTES = 256
+
+
+class ReplayRing:
+    """
+    Bounded in-memory history of published events, ordered by seq.
+    Capped both by event count and by approximate memory.
+    """
+
+    def __init__(self, max_events: int = 10_000, max_bytes: int = 8 * 1024 * 1024):
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._events: Deque = deque()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    @property
+    def first_seq(self) -> int:
+        with self._lock:
+            return self._events[0].seq if self._events else 0
+
+    @property
+    def last_seq(self) -> int:
+        with self._lock:
+            return self._events[-1].seq if self._events else 0
+
+    def append(self, event) -> None:
+        """
+        Add the newest event, seq must be larger than every stored one.
+        """
+        size = _size_of(event)
+        with self._lock:
+            self._events.append(event)
+            self._bytes += size
+
+            while self._events and (len(self._events) > self.max_events or self._bytes > self.max_bytes):
+                self._bytes -= _size_of(self._events.popleft())
+
+    def since(self, after_seq: int) -> List:
+        """
+        Every stored event with seq > after_seq, oldest first.
+        """
+        with self._lock:
+            if not self._events or after_seq >= self._events[-1].seq:
+                return []
+
+            # Relayed rings skip the seqs lost on the way, so search rather than count
+            offset = bisect_right(self._events, after_seq, key=lambda event: event.seq)
+            return list(islice(self._events, offset, None))
+
+
+def _size_of(event) -> int:
+    return EVENT_OVERHEAD_BYTES + (len(event.wire) if event.wire is not None else 0)
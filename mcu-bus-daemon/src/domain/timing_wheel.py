@@ -0,0 +1,89 @@
+import math
+
+from typing import Generic, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class TimingWheel(Generic[T]):
+    """
+    Hierarchical timing wheel: schedule is O(1), and each tick only looks at
+    one slot per level, however many timers are pending.
+
+    Level 0 has one slot per tick; a slot of level n spans a whole turn of
+    level n - 1 and is cascaded down when that turn begins. Deadlines past the
+    top level are parked in it and cascaded again until they are in reach.
+    Timers cannot be cancelled, owners ignore the stale ones when they fire.
+    Not thread safe, callers hold their own lock.
+    """
+
+    def __init__(self, tick: float, start: float, slots: int = 64, levels: int = 4):
+        """
+        :param tick: seconds per level 0 slot, the expiry resolution
+        :param start: clock value of tick 0, same clock as the deadlines
+        :param slots: slots per level, a power of two
+        :param levels: number of levels, the range is tick * slots ** levels
+        """
+        if slots < 2 or slots & (slots - 1):
+            raise ValueError(f"slots must be a power of two, got {slots}")
+
+        self.tick = tick
+        self._start = start
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._levels = levels
+        self._wheels: List[List[List[Tuple[int, T]]]] = [[[] for _ in range(slots)] for _ in range(levels)]
+        self._now = 0
+        self._pending = 0
+
+    def __len__(self) -> int:
+        return self._pending
+
+    def schedule(self, item: T, deadline: float) -> None:
+        """
+        Fire item at the first tick at or after deadline, the next tick if it passed.
+        """
+        due = max(math.ceil((deadline - self._start) / self.tick), self._now + 1)
+        self._place(due, item)
+        self._pending += 1
+
+    def advance(self, now: float) -> List[T]:
+        """
+        Run every tick up to now.
+        :return: items whose deadline passed, in tick order
+        """
+        target = math.floor((now - self._start) / self.tick)
+        bits, mask, wheels = self._bits, self._mask, self._wheels
+        expired: List[T] = []
+
+        while self._now < target:
+            self._now = tick = self._now + 1
+
+            # Levels whose turn begins at this tick, highest first, then level 0
+            level = 1
+            while level < self._levels and not tick & ((1 << bits * level) - 1):
+                level += 1
+            for current in range(level - 1, -1, -1):
+                index = (tick >> bits * current) & mask
+                bucket, wheels[current][index] = wheels[current][index], []
+                for due, item in bucket:
+                    if due <= tick:
+                        expired.append(item)
+                        self._pending -= 1
+                    else:
+                        self._place(due, item)
+
+        return expired
+
+    def _place(self, due: int, item: T) -> None:
+        delta = due - self._now
+        bits = self._bits
+        slot_due = due
+        for level in range(self._levels):
+            if delta < 1 << bits * (level + 1):
+                break
+        else:
+            # Out of range, park at the far end of the top level
+            slot_due = self._now + (1 << bits * self._levels) - 1
+
+        self._wheels[level][(slot_due >> bits * level) & self._mask].append((due, item))
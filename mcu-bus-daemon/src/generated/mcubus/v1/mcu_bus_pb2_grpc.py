@@ -12,7 +12,6 @@ _version_not_supported = False
 
 try:
     from grpc._utilities import first_version_is_lower
-
     _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
 except ImportError:
     _version_not_supported = True
@@ -37,20 +36,45 @@ class MCUBusServiceStub(object):
             channel: A grpc.Channel.
         """
         self.Register = channel.unary_unary(
-            '/mcubus.v1.MCUBusService/Register',
-            request_serializer=mcubus_dot_v1_dot_messages__pb2.RegisterRequest.SerializeToString,
-            response_deserializer=mcubus_dot_v1_dot_messages__pb2.RegisterReply.FromString,
-            _registered_method=True)
+                '/mcubus.v1.MCUBusService/Register',
+                request_serializer=mcubus_dot_v1_dot_messages__pb2.RegisterRequest.SerializeToString,
+                response_deserializer=mcubus_dot_v1_dot_messages__pb2.RegisterReply.FromString,
+                _registered_method=True)
         self.UnRegister = channel.unary_unary(
-            '/mcubus.v1.MCUBusService/UnRegister',
-            request_serializer=mcubus_dot_v1_dot_messages__pb2.UnSubscribeRequest.SerializeToString,
-            response_deserializer=mcubus_dot_v1_dot_messages__pb2.UnSubscribeReplay.FromString,
-            _registered_method=True)
+                '/mcubus.v1.MCUBusService/UnRegister',
+                request_serializer=mcubus_dot_v1_dot_messages__pb2.UnSubscribeRequest.SerializeToString,
+                response_deserializer=mcubus_dot_v1_dot_messages__pb2.UnSubscribeReplay.FromString,
+                _registered_method=True)
+        self.Heartbeat = channel.unary_unary(
+                '/mcubus.v1.MCUBusService/Heartbeat',
+                request_serializer=mcubus_dot_v1_dot_messages__pb2.HeartbeatRequest.SerializeToString,
+                response_deserializer=mcubus_dot_v1_dot_messages__pb2.HeartbeatReply.FromString,
+                _registered_method=True)
         self.SubscribeEvents = channel.unary_stream(
-            '/mcubus.v1.MCUBusService/SubscribeEvents',
-            request_serializer=mcubus_dot_v1_dot_messages__pb2.SubscribeRequest.SerializeToString,
-            response_deserializer=mcubus_dot_v1_dot_events__pb2.BusEvent.FromString,
-            _registered_method=True)
+                '/mcubus.v1.MCUBusService/SubscribeEvents',
+                request_serializer=mcubus_dot_v1_dot_messages__pb2.SubscribeRequest.SerializeToString,
+                response_deserializer=mcubus_dot_v1_dot_events__pb2.BusEvent.FromString,
+                _registered_method=True)
+        self.SubscribeEventBatches = channel.unary_stream(
+                '/mcubus.v1.MCUBusService/SubscribeEventBatches',
+                request_serializer=mcubus_dot_v1_dot_messages__pb2.SubscribeRequest.SerializeToString,
+                response_deserializer=mcubus_dot_v1_dot_events__pb2.BusEventBatch.FromString,
+                _registered_method=True)
+        self.SubscribeEventsFlow = channel.stream_stream(
+                '/mcubus.v1.MCUBusService/SubscribeEventsFlow',
+                request_serializer=mcubus_dot_v1_dot_messages__pb2.FlowRequest.SerializeToString,
+                response_deserializer=mcubus_dot_v1_dot_events__pb2.BusEvent.FromString,
+                _registered_method=True)
+        self.GetLatest = channel.unary_unary(
+                '/mcubus.v1.MCUBusService/GetLatest',
+                request_serializer=mcubus_dot_v1_dot_messages__pb2.GetLatestRequest.SerializeToString,
+                response_deserializer=mcubus_dot_v1_dot_events__pb2.LatestValues.FromString,
+                _registered_method=True)
+        self.GetSnapshot = channel.unary_unary(
+                '/mcubus.v1.MCUBusService/GetSnapshot',
+                request_serializer=mcubus_dot_v1_dot_messages__pb2.GetSnapshotRequest.SerializeToString,
+                response_deserializer=mcubus_dot_v1_dot_events__pb2.LatestValues.FromString,
+                _registered_method=True)
 
 
 class MCUBusServiceServicer(object):
@@ -70,6 +94,13 @@ class MCUBusServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def Heartbeat(self, request, context):
+        """- Renew the lease of a registered module -
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def SubscribeEvents(self, request, context):
         """- Subscribe mcu bus daemon to receive mcu events -
         """
@@ -77,46 +108,99 @@ class MCUBusServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def SubscribeEventBatches(self, request, context):
+        """- Same as SubscribeEvents, several events per message -
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SubscribeEventsFlow(self, request_iterator, context):
+        """- Same as SubscribeEvents, sends no more events than the client granted credits for -
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetLatest(self, request, context):
+        """- Current value per module and payload kind, without holding a stream -
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetSnapshot(self, request, context):
+        """- Current values of every module -
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_MCUBusServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
-        'Register': grpc.unary_unary_rpc_method_handler(
-            servicer.Register,
-            request_deserializer=mcubus_dot_v1_dot_messages__pb2.RegisterRequest.FromString,
-            response_serializer=mcubus_dot_v1_dot_messages__pb2.RegisterReply.SerializeToString,
-        ),
-        'UnRegister': grpc.unary_unary_rpc_method_handler(
-            servicer.UnRegister,
-            request_deserializer=mcubus_dot_v1_dot_messages__pb2.UnSubscribeRequest.FromString,
-            response_serializer=mcubus_dot_v1_dot_messages__pb2.UnSubscribeReplay.SerializeToString,
-        ),
-        'SubscribeEvents': grpc.unary_stream_rpc_method_handler(
-            servicer.SubscribeEvents,
-            request_deserializer=mcubus_dot_v1_dot_messages__pb2.SubscribeRequest.FromString,
-            response_serializer=mcubus_dot_v1_dot_events__pb2.BusEvent.SerializeToString,
-        ),
+            'Register': grpc.unary_unary_rpc_method_handler(
+                    servicer.Register,
+                    request_deserializer=mcubus_dot_v1_dot_messages__pb2.RegisterRequest.FromString,
+                    response_serializer=mcubus_dot_v1_dot_messages__pb2.RegisterReply.SerializeToString,
+            ),
+            'UnRegister': grpc.unary_unary_rpc_method_handler(
+                    servicer.UnRegister,
+                    request_deserializer=mcubus_dot_v1_dot_messages__pb2.UnSubscribeRequest.FromString,
+                    response_serializer=mcubus_dot_v1_dot_messages__pb2.UnSubscribeReplay.SerializeToString,
+            ),
+            'Heartbeat': grpc.unary_unary_rpc_method_handler(
+                    servicer.Heartbeat,
+                    request_deserializer=mcubus_dot_v1_dot_messages__pb2.HeartbeatRequest.FromString,
+                    response_serializer=mcubus_dot_v1_dot_messages__pb2.HeartbeatReply.SerializeToString,
+            ),
+            'SubscribeEvents': grpc.unary_stream_rpc_method_handler(
+                    servicer.SubscribeEvents,
+                    request_deserializer=mcubus_dot_v1_dot_messages__pb2.SubscribeRequest.FromString,
+                    response_serializer=mcubus_dot_v1_dot_events__pb2.BusEvent.SerializeToString,
+            ),
+            'SubscribeEventBatches': grpc.unary_stream_rpc_method_handler(
+                    servicer.SubscribeEventBatches,
+                    request_deserializer=mcubus_dot_v1_dot_messages__pb2.SubscribeRequest.FromString,
+                    response_serializer=mcubus_dot_v1_dot_events__pb2.BusEventBatch.SerializeToString,
+            ),
+            'SubscribeEventsFlow': grpc.stream_stream_rpc_method_handler(
+                    servicer.SubscribeEventsFlow,
+                    request_deserializer=mcubus_dot_v1_dot_messages__pb2.FlowRequest.FromString,
+                    response_serializer=mcubus_dot_v1_dot_events__pb2.BusEvent.SerializeToString,
+            ),
+            'GetLatest': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetLatest,
+                    request_deserializer=mcubus_dot_v1_dot_messages__pb2.GetLatestRequest.FromString,
+                    response_serializer=mcubus_dot_v1_dot_events__pb2.LatestValues.SerializeToString,
+            ),
+            'GetSnapshot': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetSnapshot,
+                    request_deserializer=mcubus_dot_v1_dot_messages__pb2.GetSnapshotRequest.FromString,
+                    response_serializer=mcubus_dot_v1_dot_events__pb2.LatestValues.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
-        'mcubus.v1.MCUBusService', rpc_method_handlers)
+            'mcubus.v1.MCUBusService', rpc_method_handlers)
     server.add_generic_rpc_handlers((generic_handler,))
     server.add_registered_method_handlers('mcubus.v1.MCUBusService', rpc_method_handlers)
 
 
-# This class is part of an EXPERIMENTAL API.
+ # This class is part of an EXPERIMENTAL API.
 class MCUBusService(object):
     """Missing associated documentation comment in .proto file."""
 
     @staticmethod
     def Register(request,
-                 target,
-                 options=(),
-                 channel_credentials=None,
-                 call_credentials=None,
-                 insecure=False,
-                 compression=None,
-                 wait_for_ready=None,
-                 timeout=None,
-                 metadata=None):
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
         return grpc.experimental.unary_unary(
             request,
             target,
@@ -135,15 +219,15 @@ class MCUBusService(object):
 
     @staticmethod
     def UnRegister(request,
-                   target,
-                   options=(),
-                   channel_credentials=None,
-                   call_credentials=None,
-                   insecure=False,
-                   compression=None,
-                   wait_for_ready=None,
-                   timeout=None,
-                   metadata=None):
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
         return grpc.experimental.unary_unary(
             request,
             target,
@@ -160,17 +244,44 @@ class MCUBusService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def Heartbeat(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/mcubus.v1.MCUBusService/Heartbeat',
+            mcubus_dot_v1_dot_messages__pb2.HeartbeatRequest.SerializeToString,
+            mcubus_dot_v1_dot_messages__pb2.HeartbeatReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def SubscribeEvents(request,
-                        target,
-                        options=(),
-                        channel_credentials=None,
-                        call_credentials=None,
-                        insecure=False,
-                        compression=None,
-                        wait_for_ready=None,
-                        timeout=None,
-                        metadata=None):
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
         return grpc.experimental.unary_stream(
             request,
             target,
@@ -186,3 +297,111 @@ class MCUBusService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def SubscribeEventBatches(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/mcubus.v1.MCUBusService/SubscribeEventBatches',
+            mcubus_dot_v1_dot_messages__pb2.SubscribeRequest.SerializeToString,
+            mcubus_dot_v1_dot_events__pb2.BusEventBatch.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SubscribeEventsFlow(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/mcubus.v1.MCUBusService/SubscribeEventsFlow',
+            mcubus_dot_v1_dot_messages__pb2.FlowRequest.SerializeToString,
+            mcubus_dot_v1_dot_events__pb2.BusEvent.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetLatest(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/mcubus.v1.MCUBusService/GetLatest',
+            mcubus_dot_v1_dot_messages__pb2.GetLatestRequest.SerializeToString,
+            mcubus_dot_v1_dot_events__pb2.LatestValues.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetSnapshot(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/mcubus.v1.MCUBusService/GetSnapshot',
+            mcubus_dot_v1_dot_messages__pb2.GetSnapshotRequest.SerializeToString,
+            mcubus_dot_v1_dot_events__pb2.LatestValues.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
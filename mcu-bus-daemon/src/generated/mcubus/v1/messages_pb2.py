@@ -22,23 +22,38 @@ _runtime_version.ValidateProtobufRuntimeVersion(
 _sym_db = _symbol_database.Default()
 
 
+from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x18mcubus/v1/messages.proto\x12\tmcubus.v1\"\x11\n\x0fRegisterRequest\"D\n\rRegisterReply\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x11\n\tmodule_id\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\"\'\n\x12UnSubscribeRequest\x12\x11\n\tmodule_id\x18\x01 \x01(\t\"5\n\x11UnSubscribeReplay\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\x12\n\x10SubscribeRequestb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x18mcubus/v1/messages.proto\x12\tmcubus.v1\x1a\x1fgoogle/protobuf/timestamp.proto\"\xb8\x01\n\x0fRegisterRequest\x12\x11\n\tmodule_id\x18\x01 \x01(\t\x12\x13\n\x0bmodule_type\x18\x02 \x01(\t\x12:\n\x08metadata\x18\x03 \x03(\x0b\x32(.mcubus.v1.RegisterRequest.MetadataEntry\x12\x10\n\x08lease_ms\x18\x04 \x01(\r\x1a/\n\rMetadataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"X\n\rRegisterReply\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x13\n\x0b\x61ssigned_id\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\x12\x10\n\x08lease_ms\x18\x04 \x01(\r\"%\n\x10HeartbeatRequest\x12\x11\n\tmodule_id\x18\x01 \x01(\t\"D\n\x0eHeartbeatReply\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x10\n\x08lease_ms\x18\x03 \x01(\r\"\'\n\x12UnSubscribeRequest\x12\x11\n\tmodule_id\x18\x01 \x01(\t\"5\n\x11UnSubscribeReplay\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\xe3\x01\n\x10SubscribeRequest\x12\x12\n\nmodule_ids\x18\x01 \x03(\t\x12\x13\n\x0b\x65vent_types\x18\x02 \x03(\t\x12\x16\n\x0emax_batch_size\x18\x03 \x01(\r\x12\x15\n\rmax_linger_ms\x18\x04 \x01(\r\x12\x1d\n\x10resume_after_seq\x18\x05 \x01(\x04H\x00\x88\x01\x01\x12\x30\n\x0creplay_since\x18\x06 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x11\n\tpredicate\x18\x07 \x01(\tB\x13\n\x11_resume_after_seq\"N\n\x0b\x46lowRequest\x12.\n\tsubscribe\x18\x01 \x01(\x0b\x32\x1b.mcubus.v1.SubscribeRequest\x12\x0f\n\x07\x63redits\x18\x02 \x01(\r\"&\n\x10GetLatestRequest\x12\x12\n\nmodule_ids\x18\x01 \x03(\t\"\x14\n\x12GetSnapshotRequestb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'mcubus.v1.messages_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_REGISTERREQUEST']._serialized_start=39
-  _globals['_REGISTERREQUEST']._serialized_end=56
-  _globals['_REGISTERREPLY']._serialized_start=58
-  _globals['_REGISTERREPLY']._serialized_end=126
-  _globals['_UNSUBSCRIBEREQUEST']._serialized_start=128
-  _globals['_UNSUBSCRIBEREQUEST']._serialized_end=167
-  _globals['_UNSUBSCRIBEREPLAY']._serialized_start=169
-  _globals['_UNSUBSCRIBEREPLAY']._serialized_end=222
-  _globals['_SUBSCRIBEREQUEST']._serialized_start=224
-  _globals['_SUBSCRIBEREQUEST']._serialized_end=242
+  _globals['_REGISTERREQUEST_METADATAENTRY']._loaded_options = None
+  _globals['_REGISTERREQUEST_METADATAENTRY']._serialized_options = b'8\001'
+  _globals['_REGISTERREQUEST']._serialized_start=73
+  _globals['_REGISTERREQUEST']._serialized_end=257
+  _globals['_REGISTERREQUEST_METADATAENTRY']._serialized_start=210
+  _globals['_REGISTERREQUEST_METADATAENTRY']._serialized_end=257
+  _globals['_REGISTERREPLY']._serialized_start=259
+  _globals['_REGISTERREPLY']._serialized_end=347
+  _globals['_HEARTBEATREQUEST']._serialized_start=349
+  _globals['_HEARTBEATREQUEST']._serialized_end=386
+  _globals['_HEARTBEATREPLY']._serialized_start=388
+  _globals['_HEARTBEATREPLY']._serialized_end=456
+  _globals['_UNSUBSCRIBEREQUEST']._serialized_start=458
+  _globals['_UNSUBSCRIBEREQUEST']._serialized_end=497
+  _globals['_UNSUBSCRIBEREPLAY']._serialized_start=499
+  _globals['_UNSUBSCRIBEREPLAY']._serialized_end=552
+  _globals['_SUBSCRIBEREQUEST']._serialized_start=555
+  _globals['_SUBSCRIBEREQUEST']._serialized_end=782
+  _globals['_FLOWREQUEST']._serialized_start=784
+  _globals['_FLOWREQUEST']._serialized_end=862
+  _globals['_GETLATESTREQUEST']._serialized_start=864
+  _globals['_GETLATESTREQUEST']._serialized_end=902
+  _globals['_GETSNAPSHOTREQUEST']._serialized_start=904
+  _globals['_GETSNAPSHOTREQUEST']._serialized_end=924
 # @@protoc_insertion_point(module_scope)
@@ -0,0 +1,106 @@
+import asyncio
+import time
+
+from collections import deque
+from typing import Deque, List, Optional
+
+from application.bus_handler import BusHandler
+from domain.mcu_bus import BusEvent, Subscriber
+
+
+class AsyncCanBusHandler(BusHandler):
+    """
+    BusHandler for the grpc.aio server. Subscriber queues are AsyncEventQueue
+    and live on the event loop; publish() may be called from any thread and
+    hands events over to the loop in batches.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, **kwargs):
+        """
+        :param loop: event loop the subscriber queues belong to
+        :param kwargs: BusHandler options
+        """
+        super().__init__(**kwargs)
+        self._loop = loop
+        self._handoff: Deque[BusEvent] = deque()
+        self._drain_scheduled = False
+
+    async def take_event(self, subscriber_id: str, timeout: Optional[float] = None) -> Optional[BusEvent]:
+        with self._lock:
+            subscriber = self.subscribers.get(subscriber_id)
+
+        if not subscriber:
+            raise KeyError(subscriber_id)
+
+        started = time.perf_counter()
+        try:
+            return await self._take_event_for(subscriber, timeout)
+        finally:
+            self.metrics.take_wait_seconds.observe(time.perf_counter() - started)
+
+    async def take_events(self, subscriber_id: str, max_n: int, timeout: Optional[float] = None) -> List[BusEvent]:
+        with self._lock:
+            subscriber = self.subscribers.get(subscriber_id)
+
+        if not subscriber:
+            raise KeyError(subscriber_id)
+
+        started = time.perf_counter()
+        try:
+            return await self._take_events_for(subscriber, max_n, timeout)
+        finally:
+            self.metrics.take_wait_seconds.observe(time.perf_counter() - started)
+
+    def _deliver(self, event: BusEvent) -> None:
+        # Stamped and encoded on the calling (ingest) thread, keeps the loop free for I/O
+        if self._is_loop_thread():
+            self._dispatch(event)
+        else:
+            # One wakeup per burst, not per event
+            self._handoff.append(event)
+            if not self._drain_scheduled:
+                self._drain_scheduled = True
+                self._loop.call_soon_threadsafe(self._drain_handoff)
+
+    def _drain_handoff(self) -> None:
+        self._drain_scheduled = False
+        handoff = self._handoff
+        while handoff:
+            self._dispatch(handoff.popleft())
+
+    def _is_loop_thread(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    # ---- hooks ----
+    def _on_subscriber_added(self, subscriber: Subscriber) -> None:
+        subscriber.active = True
+
+    def _on_subscriber_removed(self, subscriber: Subscriber) -> None:
+        subscriber.active = False
+        subscriber.queue.close()
+
+    async def _take_event_for(self, subscriber: Subscriber, timeout: Optional[float]) -> Optional[BusEvent]:
+        if not subscriber.active:
+            raise RuntimeError("Subscriber inactive")
+
+        event = await subscriber.queue.get(timeout)
+        if event is None and subscriber.queue.closed:
+            raise RuntimeError("Subscriber closed")
+        return event
+
+    async def _take_events_for(
+            self,
+            subscriber: Subscriber,
+            max_n: int,
+            timeout: Optional[float],
+    ) -> List[BusEvent]:
+        if not subscriber.active:
+            raise RuntimeError("Subscriber inactive")
+
+        events = await subscriber.queue.get_many(max_n, timeout)
+        if not events and subscriber.queue.closed:
+            raise RuntimeError("Subscriber closed")
+        return events
@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 from application.bus_handler import BusHandler
 from domain.mcu_bus import BusEvent, Subscriber
 
@@ -9,13 +11,22 @@ class CanBusHandler(BusHandler):
 
     def _on_subscriber_removed(self, subscriber: Subscriber) -> None:
         subscriber.active = False
-        subscriber.queue.put(None)
+        subscriber.queue.close()
+
+    def _take_event_for(self, subscriber: Subscriber, timeout: Optional[float]) -> Optional[BusEvent]:
+        if not subscriber.active:
+            raise RuntimeError("Subscriber inactive")
+
+        event = subscriber.queue.get(timeout)
+        if event is None and subscriber.queue.closed:
+            raise RuntimeError("Subscriber closed")
+        return event
 
-    def _take_event_for(self, subscriber: Subscriber) -> BusEvent:
-        while subscriber.active:
-            event = subscriber.queue.get()
-            if event is None:
-                raise RuntimeError("Subscriber closed")
-            return event
+    def _take_events_for(self, subscriber: Subscriber, max_n: int, timeout: Optional[float]) -> List[BusEvent]:
+        if not subscriber.active:
+            raise RuntimeError("Subscriber inactive")
 
-        raise RuntimeError("Subscriber inactive")
+        events = subscriber.queue.get_many(max_n, timeout)
+        if not events and subscriber.queue.closed:
+            raise RuntimeError("Subscriber closed")
+        return events
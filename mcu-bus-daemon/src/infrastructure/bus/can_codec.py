@@ -0,0 +1,208 @@
+"""
+CAN frame layout shared with the MCU firmware.
+
+Standard 11-bit identifiers: bits 10..7 are the message type, bits 6..0 the
+MCU node id (module id "mcu_<node>"). Payloads are little endian:
+
+    0x080 | node  sensor data     <hBBHBB  temperature 0.01 °C, humidity 0.5 %,
+                                            soil moisture 0.5 %, light 1 lux,
+                                            water level 0.5 %, pH 0.1
+    0x100 | node  control status  <BBHB    device code, active, power 0.1 %, reason code
+    0x180 | node  alert           <BH      severity code, alert code
+
+The layout lives in CATALOGUE, decoding is driven by it.
+"""
+
+import struct
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Type, Union
+
+from domain.mcu_bus import BusEvent, BusPayload, SensorDataEvent, ControlStatusEvent, AlertEvent
+
+NODE_MASK = 0x07F
+TYPE_MASK = 0x780
+
+SENSOR_DATA_ID = 0x080
+CONTROL_STATUS_ID = 0x100
+ALERT_ID = 0x180
+
+DEVICES = ("cooling_fan", "water_pump", "grow_light", "heater")
+REASONS = ("", "auto_regulation", "threshold_reached", "manual")
+SEVERITIES = ("info", "warning", "critical")
+ALERTS = {
+    1: ("SENSOR_OK", "All sensors operating normally"),
+    2: ("PUMP_CYCLE", "Water pump completed cycle"),
+    3: ("LOW_WATER", "Water level below 30%"),
+    4: ("HIGH_TEMP", "Temperature exceeds 30°C"),
+    5: ("LOW_HUMIDITY", "Humidity below 40%"),
+    6: ("SENSOR_FAIL", "Soil moisture sensor not responding"),
+    7: ("PUMP_ERROR", "Water pump malfunction detected"),
+}
+
+# (arbitration id, data, receive time in epoch seconds)
+Frame = Tuple[int, bytes, float]
+
+
+class CanDecodeError(ValueError):
+    ...
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """
+    One raw struct value. A tuple name spreads a tuple table entry over
+    several payload fields.
+    """
+    name: Union[str, Tuple[str, ...]]
+    scale: Optional[float] = None
+    table: Optional[Union[Sequence, Mapping]] = None
+    convert: Optional[Callable] = None
+
+
+@dataclass(frozen=True)
+class MessageSpec:
+    """
+    One message type: struct format, payload dataclass and the raw fields
+    in payload field order.
+    """
+    base_id: int
+    fmt: str
+    payload: Type[BusPayload]
+    fields: Tuple[FieldSpec, ...]
+
+
+CATALOGUE: Tuple[MessageSpec, ...] = (
+    MessageSpec(
+        SENSOR_DATA_ID,
+        "<hBBHBB",
+        SensorDataEvent,
+        (
+            FieldSpec("temperature", scale=0.01),
+            FieldSpec("humidity", scale=0.5),
+            FieldSpec("soil_moisture", scale=0.5),
+            FieldSpec("light_level", scale=1.0),
+            FieldSpec("water_level", scale=0.5),
+            FieldSpec("ph_value", scale=0.1),
+        ),
+    ),
+    MessageSpec(
+        CONTROL_STATUS_ID,
+        "<BBHB",
+        ControlStatusEvent,
+        (
+            FieldSpec("device", table=DEVICES),
+            FieldSpec("is_active", convert=bool),
+            FieldSpec("power_level", scale=0.1),
+            FieldSpec("reason", table=REASONS),
+        ),
+    ),
+    MessageSpec(
+        ALERT_ID,
+        "<BH",
+        AlertEvent,
+        (
+            FieldSpec("severity", table=SEVERITIES),
+            FieldSpec(("code", "message"), table=ALERTS),
+        ),
+    ),
+)
+
+
+class _CompiledMessage:
+    """
+    MessageSpec turned into a struct.Struct and a generated raw tuple -> payload
+    builder with scales and tables inlined, no per-field loop at decode time.
+    """
+
+    def __init__(self, spec: MessageSpec):
+        self.spec = spec
+        self.layout = struct.Struct(spec.fmt)
+        self.size = self.layout.size
+        self.build = _compile_builder(spec)
+
+
+def _compile_builder(spec: MessageSpec) -> Callable[[tuple], BusPayload]:
+    namespace = {"payload": spec.payload}
+    args = []
+    for i, field in enumerate(spec.fields):
+        value = f"raw[{i}]"
+        if field.table is not None:
+            namespace[f"table_{i}"] = field.table
+            value = f"table_{i}[{value}]"
+        elif field.convert is not None:
+            namespace[f"convert_{i}"] = field.convert
+            value = f"convert_{i}({value})"
+        elif field.scale is not None:
+            value = f"{value} * {field.scale!r}"
+        args.append(value if isinstance(field.name, str) else f"*{value}")
+
+    source = f"def build(raw):\n    return payload({', '.join(args)})\n"
+    exec(compile(source, f"<can {spec.payload.__name__}>", "exec"), namespace)
+    return namespace["build"]
+
+
+MESSAGES: Dict[int, _CompiledMessage] = {spec.base_id: _CompiledMessage(spec) for spec in CATALOGUE}
+
+_MODULE_IDS = tuple(f"mcu_{node}" for node in range(NODE_MASK + 1))
+
+
+def _event(arbitration_id: int, timestamp: float, payload: BusPayload) -> BusEvent:
+    module_id = _MODULE_IDS[arbitration_id & NODE_MASK]
+    micros = int(timestamp * 1_000_000)
+    return BusEvent(f"{module_id}_{micros}", module_id, micros * 1000, payload)
+
+
+def decode_frame(arbitration_id: int, data: bytes, timestamp: float) -> BusEvent:
+    """
+    One CAN frame to a BusEvent.
+    :param arbitration_id: 11-bit CAN id
+    :param data: frame payload
+    :param timestamp: receive time, epoch seconds
+    """
+    message = MESSAGES.get(arbitration_id & TYPE_MASK)
+    if message is None:
+        raise CanDecodeError(f"Unknown arbitration id: {arbitration_id:#05x}")
+    if len(data) < message.size:
+        raise CanDecodeError(f"Short payload for {arbitration_id:#05x}: {len(data)} bytes")
+
+    raw = message.layout.unpack_from(data)
+    try:
+        payload = message.build(raw)
+    except (IndexError, KeyError):
+        raise CanDecodeError(f"Unknown code in {arbitration_id:#05x}: {raw}")
+    return _event(arbitration_id, timestamp, payload)
+
+
+def decode_frames(frames: Sequence[Frame]) -> List[Optional[BusEvent]]:
+    """
+    Batch decode. Frames of the same message type are unpacked together in
+    one iter_unpack pass over their joined payloads.
+    :return: one event per frame in input order, None where a frame is undecodable
+    """
+    events: List[Optional[BusEvent]] = [None] * len(frames)
+
+    groups: Dict[int, List[int]] = {}
+    for i, (arbitration_id, data, _) in enumerate(frames):
+        message = MESSAGES.get(arbitration_id & TYPE_MASK)
+        # Controllers may pad to 8 bytes, shorter is unusable
+        if message is not None and len(data) >= message.size:
+            groups.setdefault(message.spec.base_id, []).append(i)
+
+    module_ids = _MODULE_IDS
+    for base_id, indexes in groups.items():
+        message = MESSAGES[base_id]
+        build, size = message.build, message.size
+        group = [frames[i] for i in indexes]
+        joined = b"".join([data[:size] for _, data, _ in group])
+
+        for i, (arbitration_id, _, timestamp), raw in zip(indexes, group, message.layout.iter_unpack(joined)):
+            try:
+                payload = build(raw)
+            except (IndexError, KeyError):
+                continue
+            module_id = module_ids[arbitration_id & NODE_MASK]
+            micros = int(timestamp * 1_000_000)
+            events[i] = BusEvent(f"{module_id}_{micros}", module_id, micros * 1000, payload)
+
+    return events
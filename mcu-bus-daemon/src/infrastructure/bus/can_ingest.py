@@ -0,0 +1,270 @@
+import logging
+import threading
+import time
+
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Deque, List, Optional, Tuple
+
+from application.bus_handler import BusHandler
+from domain.deadband import DeadbandFilter
+from domain.mcu_bus import BusEvent
+from domain.metrics import MetricsRegistry
+from infrastructure.bus.can_codec import decode_frames
+
+logger = logging.getLogger(__name__)
+
+# Seconds between attempts to read a failed CAN interface, doubling up to the max
+RECV_RETRY_MIN = 0.1
+RECV_RETRY_MAX = 5.0
+
+
+def open_can_bus(interface: str, channel: str, **kwargs):
+    """
+    python-can bus, "socketcan" on the Pi, "virtual" for tests.
+    """
+    # Delayed import, the daemon runs without CAN support too
+    import can
+
+    return can.Bus(interface=interface, channel=channel, **kwargs)
+
+
+@dataclass
+class IngestStats:
+    frames: int = 0
+    recv_errors: int = 0
+    decode_errors: int = 0
+    suppressed: int = 0
+    published: int = 0
+    dropped: int = 0
+    frames_per_s: float = 0.0
+    latency_avg_ms: float = 0.0
+    latency_max_ms: float = 0.0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class CanIngest:
+    """
+    Reads CAN frames and publishes them on the bus handler.
+
+    Two threads: the reader drains the socket in batches and decodes, the
+    publisher calls BusHandler.publish. They meet in a bounded handoff, so
+    a publish held up by slow subscribers never stalls the socket; when the
+    handoff is full new frames are dropped and counted. With a deadband
+    filter, unchanged sensor samples are suppressed before the handoff.
+    """
+
+    def __init__(
+            self,
+            bus_handler: BusHandler,
+            can_bus,
+            batch_size: int = 64,
+            handoff_capacity: int = 8192,
+            report_interval: float = 60.0,
+            deadband: Optional[DeadbandFilter] = None,
+    ):
+        """
+        :param bus_handler: where decoded events are published
+        :param can_bus: python-can bus, closed by stop()
+        :param batch_size: max frames read per wakeup
+        :param handoff_capacity: max decoded events waiting for publish
+        :param report_interval: seconds between stats log lines
+        :param deadband: report by exception filter, every sample is published if None
+        """
+        self.bus_handler = bus_handler
+        self.can_bus = can_bus
+        self.batch_size = batch_size
+        self.handoff_capacity = handoff_capacity
+        self.report_interval = report_interval
+        self.deadband = deadband
+
+        self._lock = threading.Lock()
+        self._has_events = threading.Condition(self._lock)
+        self._handoff: Deque[Tuple[BusEvent, float]] = deque()
+        self._stopping = False
+        self._stopped = threading.Event()
+
+        # Counters since start, latency and rate over the current window
+        self._stats = IngestStats()
+        self._window_start = time.monotonic()
+        self._window_frames = 0
+        self._latency_sum = 0.0
+        self._latency_n = 0
+        self._latency_max = 0.0
+
+        self._reader = threading.Thread(target=self._read_loop, daemon=True, name="CanIngestReader")
+        self._publisher = threading.Thread(target=self._publish_loop, daemon=True, name="CanIngestPublisher")
+
+    def start(self) -> None:
+        self._reader.start()
+        self._publisher.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopping = True
+            self._has_events.notify()
+        self._stopped.set()
+
+        self._reader.join()
+        self._publisher.join()
+        self.can_bus.shutdown()
+
+    def stats(self) -> IngestStats:
+        with self._lock:
+            return IngestStats(**self._stats.as_dict())
+
+    def register_metrics(self, registry: MetricsRegistry) -> None:
+        """
+        Export the ingest counters, copied from stats() at scrape time.
+        """
+        counters = {
+            "frames": registry.counter("mcubus_can_frames_total", "CAN frames read"),
+            "recv_errors": registry.counter("mcubus_can_recv_errors_total", "Failed reads of the CAN interface"),
+            "decode_errors": registry.counter("mcubus_can_decode_errors_total", "CAN frames that failed to decode"),
+            "suppressed": registry.counter("mcubus_can_suppressed_total", "Sensor samples within their deadband"),
+            "published": registry.counter("mcubus_can_published_total", "Decoded CAN events published"),
+            "dropped": registry.counter("mcubus_can_dropped_total", "Decoded CAN events dropped, publisher behind"),
+        }
+
+        def collect():
+            stats = self.stats()
+            for field, counter in counters.items():
+                counter.labels().value = getattr(stats, field)
+
+        registry.on_collect(collect)
+
+    # ---- reader ----
+    def _read_loop(self) -> None:
+        # Delayed import, like open_can_bus
+        from can import CanError
+
+        retry = 0.0
+        while not self._stopping:
+            try:
+                frames = self._recv_batch()
+            except CanError as e:
+                # Link down or interface gone, keep trying until it is back
+                with self._lock:
+                    self._stats.recv_errors += 1
+                if not retry:
+                    logger.error("CAN read failed, retrying: %s", e)
+                retry = min(max(retry * 2, RECV_RETRY_MIN), RECV_RETRY_MAX)
+                self._stopped.wait(retry)
+                continue
+
+            if retry:
+                logger.info("CAN read recovered")
+                retry = 0.0
+
+            if frames:
+                events = self._decode(frames)
+                self._hand_over(events, len(frames))
+
+            if time.monotonic() - self._window_start >= self.report_interval:
+                self._report()
+
+    def _recv_batch(self) -> list:
+        # Block for the first frame only, then take whatever is already queued
+        msg = self.can_bus.recv(timeout=0.2)
+        if msg is None:
+            return []
+
+        frames = [msg]
+        while len(frames) < self.batch_size:
+            msg = self.can_bus.recv(timeout=0)
+            if msg is None:
+                break
+            frames.append(msg)
+        return frames
+
+    def _decode(self, frames: list) -> List[Tuple[BusEvent, float]]:
+        frames = [
+            (msg.arbitration_id, msg.data, msg.timestamp)
+            for msg in frames
+            if not (msg.is_error_frame or msg.is_remote_frame)
+        ]
+
+        events = []
+        deadband = self.deadband
+        for (arbitration_id, _, timestamp), event in zip(frames, decode_frames(frames)):
+            if event is None:
+                self._stats.decode_errors += 1
+                logger.debug("Dropping undecodable CAN frame %#05x", arbitration_id)
+                continue
+            if deadband is not None and not deadband.admit(event):
+                self._stats.suppressed += 1
+                continue
+            events.append((event, timestamp))
+        return events
+
+    def _hand_over(self, events: List[Tuple[BusEvent, float]], n_frames: int) -> None:
+        with self._lock:
+            self._stats.frames += n_frames
+            self._window_frames += n_frames
+
+            room = self.handoff_capacity - len(self._handoff)
+            if len(events) > room:
+                self._stats.dropped += len(events) - room
+                events = events[:room]
+
+            if events:
+                self._handoff.extend(events)
+                self._has_events.notify()
+
+    # ---- publisher ----
+    def _publish_loop(self) -> None:
+        while True:
+            with self._lock:
+                while not self._handoff and not self._stopping:
+                    self._has_events.wait()
+                if not self._handoff:
+                    return
+                batch, self._handoff = self._handoff, deque()
+
+            published, latency_sum, latency_max = 0, 0.0, 0.0
+            for event, received_at in batch:
+                try:
+                    if not self.bus_handler.publish(event):
+                        # Refused, its module is offline
+                        continue
+                except Exception as e:
+                    logger.error("Publish failed for %s: %s", event.event_id, e)
+                    continue
+
+                published += 1
+                # Frame timestamps are wall clock (kernel receive time on socketcan)
+                latency = time.time() - received_at
+                latency_sum += latency
+                latency_max = max(latency_max, latency)
+
+            with self._lock:
+                self._stats.published += published
+                self._latency_sum += latency_sum
+                self._latency_n += published
+                self._latency_max = max(self._latency_max, latency_max)
+
+    def _report(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            stats = self._stats
+            stats.frames_per_s = self._window_frames / (now - self._window_start)
+            stats.latency_avg_ms = self._latency_sum / self._latency_n * 1000 if self._latency_n else 0.0
+            stats.latency_max_ms = self._latency_max * 1000
+
+            self._window_start = now
+            self._window_frames = 0
+            self._latency_sum, self._latency_n, self._latency_max = 0.0, 0, 0.0
+
+        logger.info(
+            "CAN ingest: %.0f frames/s, %d read errors, %d decode errors, %d suppressed, %d dropped, "
+            "publish latency avg %.2f ms max %.2f ms",
+            stats.frames_per_s,
+            stats.recv_errors,
+            stats.decode_errors,
+            stats.suppressed,
+            stats.dropped,
+            stats.latency_avg_ms,
+            stats.latency_max_ms,
+        )
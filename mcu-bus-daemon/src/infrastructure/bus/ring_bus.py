@@ -0,0 +1,120 @@
+import logging
+import threading
+import time
+
+from typing import Callable
+
+from application.bus_handler import BusHandler
+from application.module_registry import OFFLINE_ALERT_CODE
+from domain.mcu_bus import AlertEvent, BusEvent
+from domain.metrics import MetricsRegistry
+from infrastructure.bus.can_bus_handler import CanBusHandler
+from infrastructure.bus.shm_ring import SharedEventRing
+
+logger = logging.getLogger(__name__)
+
+
+class RingBusHandler(CanBusHandler):
+    """
+    BusHandler of the ingest process in multi-process mode. Events are
+    sequenced, encoded and logged here as usual, then written to the shared
+    event ring the gRPC worker processes serve them from. Ring writes happen
+    under the seq lock, so the ring has a single writer and stays in seq order.
+    """
+
+    def __init__(self, ring: SharedEventRing, **kwargs):
+        """
+        :param ring: ring created by this process
+        :param kwargs: BusHandler options, an encoder is required
+        """
+        if kwargs.get("encoder") is None:
+            raise ValueError("RingBusHandler needs an encoder, the ring carries serialized events")
+        super().__init__(**kwargs)
+        self.ring = ring
+
+    def _record(self, event: BusEvent) -> None:
+        super()._record(event)
+        self.ring.append(event.seq, event.wire)
+
+
+class RingRelay:
+    """
+    Worker side of the shared event ring: a thread polls the ring and relays
+    new events into the local bus handler, whose subscribers are the streams
+    this worker serves. Polling instead of a cross-process wakeup keeps the
+    ingest process from ever waiting on a worker; an idle ring costs one
+    header read per poll interval.
+    """
+
+    def __init__(
+            self,
+            bus_handler: BusHandler,
+            ring: SharedEventRing,
+            decoder: Callable[[bytes], BusEvent],
+            poll_interval: float = 0.0005,
+            batch_size: int = 1024,
+    ):
+        """
+        :param bus_handler: local handler the events are relayed into
+        :param ring: ring attached by this process
+        :param decoder: serialized BusEvent to domain event, keeping the bytes as wire
+        :param poll_interval: seconds to sleep when the ring had nothing new
+        :param batch_size: max records read per poll
+        """
+        self.bus_handler = bus_handler
+        self.ring = ring
+        self.decoder = decoder
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+
+        self.relayed = 0
+        self._reader = ring.reader()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._relay_loop, daemon=True, name="RingRelay")
+
+    @property
+    def lost(self) -> int:
+        """
+        Events the writer overwrote before this worker read them.
+        """
+        return self._reader.lost
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._thread.join()
+
+    def register_metrics(self, registry: MetricsRegistry) -> None:
+        """
+        Export the relay counters, copied at scrape time.
+        """
+        relayed = registry.counter("mcubus_ring_relayed_total", "Events relayed from the shared event ring")
+        lost = registry.counter("mcubus_ring_lost_total", "Events overwritten in the shared ring before being read")
+
+        def collect():
+            relayed.labels().value = self.relayed
+            lost.labels().value = self.lost
+
+        registry.on_collect(collect)
+
+    def _relay_loop(self) -> None:
+        handler, reader, decode = self.bus_handler, self._reader, self.decoder
+        while not self._stopping.is_set():
+            records = reader.read(self.batch_size)
+            if not records:
+                time.sleep(self.poll_interval)
+                continue
+
+            for seq, wire in records:
+                try:
+                    event = decode(wire)
+                    payload = event.payload
+                    if isinstance(payload, AlertEvent) and payload.code == OFFLINE_ALERT_CODE:
+                        # The registry is in the ingest process, drop the values it dropped
+                        handler.forget_module(event.module_id)
+                    handler.relay(event)
+                except Exception as e:
+                    logger.error("Relay failed for seq %d: %s", seq, e)
+            self.relayed += len(records)
@@ -0,0 +1,201 @@
+import struct
+
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+# Ring header: magic, data capacity, then write position (bytes ever written) and last seq,
+# then the position the record being written reaches
+_HEADER = struct.Struct("<QQQQQ")
+_HEADER_SIZE = 64
+_MAGIC = 0x4D4355425553524E
+_WRITE_POS = struct.Struct("<QQ")
+_WRITE_POS_OFFSET = 16
+_RESERVED = struct.Struct("<Q")
+_RESERVED_OFFSET = 32
+
+# Record: payload length, seq, payload, padding to 8 bytes, seq again
+_RECORD = struct.Struct("<IxxxxQ")
+_TRAILER = struct.Struct("<Q")
+_WRAP = 0xFFFFFFFF
+_ALIGN = 8
+
+Record = Tuple[int, bytes]
+
+
+def _padded(n: int) -> int:
+    return (n + _ALIGN - 1) & ~(_ALIGN - 1)
+
+
+class SharedEventRing:
+    """
+    Serialized events in a multiprocessing.shared_memory ring: one writer
+    process, any number of reader processes, no locks.
+
+    The write position only grows, readers keep their own and are never
+    waited for; a reader that falls a whole ring behind skips ahead and
+    counts what it lost. A record carries its seq before and after the
+    payload. The writer publishes how far the record it is about to write
+    reaches before writing it, and the new write position after, seqlock
+    style; a reader only accepts records whose two seqs agree and whose
+    bytes no write had reached by the time it finished copying them.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm = shm
+        self._owner = owner
+        self._buf = shm.buf
+        magic, self.capacity, self._write_pos, _, _ = _HEADER.unpack_from(self._buf, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{shm.name} is not an event ring")
+
+    @classmethod
+    def create(cls, capacity: int, name: Optional[str] = None) -> "SharedEventRing":
+        """
+        New ring owned by the calling (writer) process.
+        :param capacity: data bytes, rounded up to 8
+        """
+        capacity = _padded(capacity)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=_HEADER_SIZE + capacity)
+        _HEADER.pack_into(shm.buf, 0, _MAGIC, capacity, 0, 0, 0)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedEventRing":
+        """
+        Existing ring, for reader processes.
+        """
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def close(self) -> None:
+        self._buf = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    # ---- writer ----
+    def append(self, seq: int, payload: bytes) -> None:
+        size = _RECORD.size + _padded(len(payload)) + _TRAILER.size
+        if size > self.capacity // 2:
+            raise ValueError(f"Record of {len(payload)} bytes too large for the ring")
+
+        buf = self._buf
+        pos = self._write_pos
+        offset = pos % self.capacity
+        room = self.capacity - offset
+        wraps = room < size
+
+        # Readers drop what lies within a ring of this before trusting a copy
+        _RESERVED.pack_into(buf, _RESERVED_OFFSET, pos + (room if wraps else 0) + size)
+
+        if wraps:
+            # Does not fit before the end: mark the rest as skipped, start over
+            if room >= _RECORD.size:
+                _RECORD.pack_into(buf, _HEADER_SIZE + offset, _WRAP, 0)
+            pos += room
+            offset = 0
+
+        start = _HEADER_SIZE + offset
+        body = start + _RECORD.size
+        buf[body:body + len(payload)] = payload
+        _TRAILER.pack_into(buf, start + size - _TRAILER.size, seq)
+        _RECORD.pack_into(buf, start, len(payload), seq)
+
+        self._write_pos = pos + size
+        _WRITE_POS.pack_into(buf, _WRITE_POS_OFFSET, self._write_pos, seq)
+
+    # ---- reader ----
+    def _load_write_pos(self) -> Tuple[int, int]:
+        """
+        :return: (write position, seq of the record before it)
+        """
+        return _WRITE_POS.unpack_from(self._buf, _WRITE_POS_OFFSET)
+
+    def _load_reserved(self) -> int:
+        """
+        :return: position the writer may have written up to, published or not
+        """
+        return max(_RESERVED.unpack_from(self._buf, _RESERVED_OFFSET)[0], self._load_write_pos()[0])
+
+    def reader(self) -> "RingReader":
+        """
+        Reader of the records written from now on.
+        """
+        return RingReader(self)
+
+
+class RingReader:
+    """
+    One reader's position in a SharedEventRing. Events lost to the writer
+    lapping it are counted from the gaps in seq.
+    """
+
+    def __init__(self, ring: SharedEventRing):
+        self._ring = ring
+        self._pos, self._last_seq = ring._load_write_pos()
+        self.lost = 0
+
+    def read(self, max_n: int = 1024) -> List[Record]:
+        """
+        Records written since the last read, oldest first, up to max_n.
+        :return: [(seq, payload)], empty if nothing new
+        """
+        ring = self._ring
+        buf, capacity = ring._buf, ring.capacity
+        write_pos, _ = ring._load_write_pos()
+        if write_pos - self._pos > capacity:
+            self._skip_to(write_pos)
+
+        records: List[Record] = []
+        starts: List[int] = []
+        pos = self._pos
+        last_seq = self._last_seq
+        while pos < write_pos and len(records) < max_n:
+            offset = pos % capacity
+            room = capacity - offset
+            if room < _RECORD.size:
+                pos += room
+                continue
+
+            start = _HEADER_SIZE + offset
+            length, seq = _RECORD.unpack_from(buf, start)
+            if length == _WRAP:
+                pos += room
+                continue
+
+            size = _RECORD.size + _padded(length) + _TRAILER.size
+            if (
+                    seq <= last_seq
+                    or size > room
+                    or _TRAILER.unpack_from(buf, start + size - _TRAILER.size)[0] != seq
+            ):
+                # Not fully visible yet (a previous lap's record), or overwritten under us
+                break
+
+            body = start + _RECORD.size
+            records.append((seq, bytes(buf[body:body + length])))
+            starts.append(pos)
+            last_seq = seq
+            pos += size
+
+        # Drop whatever the writer reached while it was being copied, finished or not
+        oldest_valid = ring._load_reserved() - capacity
+        if starts and starts[0] < oldest_valid:
+            first_valid = next((i for i, start in enumerate(starts) if start >= oldest_valid), len(starts))
+            records = records[first_valid:]
+            if not records:
+                self._skip_to(ring._load_write_pos()[0])
+                return records
+
+        self._pos = pos
+        if records:
+            self.lost += records[0][0] - self._last_seq - 1
+            self._last_seq = records[-1][0]
+        return records
+
+    def _skip_to(self, write_pos: int) -> None:
+        # Lapped by the writer, continue with new records
+        self._pos = write_pos
@@ -0,0 +1,42 @@
+import logging
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from domain.metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Loopback only unless asked otherwise, /metrics has no authentication and names every subscriber
+DEFAULT_HOST = "127.0.0.1"
+
+
+def start_metrics_server(registry: MetricsRegistry, port: int, host: str = DEFAULT_HOST) -> ThreadingHTTPServer:
+    """
+    Serve GET /metrics in the Prometheus text format from a daemon thread.
+    Call shutdown() on the returned server to stop it.
+    """
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # One line per scrape is noise
+            logger.debug("metrics %s - " + format, self.address_string(), *args)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="MetricsServer").start()
+    return server
@@ -0,0 +1,315 @@
+import logging
+import mmap
+import os
+import threading
+import time
+
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Deque, Iterator, List, Optional, Tuple
+
+from google.protobuf.message import DecodeError
+
+from domain.event_log import EventLog
+from domain.mcu_bus import BusEvent
+from infrastructure.servicer.bus_enevt_adapter import decode, encode, encode_varint
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".log"
+
+
+@dataclass(frozen=True)
+class EventLogConfig:
+    # Rotate when the open segment reaches this size or age
+    segment_bytes: int = 16 * 1024 * 1024
+    segment_age: float = 3600.0
+
+    # Delete the oldest closed segments beyond these limits
+    retention_bytes: int = 512 * 1024 * 1024
+    retention_age: float = 7 * 24 * 3600.0
+
+    # Group commit: one write + fsync per interval, whatever arrived meanwhile
+    commit_interval: float = 0.05
+
+    # Pending (not yet written) bytes before new events are dropped
+    max_pending_bytes: int = 8 * 1024 * 1024
+
+
+@dataclass
+class _Segment:
+    path: Path
+    first_seq: int
+
+    @property
+    def size(self) -> int:
+        return self.path.stat().st_size
+
+    @property
+    def modified_at(self) -> float:
+        return self.path.stat().st_mtime
+
+
+def _segment_path(directory: Path, first_seq: int) -> Path:
+    return directory / f"{first_seq:020d}{SEGMENT_SUFFIX}"
+
+
+def _read_varint(buf, pos: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _scan_records(buf) -> Iterator[Tuple[int, int]]:
+    """
+    (start, end) of every complete length-delimited record in buf.
+    Stops at a torn tail left by a crash mid-write.
+    """
+    pos, size = 0, len(buf)
+    while pos < size:
+        try:
+            length, start = _read_varint(buf, pos)
+        except IndexError:
+            return
+        end = start + length
+        if end > size:
+            return
+        yield start, end
+        pos = end
+
+
+def _decode_records(buf, name: str) -> Iterator[Tuple[int, BusEvent]]:
+    """
+    (end, event) of every record in buf, up to the first one that does not
+    decode: power loss can leave a zero-filled or garbage tail that still
+    scans as records.
+    """
+    for start, end in _scan_records(buf):
+        try:
+            event = decode(buf[start:end])
+        except (DecodeError, ValueError) as e:
+            logger.warning("Event log %s: undecodable record at byte %d: %s", name, start, e)
+            return
+        yield end, event
+
+
+class SegmentedEventLog(EventLog):
+    """
+    Append-only log of length-delimited BusEvent protos, split in segment
+    files named after their first seq. A writer thread group-commits
+    appends; replay reads segments through mmap.
+    """
+
+    def __init__(self, directory: Path, config: EventLogConfig = EventLogConfig()):
+        self.directory = Path(directory)
+        self.config = config
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._has_pending = threading.Condition(self._lock)
+        self._pending: Deque[bytes] = deque()
+        self._pending_bytes = 0
+        self._closed = False
+
+        self.appended = 0
+        self.dropped = 0
+        self.commits = 0
+
+        self._segments: List[_Segment] = self._load_segments()
+        self._last_seq = self._recover_tail()
+        self._file = None
+        self._file_opened_at = 0.0
+
+        self._writer = threading.Thread(target=self._write_loop, daemon=True, name="EventLogWriter")
+        self._writer.start()
+
+    # ---- EventLog ----
+    def append(self, event: BusEvent) -> None:
+        wire = event.wire if event.wire is not None else encode(event)
+        record = encode_varint(len(wire)) + wire
+
+        with self._lock:
+            if self._closed:
+                return
+            if self._pending_bytes + len(record) > self.config.max_pending_bytes:
+                self.dropped += 1
+                return
+
+            self._pending.append(record)
+            self._pending_bytes += len(record)
+            self._last_seq = max(self._last_seq, event.seq)
+            self._has_pending.notify()
+
+    def replay(self, after_seq: int = 0, since_ns: Optional[int] = None) -> Iterator[BusEvent]:
+        with self._lock:
+            segments = list(self._segments)
+
+        # Skip whole segments that end before the requested point
+        since_ts = since_ns / 1e9 if since_ns is not None else None
+        for i, segment in enumerate(segments):
+            next_first = segments[i + 1].first_seq if i + 1 < len(segments) else None
+            if next_first is not None and next_first <= after_seq + 1:
+                continue
+            if since_ts is not None and next_first is not None and segment.modified_at < since_ts:
+                continue
+
+            for event in self._read_segment(segment.path):
+                if event.seq <= after_seq:
+                    continue
+                if since_ns is not None and event.timestamp_ns < since_ns:
+                    continue
+                yield event
+
+    def last_seq(self) -> int:
+        with self._lock:
+            return self._last_seq
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._has_pending.notify()
+        self._writer.join()
+
+    # ---- writer ----
+    def _write_loop(self) -> None:
+        while True:
+            with self._lock:
+                while not self._pending and not self._closed:
+                    self._has_pending.wait()
+                closing = self._closed
+
+            # Let more appends pile up, they share one write and one fsync
+            if not closing:
+                time.sleep(self.config.commit_interval)
+
+            with self._lock:
+                records, self._pending = self._pending, deque()
+                self._pending_bytes = 0
+
+            if records:
+                try:
+                    self._commit(records)
+                except Exception as e:
+                    # Keep the writer alive, the next commit retries with a fresh segment
+                    logger.error("Event log write failed, %d events lost: %s", len(records), e)
+
+            if closing:
+                if self._file:
+                    self._file.close()
+                return
+
+    def _commit(self, records: Deque[bytes]) -> None:
+        if self._should_rotate():
+            self._rotate(first_seq=self._first_seq_of(records[0]))
+
+        self._file.write(b"".join(records))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+        self.appended += len(records)
+        self.commits += 1
+
+    def _should_rotate(self) -> bool:
+        return (
+                self._file is None
+                or self._file.tell() >= self.config.segment_bytes
+                or time.monotonic() - self._file_opened_at >= self.config.segment_age
+        )
+
+    def _rotate(self, first_seq: int) -> None:
+        if self._file:
+            self._file.close()
+            # Not left pointing at a closed file if the open below fails
+            self._file = None
+
+        path = _segment_path(self.directory, first_seq)
+        self._file = open(path, "ab")
+        self._file_opened_at = time.monotonic()
+
+        with self._lock:
+            if not self._segments or self._segments[-1].path != path:
+                self._segments.append(_Segment(path, first_seq))
+
+        self._apply_retention()
+
+    def _apply_retention(self) -> None:
+        now = time.time()
+        with self._lock:
+            segments = list(self._segments)
+
+        total = sum(s.size for s in segments)
+        expired = []
+        # Never delete the segment being written
+        for segment in segments[:-1]:
+            if total <= self.config.retention_bytes and now - segment.modified_at <= self.config.retention_age:
+                break
+            total -= segment.size
+            expired.append(segment)
+
+        for segment in expired:
+            segment.path.unlink(missing_ok=True)
+            logger.info("Event log segment %s deleted by retention", segment.path.name)
+
+        if expired:
+            with self._lock:
+                self._segments = [s for s in self._segments if s not in expired]
+
+    @staticmethod
+    def _first_seq_of(record: bytes) -> int:
+        _, start = _read_varint(record, 0)
+        return decode(record[start:]).seq
+
+    # ---- reading ----
+    def _load_segments(self) -> List[_Segment]:
+        segments = []
+        for path in sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}")):
+            try:
+                segments.append(_Segment(path, int(path.stem)))
+            except ValueError:
+                logger.warning("Ignoring unexpected file in event log: %s", path.name)
+        return segments
+
+    def _recover_tail(self) -> int:
+        """
+        Drop a torn or corrupt tail from the newest segment, return its last seq.
+        """
+        while self._segments:
+            path = self._segments[-1].path
+            last_seq, good_size = 0, 0
+            with open(path, "rb") as f:
+                data = f.read()
+            for end, event in _decode_records(data, path.name):
+                last_seq, good_size = event.seq, end
+
+            if good_size < len(data):
+                logger.warning("Event log %s: truncating %d torn bytes", path.name, len(data) - good_size)
+                os.truncate(path, good_size)
+
+            if last_seq:
+                return last_seq
+
+            # Empty segment, nothing to resume from
+            path.unlink(missing_ok=True)
+            self._segments.pop()
+        return 0
+
+    @staticmethod
+    def _read_segment(path: Path) -> Iterator[BusEvent]:
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            # Deleted by retention meanwhile
+            return
+
+        with f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for _, event in _decode_records(mm, path.name):
+                    yield event
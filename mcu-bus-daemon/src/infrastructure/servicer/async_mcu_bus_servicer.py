@@ -0,0 +1,279 @@
+import asyncio
+import logging
+import time
+
+from typing import AsyncIterator, Callable, Optional
+
+import grpc
+from grpc.aio import ServicerContext
+
+from application.module_registry import ModuleRegistry
+from domain.event_queue import AsyncEventQueue
+from domain.flow_credits import AsyncCreditGate
+from domain.mcu_bus import Subscriber
+from domain.predicate import compile_predicate
+from generated.mcubus.v1.mcu_bus_pb2_grpc import MCUBusServiceServicer
+from infrastructure.bus.async_can_bus_handler import AsyncCanBusHandler
+from infrastructure.servicer.bus_enevt_adapter import encode, encode_batch, encode_heartbeat, encode_latest
+from infrastructure.servicer.mcu_bus_servicer import (
+    DEFAULT_HEARTBEAT_INTERVAL,
+    HEARTBEAT_BATCH,
+    NO_MODULE_REGISTRY,
+    batch_limits,
+    chunked,
+    register_module,
+    renew_module,
+    replay_backlog,
+    unregister_module,
+)
+
+logger = logging.getLogger(__name__)
+
+# Replayed events read per executor hop on the single-event stream
+REPLAY_CHUNK = 256
+
+
+async def read_credits(requests: AsyncIterator, credits: AsyncCreditGate) -> None:
+    """
+    Apply the client's credit grants until it half-closes or goes away.
+    """
+    try:
+        async for message in requests:
+            credits.grant(message.credits)
+    finally:
+        credits.close()
+
+
+class AsyncMCUBusServer(MCUBusServiceServicer):
+    """
+    grpc.aio servicer, every stream is a coroutine instead of a worker thread.
+    Register with add_mcu_bus_servicer_to_server, like MCUBusServer.
+    """
+
+    def __init__(
+            self,
+            bus_handler: AsyncCanBusHandler,
+            queue_factory: Callable[[], AsyncEventQueue] = AsyncEventQueue,
+            module_registry: Optional[ModuleRegistry] = None,
+            heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL,
+    ):
+        if heartbeat_interval <= 0:
+            raise ValueError("heartbeat_interval must be positive")
+        self._bus_handler = bus_handler
+        self._queue_factory = queue_factory
+        self._module_registry = module_registry
+        self._heartbeat_interval = heartbeat_interval
+
+    async def Register(self, request, ctx: ServicerContext):
+        """
+        Lease a module ID, see MCUBusServer.Register. Registry calls run off
+        the loop, a worker process' registry is another process' gRPC call.
+        :param request: proto request
+        :param ctx: gRPC context
+        """
+        return await asyncio.to_thread(register_module, await self._modules(ctx), request)
+
+    async def UnRegister(self, request, ctx: ServicerContext):
+        """
+        Release a module ID.
+        :param request: proto request
+        :param ctx: gRPC context
+        """
+        return await asyncio.to_thread(unregister_module, await self._modules(ctx), request)
+
+    async def Heartbeat(self, request, ctx: ServicerContext):
+        """
+        Renew a module lease.
+        :param request: proto request
+        :param ctx: gRPC context
+        """
+        return await asyncio.to_thread(renew_module, await self._modules(ctx), request)
+
+    async def SubscribeEvents(self, request, ctx: ServicerContext):
+        """
+        Stream serialized BusEvents until the client goes away.
+        :param request: proto request
+        :param ctx: gRPC context
+        """
+        subscriber = await self._add_subscriber(request, ctx)
+        backlog = chunked(replay_backlog(self._bus_handler, request, subscriber), REPLAY_CHUNK)
+        last_seq = 0
+
+        # Keep taking events from handler
+        try:
+            # Catch up first (log reads off the loop), then skip live events already replayed
+            while chunk := await asyncio.to_thread(next, backlog, None):
+                last_seq = chunk[-1].seq
+                for event in chunk:
+                    yield event.wire if event.wire is not None else encode(event)
+
+            # Timed waits: a quiet stream sends heartbeats so half-open connections surface
+            while True:
+                event = await self._bus_handler.take_event(subscriber.id, self._heartbeat_interval)
+                if event is None:
+                    yield self._heartbeat()
+                    continue
+                if event.seq <= last_seq:
+                    continue
+                yield event.wire if event.wire is not None else encode(event)
+
+        # Unexpect errors
+        except Exception as e:
+            logger.error("Subscriber %s unexpected error: %s", subscriber.id, e)
+
+        # Remove events subscriber
+        finally:
+            self._disconnect_subscriber(subscriber)
+
+    async def SubscribeEventBatches(self, request, ctx: ServicerContext):
+        """
+        Stream serialized BusEventBatches, see MCUBusServer.SubscribeEventBatches.
+        :param request: proto request
+        :param ctx: gRPC context
+        """
+        subscriber = await self._add_subscriber(request, ctx)
+        max_size, linger = batch_limits(request)
+        backlog = chunked(replay_backlog(self._bus_handler, request, subscriber), max_size)
+        last_seq = 0
+        loop = asyncio.get_running_loop()
+
+        # Keep taking batches from handler
+        try:
+            # Catch up in full batches (log reads off the loop), then skip live events already replayed
+            while chunk := await asyncio.to_thread(next, backlog, None):
+                last_seq = chunk[-1].seq
+                yield encode_batch(chunk)
+
+            while True:
+                events = await self._bus_handler.take_events(subscriber.id, max_size, self._heartbeat_interval)
+                if not events:
+                    yield HEARTBEAT_BATCH
+                    continue
+
+                deadline = loop.time() + linger
+                while len(events) < max_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    more = await self._bus_handler.take_events(subscriber.id, max_size - len(events), remaining)
+                    if not more:
+                        break
+                    events.extend(more)
+
+                if last_seq:
+                    events = [event for event in events if event.seq > last_seq]
+                    if not events:
+                        continue
+                yield encode_batch(events)
+
+        # Unexpect errors
+        except Exception as e:
+            logger.error("Subscriber %s unexpected error: %s", subscriber.id, e)
+
+        # Remove events subscriber
+        finally:
+            self._disconnect_subscriber(subscriber)
+
+    async def SubscribeEventsFlow(self, request_iterator, ctx: ServicerContext):
+        """
+        Stream serialized BusEvents, one per credit granted, see MCUBusServer.SubscribeEventsFlow.
+        :param request_iterator: FlowRequest stream
+        :param ctx: gRPC context
+        """
+        first = await anext(request_iterator, None)
+        if first is None or not first.HasField("subscribe"):
+            await ctx.abort(grpc.StatusCode.INVALID_ARGUMENT, "First FlowRequest must carry subscribe")
+
+        request = first.subscribe
+        credits = AsyncCreditGate(first.credits)
+        subscriber = await self._add_subscriber(request, ctx)
+        reader = asyncio.create_task(read_credits(request_iterator, credits))
+        backlog = chunked(replay_backlog(self._bus_handler, request, subscriber), REPLAY_CHUNK)
+        last_seq = 0
+
+        # Keep taking events from handler, one per credit
+        try:
+            while chunk := await asyncio.to_thread(next, backlog, None):
+                last_seq = chunk[-1].seq
+                for event in chunk:
+                    if not await credits.acquire():
+                        return
+                    yield event.wire if event.wire is not None else encode(event)
+
+            # Heartbeats cost no credit, the one acquired waits for the next event
+            while await credits.acquire():
+                event = await self._bus_handler.take_event(subscriber.id, self._heartbeat_interval)
+                while event is None or event.seq <= last_seq:
+                    if event is None:
+                        yield self._heartbeat()
+                    event = await self._bus_handler.take_event(subscriber.id, self._heartbeat_interval)
+                yield event.wire if event.wire is not None else encode(event)
+
+        # Unexpect errors
+        except Exception as e:
+            logger.error("Subscriber %s unexpected error: %s", subscriber.id, e)
+
+        # Remove events subscriber
+        finally:
+            self._disconnect_subscriber(subscriber)
+            reader.cancel()
+            # Retrieve its outcome, a request stream broken by a client reset included
+            (outcome,) = await asyncio.gather(reader, return_exceptions=True)
+            if isinstance(outcome, Exception):
+                logger.debug("Subscriber %s credit stream ended: %r", subscriber.id, outcome)
+
+    async def GetLatest(self, request, ctx: ServicerContext) -> bytes:
+        """
+        Serialized LatestValues of the requested modules, see MCUBusServer.GetLatest.
+        :param request: proto request
+        :param ctx: gRPC context
+        """
+        return encode_latest(*self._bus_handler.latest(request.module_ids))
+
+    async def GetSnapshot(self, request, ctx: ServicerContext) -> bytes:
+        """
+        Serialized LatestValues of every module.
+        :param request: proto request
+        :param ctx: gRPC context
+        """
+        return encode_latest(*self._bus_handler.latest())
+
+    def _heartbeat(self) -> bytes:
+        return encode_heartbeat(self._bus_handler.last_seq, time.time_ns())
+
+    async def _modules(self, ctx: ServicerContext) -> ModuleRegistry:
+        if self._module_registry is None:
+            await ctx.abort(grpc.StatusCode.UNIMPLEMENTED, NO_MODULE_REGISTRY)
+        return self._module_registry
+
+    async def _add_subscriber(self, request, ctx: ServicerContext) -> Subscriber:
+        """
+        Register a subscriber for this stream, filters are routed server side.
+        :param request: SubscribeRequest
+        :param ctx: gRPC context
+        """
+        try:
+            subscriber = Subscriber(
+                queue=self._queue_factory(),
+                module_ids=set(request.module_ids),
+                event_types=set(request.event_types),
+                predicate=compile_predicate(request.predicate) if request.predicate else None,
+            )
+            self._bus_handler.handle_subscriber(subscriber)
+        except ValueError as e:
+            await ctx.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        return subscriber
+
+    def _disconnect_subscriber(self, subscriber: Subscriber) -> None:
+        """
+        Disconnects the subscriber from the bus handler.
+        :param subscriber: event subscriber
+        """
+        if self._bus_handler.has_subscriber(subscriber.id):
+            self._bus_handler.remove_subscriber(subscriber.id)
+            logger.info(
+                "Subscriber %s disconnected, remaining: %d, queue stats: %s",
+                subscriber.id,
+                len(self._bus_handler.subscribers),
+                subscriber.queue.stats().as_dict(),
+            )
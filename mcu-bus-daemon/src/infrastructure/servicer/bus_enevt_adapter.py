@@ -1,54 +1,173 @@
-from datetime import timezone
-from domain.mcu_bus import BusEvent, SensorDataEvent, ControlStatusEvent, AlertEvent
-from google.protobuf.timestamp_pb2 import Timestamp
+from typing import Callable, Dict, Iterable, Optional
+
+from domain.mcu_bus import BusEvent, BusPayload, SensorDataEvent, ControlStatusEvent, AlertEvent
 from generated.mcubus.v1 import events_pb2
 
+NANOS_PER_SECOND = 1_000_000_000
+
+
+def _fill_sensor_data(proto: events_pb2.BusEvent, payload: SensorDataEvent) -> None:
+    data = proto.sensor_data
+    data.temperature = payload.temperature
+    data.humidity = payload.humidity
+    data.soil_moisture = payload.soil_moisture
+    data.light_level = payload.light_level
+    data.water_level = payload.water_level
+    data.ph_value = payload.ph_value
+
+
+def _fill_control_status(proto: events_pb2.BusEvent, payload: ControlStatusEvent) -> None:
+    status = proto.control_status
+    status.device = payload.device
+    status.is_active = payload.is_active
+    status.power_level = payload.power_level
+    status.reason = payload.reason
+
+
+def _fill_alert(proto: events_pb2.BusEvent, payload: AlertEvent) -> None:
+    alert = proto.alert
+    alert.severity = payload.severity
+    alert.code = payload.code
+    alert.message = payload.message
+
+
+_PAYLOAD_FILLERS: Dict[type, Callable[[events_pb2.BusEvent, BusPayload], None]] = {
+    SensorDataEvent: _fill_sensor_data,
+    ControlStatusEvent: _fill_control_status,
+    AlertEvent: _fill_alert,
+}
+
 
 def to_proto(event: BusEvent) -> events_pb2.BusEvent:
+    """
+    Fields are set in place on the parent message: no Timestamp, sub-message
+    or datetime objects are built and nothing is copied.
+    """
+    fill = _PAYLOAD_FILLERS.get(type(event.payload))
+    if fill is None:
+        raise ValueError(f"Unsupported payload type: {type(event.payload)}")
+
     proto = events_pb2.BusEvent(
         event_id=event.event_id,
         module_id=event.module_id,
+        seq=event.seq,
     )
 
     # timestamp
-    ts = Timestamp()
-    ts.FromDatetime(event.timestamp.replace(tzinfo=timezone.utc))
-    proto.timestamp.CopyFrom(ts)
+    timestamp = proto.timestamp
+    timestamp.seconds, timestamp.nanos = divmod(event.timestamp_ns, NANOS_PER_SECOND)
 
     # payload
-    match event.payload:
-        case SensorDataEvent():
-            proto.sensor_data.CopyFrom(
-                events_pb2.SensorData(
-                    temperature=event.payload.temperature,
-                    humidity=event.payload.humidity,
-                    soil_moisture=event.payload.soil_moisture,
-                    light_level=event.payload.light_level,
-                    water_level=event.payload.water_level,
-                    ph_value=event.payload.ph_value,
-                )
+    fill(proto, event.payload)
+    return proto
+
+
+def from_proto(proto: events_pb2.BusEvent, wire: Optional[bytes] = None) -> BusEvent:
+    """
+    Domain event from its proto, e.g. when reading the event log back.
+    :param proto: BusEvent proto
+    :param wire: the serialized form the proto came from, kept as BusEvent.wire
+    """
+    match proto.WhichOneof("payload"):
+        case "sensor_data":
+            data = proto.sensor_data
+            payload = SensorDataEvent(
+                temperature=data.temperature,
+                humidity=data.humidity,
+                soil_moisture=data.soil_moisture,
+                light_level=data.light_level,
+                water_level=data.water_level,
+                ph_value=data.ph_value,
             )
 
-        case ControlStatusEvent():
-            proto.control_status.CopyFrom(
-                events_pb2.ControlStatus(
-                    device=event.payload.device,
-                    is_active=event.payload.is_active,
-                    power_level=event.payload.power_level,
-                    reason=event.payload.reason,
-                )
+        case "control_status":
+            status = proto.control_status
+            payload = ControlStatusEvent(
+                device=status.device,
+                is_active=status.is_active,
+                power_level=status.power_level,
+                reason=status.reason,
             )
 
-        case AlertEvent():
-            proto.alert.CopyFrom(
-                events_pb2.AlertEvent(
-                    severity=event.payload.severity,
-                    code=event.payload.code,
-                    message=event.payload.message,
-                )
+        case "alert":
+            alert = proto.alert
+            payload = AlertEvent(
+                severity=alert.severity,
+                code=alert.code,
+                message=alert.message,
             )
 
-        case _:
-            raise ValueError(f"Unsupported payload type: {type(event.payload)}")
+        case other:
+            raise ValueError(f"Unsupported payload type: {other}")
 
-    return proto
+    return BusEvent(
+        event_id=proto.event_id,
+        module_id=proto.module_id,
+        timestamp_ns=proto.timestamp.seconds * NANOS_PER_SECOND + proto.timestamp.nanos,
+        payload=payload,
+        seq=proto.seq,
+        wire=wire,
+    )
+
+
+def decode(wire: bytes) -> BusEvent:
+    """
+    Domain event from serialized BusEvent bytes.
+    """
+    return from_proto(events_pb2.BusEvent.FromString(wire), wire)
+
+
+def encode(event: BusEvent) -> bytes:
+    """
+    Serialized BusEvent proto, used as the BusHandler encoder.
+    """
+    return to_proto(event).SerializeToString()
+
+
+def encode_heartbeat(last_seq: int, timestamp_ns: int) -> bytes:
+    """
+    Serialized BusEvent without payload, sent on idle streams.
+    :param last_seq: newest seq on the bus, lets the client see it is not behind
+    """
+    proto = events_pb2.BusEvent(seq=last_seq)
+    timestamp = proto.timestamp
+    timestamp.seconds, timestamp.nanos = divmod(timestamp_ns, NANOS_PER_SECOND)
+    return proto.SerializeToString()
+
+
+def encode_varint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+# BusEventBatch.events: field 1, wire type 2 (length delimited)
+_BATCH_EVENT_TAG = b"\x0a"
+
+
+def encode_batch(events: Iterable[BusEvent]) -> bytes:
+    """
+    Serialized BusEventBatch built from the already serialized events,
+    so batching does not re-encode anything.
+    """
+    parts = []
+    for event in events:
+        wire = event.wire if event.wire is not None else encode(event)
+        parts.append(_BATCH_EVENT_TAG)
+        parts.append(encode_varint(len(wire)))
+        parts.append(wire)
+    return b"".join(parts)
+
+
+# LatestValues.last_seq: field 2, wire type 0 (varint)
+_LATEST_SEQ_TAG = b"\x10"
+
+
+def encode_latest(events: Iterable[BusEvent], last_seq: int) -> bytes:
+    """
+    Serialized LatestValues. Its events field has the BusEventBatch layout.
+    """
+    return encode_batch(events) + _LATEST_SEQ_TAG + encode_varint(last_seq)
@@ -1,40 +1,332 @@
 import logging
-import queue
+import threading
+import time
+
+from itertools import islice
+from typing import Callable, Iterator, List, Optional, Tuple
 
 import grpc
 from grpc import ServicerContext
 
 from application.bus_handler import BusHandler
-from domain.mcu_bus import Subscriber
+from application.module_registry import ModuleRegistry
+from domain.event_queue import EventQueue
+from domain.flow_credits import CreditGate
+from domain.mcu_bus import Subscriber, BusEvent
+from domain.predicate import compile_predicate
+from generated.mcubus.v1 import mcu_bus_pb2_grpc, messages_pb2
 from generated.mcubus.v1.mcu_bus_pb2_grpc import MCUBusServiceServicer
-from infrastructure.servicer.bus_enevt_adapter import to_proto
+from infrastructure.servicer.bus_enevt_adapter import encode, encode_batch, encode_heartbeat, encode_latest
 
 logger = logging.getLogger(__name__)
 
+SERVICE_NAME = "mcubus.v1.MCUBusService"
+
+# Methods that return / yield already serialized bytes
+PRESERIALIZED_METHODS = {"SubscribeEvents", "SubscribeEventBatches", "SubscribeEventsFlow", "GetLatest", "GetSnapshot"}
+
+# Module leases live in one process, a server without a registry refuses them
+NO_MODULE_REGISTRY = "Module registration is not served here"
+
+DEFAULT_BATCH_SIZE = 64
+MAX_BATCH_SIZE = 1024
+MAX_LINGER_MS = 1000
+
+# Longest a stream waits for events before sending a heartbeat and checking the client is still there
+DEFAULT_HEARTBEAT_INTERVAL = 15.0
+
+# Serialized empty BusEventBatch
+HEARTBEAT_BATCH = b""
+
+
+def batch_limits(request) -> Tuple[int, float]:
+    """
+    Client batch knobs, clamped to sane bounds.
+    :return: (max events per batch, linger in seconds)
+    """
+    max_size = min(request.max_batch_size or DEFAULT_BATCH_SIZE, MAX_BATCH_SIZE)
+    linger = min(request.max_linger_ms, MAX_LINGER_MS) / 1000
+    return max_size, linger
+
+
+def replay_backlog(bus_handler: BusHandler, request, subscriber: Subscriber) -> Iterator[BusEvent]:
+    """
+    Past events a resuming subscriber asked for, empty if it did not ask.
+    Call after the subscriber is registered so the live queue overlaps.
+    """
+    resume = request.HasField("resume_after_seq")
+    since_ns = request.replay_since.ToNanoseconds() if request.HasField("replay_since") else None
+    if not resume and since_ns is None:
+        return iter(())
+
+    after_seq = request.resume_after_seq
+    ring = bus_handler.replay_ring
+    if resume and bus_handler.event_log is None and ring is not None and after_seq + 1 < ring.first_seq:
+        logger.warning(
+            "Subscriber %s resumes after seq %d but replay starts at %d, events were lost",
+            subscriber.id,
+            after_seq,
+            ring.first_seq,
+        )
+
+    return bus_handler.replay(subscriber.id, after_seq, since_ns)
+
+
+def read_credits(requests: Iterator, credits: CreditGate) -> None:
+    """
+    Apply the client's credit grants until it half-closes or goes away.
+    """
+    try:
+        for message in requests:
+            credits.grant(message.credits)
+    except grpc.RpcError:
+        # Cancelled, the stream notices on its own
+        pass
+    finally:
+        credits.close()
+
+
+def register_module(registry: ModuleRegistry, request) -> messages_pb2.RegisterReply:
+    lease = registry.register(request.module_id, request.module_type, request.metadata, request.lease_ms / 1000)
+    return messages_pb2.RegisterReply(
+        success=True,
+        assigned_id=lease.module_id,
+        message=f"Registered, renew within {lease.duration:g}s",
+        lease_ms=int(lease.duration * 1000),
+    )
+
+
+def unregister_module(registry: ModuleRegistry, request) -> messages_pb2.UnSubscribeReplay:
+    if registry.unregister(request.module_id):
+        return messages_pb2.UnSubscribeReplay(success=True, message="Unregistered")
+    return messages_pb2.UnSubscribeReplay(success=False, message="Module not registered")
+
+
+def renew_module(registry: ModuleRegistry, request) -> messages_pb2.HeartbeatReply:
+    lease = registry.heartbeat(request.module_id)
+    if lease is None:
+        return messages_pb2.HeartbeatReply(success=False, message="Module not registered or lease expired, register again")
+    return messages_pb2.HeartbeatReply(success=True, message="Renewed", lease_ms=int(lease.duration * 1000))
+
+
+def chunked(events: Iterator[BusEvent], size: int) -> Iterator[List[BusEvent]]:
+    while chunk := list(islice(events, size)):
+        yield chunk
+
+
+class _HandlerCapture:
+    """
+    Stands in for a server to collect the generated method handlers.
+    """
+
+    def __init__(self):
+        self.handlers = {}
+
+    def add_generic_rpc_handlers(self, generic_handlers) -> None:
+        ...
+
+    def add_registered_method_handlers(self, service_name, method_handlers) -> None:
+        self.handlers = dict(method_handlers)
+
+
+def add_mcu_bus_servicer_to_server(servicer: MCUBusServiceServicer, server) -> None:
+    """
+    Same as the generated add_MCUBusServiceServicer_to_server, except that the
+    event methods skip the response serializer and send the bytes they return.
+    """
+    capture = _HandlerCapture()
+    mcu_bus_pb2_grpc.add_MCUBusServiceServicer_to_server(servicer, capture)
+
+    handlers = {
+        name: handler._replace(response_serializer=None) if name in PRESERIALIZED_METHODS else handler
+        for name, handler in capture.handlers.items()
+    }
+
+    server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler(SERVICE_NAME, handlers),))
+    server.add_registered_method_handlers(SERVICE_NAME, handlers)
+
 
 class MCUBusServer(MCUBusServiceServicer):
-    def __init__(self, bus_handler: BusHandler):
+    def __init__(
+            self,
+            bus_handler: BusHandler,
+            queue_factory: Callable[[], EventQueue] = EventQueue,
+            module_registry: Optional[ModuleRegistry] = None,
+            heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL,
+    ):
+        """
+        :param heartbeat_interval: seconds an idle stream waits before sending a heartbeat
+        """
+        if heartbeat_interval <= 0:
+            raise ValueError("heartbeat_interval must be positive")
         self._bus_handler = bus_handler
+        self._queue_factory = queue_factory
+        self._module_registry = module_registry
+        self._heartbeat_interval = heartbeat_interval
+
+    def Register(self, request, ctx: ServicerContext):
+        """
+        Lease a module ID, assigned by the daemon if the request has none.
+        :param request: proto request
+        :param ctx: gRPC context
+        """
+        return register_module(self._modules(ctx), request)
+
+    def UnRegister(self, request, ctx: ServicerContext):
+        """
+        Release a module ID, its events are not routed any more.
+        :param request: proto request
+        :param ctx: gRPC context
+        """
+        return unregister_module(self._modules(ctx), request)
+
+    def Heartbeat(self, request, ctx: ServicerContext):
+        """
+        Renew a module lease, success is False once it expired.
+        :param request: proto request
+        :param ctx: gRPC context
+        """
+        return renew_module(self._modules(ctx), request)
 
     def SubscribeEvents(self, request, ctx: ServicerContext):
         """
         Override this method to receive events from subscribers.
+        Yields serialized BusEvent bytes, see add_mcu_bus_servicer_to_server.
         :param request: proto request
         :param ctx: gRPC context
         """
+        subscriber = self._add_subscriber(request, ctx)
+        backlog = replay_backlog(self._bus_handler, request, subscriber)
+        last_seq = 0
 
-        # Add subscriber to handler
-        subscriber = Subscriber()
-        self._bus_handler.handle_subscriber(subscriber)
+        # Keep taking events from handler
+        try:
+            # Catch up first, then skip live events already replayed
+            for event in backlog:
+                last_seq = event.seq
+                yield event.wire if event.wire is not None else encode(event)
 
-        # Add callback method
-        ctx.add_callback(lambda: self._disconnect_subscriber(subscriber))
+            # Timed waits: a quiet stream sends heartbeats, which fail once the client is gone
+            while ctx.is_active():
+                event = self._bus_handler.take_event(subscriber.id, self._heartbeat_interval)
+                if event is None:
+                    yield self._heartbeat()
+                    continue
+                if event.seq <= last_seq:
+                    continue
+                yield event.wire if event.wire is not None else encode(event)
 
-        # Keep taking events from handler
+        # gRPC errors
+        except grpc.RpcError as e:
+            logger.warning("Subscriber %s RPC error: %s", subscriber.id, e.code())
+
+        # Unexpect errors
+        except Exception as e:
+            logger.error("Subscriber %s unexpected error: %s", subscriber.id, e)
+
+        # Remove events subscriber
+        finally:
+            self._disconnect_subscriber(subscriber)
+
+    def SubscribeEventBatches(self, request, ctx: ServicerContext):
+        """
+        Like SubscribeEvents, but sends serialized BusEventBatch bytes.
+        A batch goes out when it holds max_batch_size events or when
+        max_linger_ms passed since its first event.
+        :param request: proto request
+        :param ctx: gRPC context
+        """
+        subscriber = self._add_subscriber(request, ctx)
+        max_size, linger = batch_limits(request)
+        backlog = replay_backlog(self._bus_handler, request, subscriber)
+        last_seq = 0
+
+        # Keep taking batches from handler
         try:
+            # Catch up in full batches, then skip live events already replayed
+            for chunk in chunked(backlog, max_size):
+                last_seq = chunk[-1].seq
+                yield encode_batch(chunk)
+
             while ctx.is_active():
-                event = self._bus_handler.take_event(subscriber.id)
-                yield to_proto(event)
+                events = self._bus_handler.take_events(subscriber.id, max_size, self._heartbeat_interval)
+                if not events:
+                    yield HEARTBEAT_BATCH
+                    continue
+
+                deadline = time.monotonic() + linger
+                while len(events) < max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    more = self._bus_handler.take_events(subscriber.id, max_size - len(events), remaining)
+                    if not more:
+                        break
+                    events.extend(more)
+
+                if last_seq:
+                    events = [event for event in events if event.seq > last_seq]
+                    if not events:
+                        continue
+                yield encode_batch(events)
+
+        # gRPC errors
+        except grpc.RpcError as e:
+            logger.warning("Subscriber %s RPC error: %s", subscriber.id, e.code())
+
+        # Unexpect errors
+        except Exception as e:
+            logger.error("Subscriber %s unexpected error: %s", subscriber.id, e)
+
+        # Remove events subscriber
+        finally:
+            self._disconnect_subscriber(subscriber)
+
+    def SubscribeEventsFlow(self, request_iterator, ctx: ServicerContext):
+        """
+        SubscribeEvents with credit based flow control. The first FlowRequest
+        carries the subscription, any FlowRequest may grant credits. One event
+        is sent per credit; without credits events wait in the subscriber
+        queue, where its overflow policy applies.
+        :param request_iterator: FlowRequest stream
+        :param ctx: gRPC context
+        """
+        first = next(request_iterator, None)
+        if first is None or not first.HasField("subscribe"):
+            ctx.abort(grpc.StatusCode.INVALID_ARGUMENT, "First FlowRequest must carry subscribe")
+
+        request = first.subscribe
+        credits = CreditGate(first.credits)
+        subscriber = self._add_subscriber(request, ctx)
+        ctx.add_callback(credits.close)
+        threading.Thread(
+            target=read_credits,
+            args=(request_iterator, credits),
+            daemon=True,
+            name=f"FlowCredits-{subscriber.id[:8]}",
+        ).start()
+
+        backlog = replay_backlog(self._bus_handler, request, subscriber)
+        last_seq = 0
+
+        # Keep taking events from handler, one per credit
+        try:
+            for event in backlog:
+                if not credits.acquire():
+                    return
+                last_seq = event.seq
+                yield event.wire if event.wire is not None else encode(event)
+
+            # Heartbeats cost no credit, the one acquired waits for the next event
+            while ctx.is_active() and credits.acquire():
+                event = self._bus_handler.take_event(subscriber.id, self._heartbeat_interval)
+                while event is None or event.seq <= last_seq:
+                    if event is None:
+                        yield self._heartbeat()
+                        if not ctx.is_active():
+                            return
+                    event = self._bus_handler.take_event(subscriber.id, self._heartbeat_interval)
+                yield event.wire if event.wire is not None else encode(event)
 
         # gRPC errors
         except grpc.RpcError as e:
@@ -46,8 +338,55 @@ class MCUBusServer(MCUBusServiceServicer):
 
         # Remove events subscriber
         finally:
+            credits.close()
             self._disconnect_subscriber(subscriber)
 
+    def GetLatest(self, request, ctx: ServicerContext) -> bytes:
+        """
+        Current value per payload kind of the requested modules.
+        Returns serialized LatestValues bytes built from the stored events.
+        :param request: proto request
+        :param ctx: gRPC context
+        """
+        return encode_latest(*self._bus_handler.latest(request.module_ids))
+
+    def GetSnapshot(self, request, ctx: ServicerContext) -> bytes:
+        """
+        Current values of every module, see GetLatest.
+        :param request: proto request
+        :param ctx: gRPC context
+        """
+        return encode_latest(*self._bus_handler.latest())
+
+    def _heartbeat(self) -> bytes:
+        return encode_heartbeat(self._bus_handler.last_seq, time.time_ns())
+
+    def _modules(self, ctx: ServicerContext) -> ModuleRegistry:
+        if self._module_registry is None:
+            ctx.abort(grpc.StatusCode.UNIMPLEMENTED, NO_MODULE_REGISTRY)
+        return self._module_registry
+
+    def _add_subscriber(self, request, ctx: ServicerContext) -> Subscriber:
+        """
+        Register a subscriber for this stream, filters are routed server side.
+        :param request: SubscribeRequest
+        :param ctx: gRPC context
+        """
+        try:
+            subscriber = Subscriber(
+                queue=self._queue_factory(),
+                module_ids=set(request.module_ids),
+                event_types=set(request.event_types),
+                predicate=compile_predicate(request.predicate) if request.predicate else None,
+            )
+            self._bus_handler.handle_subscriber(subscriber)
+        except ValueError as e:
+            ctx.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+        # Add callback method
+        ctx.add_callback(lambda: self._disconnect_subscriber(subscriber))
+        return subscriber
+
     def _disconnect_subscriber(self, subscriber: Subscriber) -> None:
         """
         Disconnects the subscriber from the bus handler.
@@ -56,7 +395,8 @@ class MCUBusServer(MCUBusServiceServicer):
         if self._bus_handler.has_subscriber(subscriber.id):
             self._bus_handler.remove_subscriber(subscriber.id)
             logger.info(
-                "Subscriber %s disconnected, remaining: %d",
+                "Subscriber %s disconnected, remaining: %d, queue stats: %s",
                 subscriber.id,
                 len(self._bus_handler.subscribers),
+                subscriber.queue.stats().as_dict(),
             )
@@ -0,0 +1,69 @@
+import time
+
+from typing import Mapping, Optional
+
+import grpc
+
+from application.module_registry import ModuleLease
+from generated.mcubus.v1 import mcu_bus_pb2_grpc, messages_pb2
+
+# Seconds a forwarded registry call may take, the registry is on the same host
+DEFAULT_TIMEOUT = 5.0
+
+
+class ModuleRegistryClient:
+    """
+    ModuleRegistry of another process, reached over gRPC. Worker processes
+    forward Register / UnRegister / Heartbeat to the ingest process, where
+    the one registry admits events and expires leases for the whole bus.
+    :raise grpc.RpcError: the registry process is unreachable
+    """
+
+    def __init__(self, target: str, timeout: float = DEFAULT_TIMEOUT):
+        """
+        :param target: gRPC address of the process holding the registry
+        """
+        self.target = target
+        self.timeout = timeout
+        self._channel = grpc.insecure_channel(target)
+        self._stub = mcu_bus_pb2_grpc.MCUBusServiceStub(self._channel)
+
+    def start(self) -> None:
+        ...
+
+    def stop(self) -> None:
+        self._channel.close()
+
+    def register(
+            self,
+            module_id: str = "",
+            module_type: str = "",
+            metadata: Optional[Mapping[str, str]] = None,
+            lease: float = 0.0,
+    ) -> ModuleLease:
+        reply = self._stub.Register(
+            messages_pb2.RegisterRequest(
+                module_id=module_id,
+                module_type=module_type,
+                metadata=dict(metadata or {}),
+                lease_ms=int(lease * 1000),
+            ),
+            timeout=self.timeout,
+        )
+        return self._lease(reply.assigned_id, module_type, metadata, reply.lease_ms)
+
+    def unregister(self, module_id: str) -> bool:
+        reply = self._stub.UnRegister(messages_pb2.UnSubscribeRequest(module_id=module_id), timeout=self.timeout)
+        return reply.success
+
+    def heartbeat(self, module_id: str) -> Optional[ModuleLease]:
+        reply = self._stub.Heartbeat(messages_pb2.HeartbeatRequest(module_id=module_id), timeout=self.timeout)
+        if not reply.success:
+            return None
+        return self._lease(module_id, "", None, reply.lease_ms)
+
+    @staticmethod
+    def _lease(module_id: str, module_type: str, metadata: Optional[Mapping[str, str]], lease_ms: int) -> ModuleLease:
+        # As granted by the registry, expiry is its business
+        duration = lease_ms / 1000
+        return ModuleLease(module_id, module_type, dict(metadata or {}), duration, time.monotonic() + duration)
@@ -1,32 +1,260 @@
+import asyncio
+import json
 import logging
+import multiprocessing
+import signal
+import threading
 
 import grpc
 
 from concurrent import futures
-from infrastructure.logger import setup_logging
+from functools import partial
+from pathlib import Path
+from typing import Optional
 
-from infrastructure.servicer.mcu_bus_servicer import MCUBusServer
-from generated.mcubus.v1 import mcu_bus_pb2_grpc
+from application.module_registry import ModuleRegistry
+from domain.deadband import DeadbandFilter
+from domain.event_queue import EventQueue, AsyncEventQueue, OverflowPolicy
+from domain.metrics import MetricsRegistry
+from domain.replay_ring import ReplayRing
+from infrastructure.bus.async_can_bus_handler import AsyncCanBusHandler
+from infrastructure.bus.can_bus_handler import CanBusHandler
+from infrastructure.bus.can_ingest import CanIngest, open_can_bus
+from infrastructure.bus.ring_bus import RingBusHandler, RingRelay
+from infrastructure.bus.shm_ring import SharedEventRing
+from infrastructure.logger import NonBlockingQueueHandler, setup_logging
+from infrastructure.metrics_server import DEFAULT_HOST as DEFAULT_METRICS_HOST, start_metrics_server
+from infrastructure.persistence.segmented_event_log import SegmentedEventLog, EventLogConfig
+
+from infrastructure.servicer.async_mcu_bus_servicer import AsyncMCUBusServer
+from infrastructure.servicer.bus_enevt_adapter import decode, encode
+from infrastructure.servicer.module_registry_client import ModuleRegistryClient
+from infrastructure.servicer.mcu_bus_servicer import (
+    DEFAULT_HEARTBEAT_INTERVAL,
+    MCUBusServer,
+    add_mcu_bus_servicer_to_server,
+)
+
+logger = logging.getLogger(__name__)
+
+SERVER_OPTIONS = [
+    ("grpc.max_send_message_length", 10 * 1024 * 1024),
+    ("grpc.max_receive_message_length", 10 * 1024 * 1024),
+]
+
+# Worker processes bind the same port, the kernel spreads connections over them
+WORKER_SERVER_OPTIONS = SERVER_OPTIONS + [("grpc.so_reuseport", 1)]
+
+MODES = ("thread", "aio")
+
+# Records per second per message of loggers that can fire once per frame or per subscriber
+LOG_RATE_LIMITS = {
+    "infrastructure.bus.can_ingest": 5.0,
+    "infrastructure.bus.ring_bus": 5.0,
+    "infrastructure.servicer.mcu_bus_servicer": 20.0,
+    "infrastructure.servicer.async_mcu_bus_servicer": 20.0,
+}
+
+
+def export_log_drops(log_handler: NonBlockingQueueHandler, metrics: MetricsRegistry) -> None:
+    dropped = metrics.counter("mcubus_log_dropped_total", "Log records dropped because the log writer fell behind")
+
+    def collect():
+        dropped.labels().value = log_handler.dropped
+
+    metrics.on_collect(collect)
 
 
 def main(
         port: int = 50051,
+        mode: str = "thread",
+        max_workers: int = 10,
+        queue_capacity: int = 1024,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        block_timeout: float = 0.05,
+        replay_events: int = 10_000,
+        replay_mb: float = 8.0,
+        wal_dir: Optional[str] = None,
+        wal_segment_mb: float = 16.0,
+        wal_retention_mb: float = 512.0,
+        wal_retention_hours: float = 168.0,
+        wal_commit_ms: float = 50.0,
+        can_interface: str = "socketcan",
+        can_channel: Optional[str] = None,
+        metrics_port: int = 9108,
+        metrics_host: str = DEFAULT_METRICS_HOST,
+        module_lease: float = 30.0,
+        deadband: bool = False,
+        deadband_config: Optional[str] = None,
+        max_silence: float = 60.0,
+        processes: int = 0,
+        ring_mb: float = 16.0,
+        heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL,
 ):
-    setup_logging(json_output=False)
-    logger = logging.getLogger(__name__)
+    log_handler = setup_logging(json_output=False, rate_limits=LOG_RATE_LIMITS)
+
+    # Prometheus text endpoint, 0 disables it
+    metrics = MetricsRegistry()
+    export_log_drops(log_handler, metrics)
+    if metrics_port:
+        start_metrics_server(metrics, metrics_port, metrics_host)
+        logger.info("[Starting] metrics on %s:%d/metrics", metrics_host, metrics_port)
+
+    # Durable event log, optional
+    event_log = None
+    if wal_dir:
+        event_log = SegmentedEventLog(
+            Path(wal_dir),
+            EventLogConfig(
+                segment_bytes=int(wal_segment_mb * 1024 * 1024),
+                retention_bytes=int(wal_retention_mb * 1024 * 1024),
+                retention_age=wal_retention_hours * 3600,
+                commit_interval=wal_commit_ms / 1000,
+            ),
+        )
+        logger.info("[Starting] event log in %s, last seq: %d", wal_dir, event_log.last_seq())
+
+    replay_options = dict(max_events=replay_events, max_bytes=int(replay_mb * 1024 * 1024))
+    handler_options = dict(
+        encoder=encode,
+        event_log=event_log,
+        metrics=metrics,
+    )
+
+    queue_options = dict(
+        capacity=queue_capacity,
+        policy=overflow_policy,
+        block_timeout=block_timeout,
+    )
+    logger.info(
+        "[Starting] mode=%s, processes=%d, queue capacity=%d, overflow=%s",
+        mode,
+        processes,
+        queue_capacity,
+        overflow_policy.value,
+    )
+
+    # CAN ingest, optional, with report by exception if asked for
+    can_options = None
+    if can_channel:
+        can_options = dict(interface=can_interface, channel=can_channel, deadband=None)
+        if deadband_config:
+            with open(deadband_config) as f:
+                can_options["deadband"] = DeadbandFilter.from_config(json.load(f), max_silence)
+        elif deadband:
+            can_options["deadband"] = DeadbandFilter(max_silence=max_silence)
+    registry_options = dict(default_lease=module_lease)
+    servicer_options = dict(heartbeat_interval=heartbeat_interval)
+
+    try:
+        if processes:
+            worker_options = dict(
+                port=port,
+                mode=mode,
+                max_workers=max_workers,
+                replay_options=replay_options,
+                queue_options=queue_options,
+                servicer_options=servicer_options,
+            )
+            serve_processes(
+                processes,
+                ring_mb,
+                handler_options,
+                worker_options,
+                can_options,
+                registry_options,
+                metrics_port,
+                metrics_host,
+            )
+        elif mode == "aio":
+            handler_options["replay_ring"] = ReplayRing(**replay_options)
+            asyncio.run(
+                serve_aio(port, handler_options, queue_options, can_options, registry_options, servicer_options)
+            )
+        else:
+            handler_options["replay_ring"] = ReplayRing(**replay_options)
+            serve_threaded(
+                port, max_workers, handler_options, queue_options, can_options, registry_options, servicer_options
+            )
+    finally:
+        # Flush whatever is still pending to disk
+        if event_log:
+            event_log.close()
+
+
+def start_ingest(bus_handler, can_options: Optional[dict]) -> Optional[CanIngest]:
+    if not can_options:
+        logger.info("[Starting] no CAN channel, ingest disabled")
+        return None
+
+    ingest = CanIngest(
+        bus_handler,
+        open_can_bus(can_options["interface"], can_options["channel"]),
+        deadband=can_options.get("deadband"),
+    )
+    ingest.register_metrics(bus_handler.metrics.registry)
+    ingest.start()
+    logger.info(
+        "[Starting] CAN ingest on %s (%s), deadband %s",
+        can_options["channel"],
+        can_options["interface"],
+        "on" if ingest.deadband else "off",
+    )
+    return ingest
+
+
+def start_relay(bus_handler, ring: SharedEventRing) -> RingRelay:
+    relay = RingRelay(bus_handler, ring, decode)
+    relay.register_metrics(bus_handler.metrics.registry)
+    relay.start()
+    logger.info("[Starting] relaying events from shared ring %s", ring.name)
+    return relay
+
+
+def build_registry(bus_handler, registry_options: Optional[dict], registry_target: Optional[str] = None):
+    """
+    The module registry, or in a worker process a client of the ingest process' one.
+    """
+    if registry_target:
+        return ModuleRegistryClient(registry_target)
+    return ModuleRegistry(bus_handler, **(registry_options or {}))
+
+
+def serve_threaded(
+        port: int,
+        max_workers: int,
+        handler_options: dict,
+        queue_options: dict,
+        can_options: Optional[dict] = None,
+        registry_options: Optional[dict] = None,
+        servicer_options: Optional[dict] = None,
+        ring: Optional[SharedEventRing] = None,
+        registry_target: Optional[str] = None,
+):
+    """
+    One worker thread per active RPC, streams included.
+    With a ring this is a worker process: events are relayed from the ingest
+    process and module registration is forwarded to it at registry_target.
+    """
 
     # Build servicer
-    servicer = MCUBusServer()
+    bus_handler = CanBusHandler(**handler_options)
+    modules = build_registry(bus_handler, registry_options, registry_target)
+    servicer = MCUBusServer(
+        bus_handler,
+        queue_factory=partial(EventQueue, **queue_options),
+        module_registry=modules,
+        **(servicer_options or {}),
+    )
+    modules.start()
+    feed = start_relay(bus_handler, ring) if ring else start_ingest(bus_handler, can_options)
 
     # Build gRPC service
     server = grpc.server(
-        futures.ThreadPoolExecutor(max_workers=10),
-        options=[
-            ("grpc.max_send_message_length", 10 * 1024 * 1024),
-            ("grpc.max_receive_message_length", 10 * 1024 * 1024),
-        ]
+        futures.ThreadPoolExecutor(max_workers=max_workers),
+        options=WORKER_SERVER_OPTIONS if ring else SERVER_OPTIONS,
     )
-    mcu_bus_pb2_grpc.add_MCUBusServiceServicer_to_server(servicer, server)
+    add_mcu_bus_servicer_to_server(servicer, server)
     server.add_insecure_port(f"[::]:{port}")
 
     # Start gRPC server
@@ -39,6 +267,184 @@ def main(
         logger.info("\n[Shutdown] Stopping server...")
         server.stop(grace=5)
         logger.info("[Shutdown] Server stopped.")
+    finally:
+        if feed:
+            feed.stop()
+        modules.stop()
+
+
+async def serve_aio(
+        port: int,
+        handler_options: dict,
+        queue_options: dict,
+        can_options: Optional[dict] = None,
+        registry_options: Optional[dict] = None,
+        servicer_options: Optional[dict] = None,
+        ring: Optional[SharedEventRing] = None,
+        registry_target: Optional[str] = None,
+):
+    """
+    Streams are coroutines, concurrency is bound by memory instead of threads.
+    With a ring this is a worker process, see serve_threaded.
+    """
+
+    # Build servicer
+    bus_handler = AsyncCanBusHandler(asyncio.get_running_loop(), **handler_options)
+    modules = build_registry(bus_handler, registry_options, registry_target)
+    servicer = AsyncMCUBusServer(
+        bus_handler,
+        queue_factory=partial(AsyncEventQueue, **queue_options),
+        module_registry=modules,
+        **(servicer_options or {}),
+    )
+    modules.start()
+    feed = start_relay(bus_handler, ring) if ring else start_ingest(bus_handler, can_options)
+
+    # Build gRPC service
+    server = grpc.aio.server(options=WORKER_SERVER_OPTIONS if ring else SERVER_OPTIONS)
+    add_mcu_bus_servicer_to_server(servicer, server)
+    server.add_insecure_port(f"[::]:{port}")
+
+    # Stop gracefully on Ctrl+C / systemd stop, workers only when the ingest process says so
+    stop = asyncio.Event()
+    for sig in (signal.SIGTERM,) if ring else (signal.SIGINT, signal.SIGTERM):
+        asyncio.get_running_loop().add_signal_handler(sig, stop.set)
+
+    # Start gRPC server
+    await server.start()
+    logger.info("[Started] gRPC aio server running on: %s", port)
+
+    await stop.wait()
+    logger.info("\n[Shutdown] Stopping server...")
+    await server.stop(grace=5)
+    if feed:
+        await asyncio.to_thread(feed.stop)
+    await asyncio.to_thread(modules.stop)
+    logger.info("[Shutdown] Server stopped.")
+
+
+def serve_worker(
+        index: int,
+        ring_name: str,
+        port: int,
+        mode: str,
+        max_workers: int,
+        replay_options: dict,
+        queue_options: dict,
+        servicer_options: Optional[dict] = None,
+        registry_target: Optional[str] = None,
+        metrics_port: int = 0,
+        metrics_host: str = DEFAULT_METRICS_HOST,
+):
+    """
+    Entry point of a gRPC worker process, started by serve_processes.
+    Serves the subscribers whose connections the kernel hands this process,
+    module registration goes on to the ingest process at registry_target.
+    """
+    log_handler = setup_logging(json_output=False, rate_limits=LOG_RATE_LIMITS)
+
+    # Stopped by the ingest process, not by a Ctrl+C reaching the whole process group.
+    # A systemd stop signals every process too, only the first SIGTERM interrupts
+    def interrupt_once(signum, frame):
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, interrupt_once)
+
+    metrics = MetricsRegistry()
+    export_log_drops(log_handler, metrics)
+    if metrics_port:
+        start_metrics_server(metrics, metrics_port, metrics_host)
+        logger.info("[Starting] worker %d metrics on %s:%d/metrics", index, metrics_host, metrics_port)
+
+    # Events arrive sequenced and encoded, only recent history is kept for resuming subscribers
+    handler_options = dict(encoder=encode, replay_ring=ReplayRing(**replay_options), metrics=metrics)
+    ring = SharedEventRing.attach(ring_name)
+    try:
+        worker = dict(servicer_options=servicer_options, ring=ring, registry_target=registry_target)
+        if mode == "aio":
+            asyncio.run(serve_aio(port, handler_options, queue_options, **worker))
+        else:
+            serve_threaded(port, max_workers, handler_options, queue_options, **worker)
+    finally:
+        ring.close()
+
+
+def serve_processes(
+        processes: int,
+        ring_mb: float,
+        handler_options: dict,
+        worker_options: dict,
+        can_options: Optional[dict] = None,
+        registry_options: Optional[dict] = None,
+        metrics_port: int = 0,
+        metrics_host: str = DEFAULT_METRICS_HOST,
+):
+    """
+    One ingest process, this one, sequences, logs and encodes events into a
+    shared memory ring; `processes` gRPC workers read the ring and serve
+    their share of subscribers, each on its own core and GIL.
+    A client's streams share its connection and so land on one worker.
+    The module registry admits events here, workers forward registration
+    to it over a loopback gRPC server.
+    """
+    ring = SharedEventRing.create(int(ring_mb * 1024 * 1024))
+    bus_handler = RingBusHandler(ring, **handler_options)
+
+    modules = ModuleRegistry(bus_handler, **(registry_options or {}))
+    modules.start()
+    registry_server = grpc.server(futures.ThreadPoolExecutor(max_workers=2), options=SERVER_OPTIONS)
+    add_mcu_bus_servicer_to_server(MCUBusServer(bus_handler, module_registry=modules), registry_server)
+    registry_target = f"127.0.0.1:{registry_server.add_insecure_port('127.0.0.1:0')}"
+    registry_server.start()
+
+    # Spawn, not fork: the workers start clean of this process' threads and locks
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(
+            target=serve_worker,
+            args=(index, ring.name),
+            kwargs=dict(
+                worker_options,
+                registry_target=registry_target,
+                metrics_port=metrics_port + 1 + index if metrics_port else 0,
+                metrics_host=metrics_host,
+            ),
+            name=f"BusWorker-{index}",
+            daemon=True,
+        )
+        for index in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    ingest = start_ingest(bus_handler, can_options)
+    logger.info("[Started] %d gRPC worker processes on: %s", processes, worker_options["port"])
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        while not stop.wait(1.0):
+            exited = [worker.name for worker in workers if not worker.is_alive()]
+            if exited:
+                logger.error("[Shutdown] %s exited", ", ".join(exited))
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logger.info("[Shutdown] Stopping workers...")
+        if ingest:
+            ingest.stop()
+        registry_server.stop(grace=None)
+        modules.stop()
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join(timeout=10)
+            if worker.is_alive():
+                worker.kill()
+        ring.close()
+        logger.info("[Shutdown] Workers stopped.")
 
 
 if __name__ == "__main__":
@@ -47,7 +453,69 @@ if __name__ == "__main__":
     # Build args
     parser = argparse.ArgumentParser()
     parser.add_argument("-p", "--port", type=int, default=50051, help="gRPC server port")
+    parser.add_argument("--mode", choices=MODES, default="thread", help="Thread pool or asyncio gRPC server")
+    parser.add_argument("--max-workers", type=int, default=10, help="Worker threads in thread mode")
+    parser.add_argument("--queue-capacity", type=int, default=1024, help="Max queued events per subscriber")
+    parser.add_argument(
+        "--overflow-policy",
+        choices=[p.value for p in OverflowPolicy],
+        default=OverflowPolicy.DROP_OLDEST.value,
+        help="What a full subscriber queue does with new events",
+    )
+    parser.add_argument("--block-timeout", type=float, default=0.05, help="Seconds to wait with the 'block' policy")
+    parser.add_argument("--replay-events", type=int, default=10_000, help="Recent events kept for resuming subscribers")
+    parser.add_argument("--replay-mb", type=float, default=8.0, help="Memory cap of the replay buffer in MiB")
+    parser.add_argument("--wal-dir", default=None, help="Directory of the on-disk event log (disabled if unset)")
+    parser.add_argument("--wal-segment-mb", type=float, default=16.0, help="Event log segment size in MiB")
+    parser.add_argument("--wal-retention-mb", type=float, default=512.0, help="Event log total size kept in MiB")
+    parser.add_argument("--wal-retention-hours", type=float, default=168.0, help="Event log age kept in hours")
+    parser.add_argument("--wal-commit-ms", type=float, default=50.0, help="Event log group commit interval")
+    parser.add_argument("--can-interface", default="socketcan", help="python-can interface (socketcan, virtual)")
+    parser.add_argument("--can-channel", default=None, help="CAN channel to ingest, e.g. can0 (disabled if unset)")
+    parser.add_argument("--metrics-port", type=int, default=9108, help="HTTP port of /metrics (0 disables it)")
+    parser.add_argument(
+        "--metrics-host",
+        default=DEFAULT_METRICS_HOST,
+        help="Address /metrics listens on, 0.0.0.0 exposes it, unauthenticated, to the network",
+    )
+    parser.add_argument("--deadband", action="store_true", help="Suppress sensor samples within default deadbands")
+    parser.add_argument("--deadband-config", default=None, help="JSON file of per field / per module deadbands")
+    parser.add_argument("--max-silence", type=float, default=60.0, help="Seconds after which a sample passes anyway")
+    parser.add_argument("--module-lease", type=float, default=30.0, help="Seconds a registered module may stay silent")
+    parser.add_argument("--processes", type=int, default=0, help="gRPC worker processes fed by one ingest process")
+    parser.add_argument("--ring-mb", type=float, default=16.0, help="Shared event ring size in MiB, with --processes")
+    parser.add_argument(
+        "--heartbeat-interval",
+        type=float,
+        default=DEFAULT_HEARTBEAT_INTERVAL,
+        help="Seconds an idle stream waits before a heartbeat, bounds how long a dead client holds a worker",
+    )
     args = parser.parse_args()
 
     # Start
-    main(port=args.port)
+    main(
+        port=args.port,
+        mode=args.mode,
+        max_workers=args.max_workers,
+        queue_capacity=args.queue_capacity,
+        overflow_policy=OverflowPolicy(args.overflow_policy),
+        block_timeout=args.block_timeout,
+        replay_events=args.replay_events,
+        replay_mb=args.replay_mb,
+        wal_dir=args.wal_dir,
+        wal_segment_mb=args.wal_segment_mb,
+        wal_retention_mb=args.wal_retention_mb,
+        wal_retention_hours=args.wal_retention_hours,
+        wal_commit_ms=args.wal_commit_ms,
+        can_interface=args.can_interface,
+        can_channel=args.can_channel,
+        metrics_port=args.metrics_port,
+        metrics_host=args.metrics_host,
+        module_lease=args.module_lease,
+        deadband=args.deadband,
+        deadband_config=args.deadband_config,
+        max_silence=args.max_silence,
+        processes=args.processes,
+        ring_mb=args.ring_mb,
+        heartbeat_interval=args.heartbeat_interval,
+    )
@@ -0,0 +1,162 @@
+"""
+Virtual MCU fleet for the mock daemon: thousands of sensor modules stepped
+together, one NumPy operation per tick over (modules, fields) arrays.
+"""
+
+import math
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from generated.mcubus.v1 import events_pb2
+from mock_mcu_daemon import MockSensorConfig
+
+FIELDS = ("temperature", "humidity", "soil_moisture", "light_level", "water_level", "ph_value")
+TEMPERATURE, HUMIDITY, SOIL, LIGHT, WATER, PH = range(len(FIELDS))
+
+# Physical bounds per field, readings are clipped to them
+LOW = np.array([-20.0, 0.0, 0.0, 0.0, 0.0, 0.0])
+HIGH = np.array([60.0, 100.0, 100.0, 100_000.0, 100.0, 14.0])
+
+# Pull back towards the module's own base per tick, keeps the walk bounded
+REVERSION = 0.02
+
+# Daily temperature swing around the base, peaking in the afternoon
+TEMPERATURE_SWING = 4.0
+
+
+@dataclass
+class FleetConfig:
+    modules: int = 1000
+    # Simulated seconds per tick
+    tick: float = 1.0
+    # Simulated seconds per day, shorten to see light curves in minutes
+    day_seconds: float = 86_400.0
+    # Chance per module and tick that its sensors fail, and that a failed one recovers
+    failure_rate: float = 1e-4
+    recovery_rate: float = 0.01
+    seed: Optional[int] = None
+
+
+class VirtualFleet:
+    """
+    Random walk per module and field: per-module base and drift, noise
+    scaled by the field's variance, light following the sun (each module at
+    its own longitude) and temperature lagging behind it. Failed modules
+    send no readings, failing and recovering raise alerts.
+    """
+
+    def __init__(self, config: FleetConfig, sensor: Optional[MockSensorConfig] = None):
+        sensor = sensor or MockSensorConfig()
+        n = config.modules
+        self.config = config
+        self.module_ids = [f"mcu_{i:05d}" for i in range(n)]
+        self._rng = np.random.default_rng(config.seed)
+
+        base = np.array([
+            sensor.base_temperature,
+            sensor.base_humidity,
+            sensor.base_soil_moisture,
+            sensor.base_light_level,
+            sensor.base_water_level,
+            sensor.base_ph,
+        ])
+        variance = np.array([
+            sensor.temp_variance,
+            sensor.humidity_variance,
+            sensor.soil_variance,
+            sensor.light_variance,
+            sensor.water_variance,
+            sensor.ph_variance,
+        ])
+
+        # Every module is a little different, and slowly drifts its own way
+        self._base = base + self._rng.uniform(-0.5, 0.5, (n, len(FIELDS))) * variance
+        self._drift = self._rng.normal(0.0, 0.002, (n, len(FIELDS))) * variance
+        self._noise = variance * 0.05
+        self._values = self._base.copy()
+        self._sun_offset = self._rng.uniform(-0.05, 0.05, n)
+        self._failed = np.zeros(n, dtype=bool)
+
+        self.ticks = 0
+        self.time = 0.0
+
+    @property
+    def failed(self) -> int:
+        return int(self._failed.sum())
+
+    def step(self) -> np.ndarray:
+        """
+        Advance every module by one tick.
+        :return: (modules, fields) readings
+        """
+        config, rng = self.config, self._rng
+        self.ticks += 1
+        self.time += config.tick
+
+        values = self._values
+        values += self._drift + rng.standard_normal(values.shape) * self._noise
+        values += (self._base - values) * REVERSION
+
+        # Diurnal curves: the walk is the weather, the sun sets the level
+        day = self.time / config.day_seconds + self._sun_offset
+        sun = np.maximum(np.sin(2 * math.pi * (day - 0.25)), 0.0)
+        swing = np.sin(2 * math.pi * (day - 0.375)) * TEMPERATURE_SWING
+
+        readings = values.copy()
+        readings[:, LIGHT] *= sun
+        readings[:, TEMPERATURE] += swing
+        np.clip(readings, LOW, HIGH, out=readings)
+        return readings
+
+    def inject_failures(self):
+        """
+        Fail and recover modules at random.
+        :return: (newly failed, recovered) boolean masks
+        """
+        config = self.config
+        roll = self._rng.random(len(self._failed))
+        failing = ~self._failed & (roll < config.failure_rate)
+        recovering = self._failed & (roll < config.recovery_rate)
+        self._failed ^= failing | recovering
+        return failing, recovering
+
+    def tick_events(self) -> List[events_pb2.BusEvent]:
+        """
+        One tick of the whole fleet as BusEvents: a reading per healthy
+        module and an alert per module that failed or recovered.
+        """
+        readings = self.step()
+        failing, recovering = self.inject_failures()
+
+        timestamp = events_pb2.BusEvent().timestamp
+        timestamp.GetCurrentTime()
+        prefix = f"fleet_{self.ticks:08d}_"
+        module_ids = self.module_ids
+
+        events = []
+        for i in np.flatnonzero(~self._failed).tolist():
+            t, h, soil, light, water, ph = readings[i].tolist()
+            event = events_pb2.BusEvent(event_id=f"{prefix}{i}", module_id=module_ids[i])
+            event.timestamp.CopyFrom(timestamp)
+            data = event.sensor_data
+            data.temperature, data.humidity, data.soil_moisture = t, h, soil
+            data.light_level, data.water_level, data.ph_value = light, water, ph
+            events.append(event)
+
+        for mask, severity, code, message in (
+                (failing, "critical", "SENSOR_FAIL", "Sensors not responding"),
+                (recovering, "info", "SENSOR_OK", "Sensors responding again"),
+        ):
+            for i in np.flatnonzero(mask).tolist():
+                event = events_pb2.BusEvent(
+                    event_id=f"{prefix}{i}_{code.lower()}",
+                    module_id=module_ids[i],
+                    alert=events_pb2.AlertEvent(severity=severity, code=code, message=message),
+                )
+                event.timestamp.CopyFrom(timestamp)
+                events.append(event)
+
+        return events
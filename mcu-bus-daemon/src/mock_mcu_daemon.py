@@ -4,6 +4,7 @@ Mock MCU Bus Daemon
 """
 
 import grpc
+import logging
 import time
 import random
 import threading
@@ -18,6 +19,23 @@ from generated.mcubus.v1 import mcu_bus_pb2_grpc
 from generated.mcubus.v1 import messages_pb2
 from generated.mcubus.v1 import events_pb2
 from google.protobuf.timestamp_pb2 import Timestamp
+from infrastructure.logger import setup_logging
+
+logger = logging.getLogger("mock_mcu_daemon")
+
+
+DEVICES = ["cooling_fan", "water_pump", "grow_light", "heater"]
+
+ALERTS = [
+    ("info", "SENSOR_OK", "All sensors operating normally"),
+    ("info", "PUMP_CYCLE", "Water pump completed cycle"),
+    ("warning", "LOW_WATER", "Water level below 30%"),
+    ("warning", "HIGH_TEMP", "Temperature exceeds 30°C"),
+    ("warning", "LOW_HUMIDITY", "Humidity below 40%"),
+    ("critical", "SENSOR_FAIL", "Soil moisture sensor not responding"),
+    ("critical", "PUMP_ERROR", "Water pump malfunction detected"),
+]
+ALERT_WEIGHTS = [0.4, 0.3, 0.1, 0.08, 0.07, 0.03, 0.02]
 
 
 @dataclass
@@ -69,7 +87,7 @@ class MockMCUBusServicer(mcu_bus_pb2_grpc.MCUBusServiceServicer):
                 "peer": context.peer()
             }
 
-        print(f"[Register] ✓ Module '{module_id}' ({request.module_type}) from {context.peer()}")
+        logger.info("[Register] ✓ Module '%s' (%s) from %s", module_id, request.module_type, context.peer())
 
         return messages_pb2.RegisterReply(
             success=True,
@@ -81,18 +99,28 @@ class MockMCUBusServicer(mcu_bus_pb2_grpc.MCUBusServiceServicer):
         with self.lock:
             if request.module_id in self.registered_modules:
                 del self.registered_modules[request.module_id]
-                print(f"[UnRegister] ✓ Module '{request.module_id}' removed")
+                logger.info("[UnRegister] ✓ Module '%s' removed", request.module_id)
                 return messages_pb2.UnSubscribeReplay(
                     success=True,
                     message="Unregistered successfully"
                 )
 
-        print(f"[UnRegister] ✗ Module '{request.module_id}' not found")
+        logger.info("[UnRegister] ✗ Module '%s' not found", request.module_id)
         return messages_pb2.UnSubscribeReplay(
             success=False,
             message="Module not found"
         )
 
+    def Heartbeat(self, request, context):
+        # 模擬: registrations never expire
+        with self.lock:
+            registered = request.module_id in self.registered_modules
+
+        return messages_pb2.HeartbeatReply(
+            success=registered,
+            message="Renewed" if registered else "Module not found"
+        )
+
     def SubscribeEvents(self, request, context):
         subscriber = Subscriber(
             queue=queue.Queue(),
@@ -103,9 +131,13 @@ class MockMCUBusServicer(mcu_bus_pb2_grpc.MCUBusServiceServicer):
         with self.lock:
             self.subscribers.append(subscriber)
 
-        filter_info = f"modules={request.module_ids or 'ALL'}, types={request.event_types or 'ALL'}"
-        print(f"[Subscribe] ✓ New subscriber from {context.peer()} ({filter_info})")
-        print(f"[Subscribe]   Active subscribers: {len(self.subscribers)}")
+        logger.info(
+            "[Subscribe] ✓ New subscriber from %s (modules=%s, types=%s), active subscribers: %d",
+            context.peer(),
+            list(request.module_ids) or "ALL",
+            list(request.event_types) or "ALL",
+            len(self.subscribers),
+        )
 
         try:
             while context.is_active():
@@ -115,12 +147,12 @@ class MockMCUBusServicer(mcu_bus_pb2_grpc.MCUBusServiceServicer):
                 except queue.Empty:
                     continue
         except Exception as e:
-            print(f"[Subscribe] ✗ Error: {e}")
+            logger.error("[Subscribe] ✗ Error: %s", e)
         finally:
             with self.lock:
                 if subscriber in self.subscribers:
                     self.subscribers.remove(subscriber)
-            print(f"[Subscribe] ✗ Subscriber disconnected. Remaining: {len(self.subscribers)}")
+            logger.info("[Subscribe] ✗ Subscriber disconnected. Remaining: %d", len(self.subscribers))
 
     def _generate_event_id(self) -> str:
         self._event_counter += 1
@@ -194,7 +226,29 @@ class MockMCUBusServicer(mcu_bus_pb2_grpc.MCUBusServiceServicer):
                 try:
                     subscriber.queue.put_nowait(event)
                 except queue.Full:
-                    print(f"[Broadcast] ⚠ Queue full, dropping event")
+                    logger.warning("[Broadcast] ⚠ Queue full, dropping event")
+
+    def broadcast_events(self, events: List[events_pb2.BusEvent]):
+        """
+        Same as broadcast_event for many events, one lock hold for all of them.
+        """
+        with self.lock:
+            subscribers = list(self.subscribers)
+
+        for subscriber in subscribers:
+            module_ids = set(subscriber.module_ids)
+            event_types = set(subscriber.event_types)
+            for event in events:
+                if module_ids and event.module_id not in module_ids:
+                    continue
+                if event_types and event.WhichOneof("payload") not in event_types:
+                    continue
+
+                try:
+                    subscriber.queue.put_nowait(event)
+                except queue.Full:
+                    logger.warning("[Broadcast] ⚠ Queue full, dropping the rest of the batch")
+                    break
 
 
 class MockEventGenerator:
@@ -236,69 +290,125 @@ class MockEventGenerator:
         t3.start()
         self._threads.append(t3)
 
-        print(f"[Generator] Started with intervals: sensor={sensor_interval}s, "
-              f"control={control_interval}s, alert={alert_interval}s")
+        logger.info(
+            "[Generator] Started with intervals: sensor=%ss, control=%ss, alert=%ss",
+            sensor_interval,
+            control_interval,
+            alert_interval,
+        )
 
     def stop(self):
         self.running = False
 
+    def next_sensor_event(self, module_id: str = "mcu_sensor_1") -> events_pb2.BusEvent:
+        return self.servicer.generate_sensor_event(module_id)
+
+    def next_control_event(self) -> events_pb2.BusEvent:
+        device = random.choice(DEVICES)
+        is_active = random.choice([True, False])
+        power = random.uniform(50, 100) if is_active else 0
+        reason = "auto_regulation" if is_active else "threshold_reached"
+
+        return self.servicer.generate_control_event(device, is_active, power, reason)
+
+    def next_alert_event(self) -> events_pb2.BusEvent:
+        severity, code, message = random.choices(ALERTS, weights=ALERT_WEIGHTS)[0]
+        return self.servicer.generate_alert_event(severity, code, message)
+
     def _sensor_loop(self, interval: float):
         while self.running:
-            event = self.servicer.generate_sensor_event("mcu_sensor_1")
+            event = self.next_sensor_event()
             self.servicer.broadcast_event(event)
 
             data = event.sensor_data
-            print(f"[Sensor] T:{data.temperature:.1f}°C H:{data.humidity:.1f}% "
-                  f"Soil:{data.soil_moisture:.1f}% Water:{data.water_level:.1f}% "
-                  f"pH:{data.ph_value:.2f}")
+            logger.info(
+                "[Sensor] T:%.1f°C H:%.1f%% Soil:%.1f%% Water:%.1f%% pH:%.2f",
+                data.temperature,
+                data.humidity,
+                data.soil_moisture,
+                data.water_level,
+                data.ph_value,
+            )
 
             time.sleep(interval)
 
     def _control_loop(self, interval: float):
-        devices = ["cooling_fan", "water_pump", "grow_light", "heater"]
-
         while self.running:
-            device = random.choice(devices)
-            is_active = random.choice([True, False])
-            power = random.uniform(50, 100) if is_active else 0
-            reason = "auto_regulation" if is_active else "threshold_reached"
-
-            event = self.servicer.generate_control_event(device, is_active, power, reason)
+            event = self.next_control_event()
             self.servicer.broadcast_event(event)
 
-            status = "ON" if is_active else "OFF"
-            print(f"[Control] {device}: {status} ({power:.0f}%) - {reason}")
+            status = event.control_status
+            logger.info(
+                "[Control] %s: %s (%.0f%%) - %s",
+                status.device,
+                "ON" if status.is_active else "OFF",
+                status.power_level,
+                status.reason,
+            )
 
             time.sleep(interval)
 
     def _alert_loop(self, interval: float):
-        alerts = [
-            ("info", "SENSOR_OK", "All sensors operating normally"),
-            ("info", "PUMP_CYCLE", "Water pump completed cycle"),
-            ("warning", "LOW_WATER", "Water level below 30%"),
-            ("warning", "HIGH_TEMP", "Temperature exceeds 30°C"),
-            ("warning", "LOW_HUMIDITY", "Humidity below 40%"),
-            ("critical", "SENSOR_FAIL", "Soil moisture sensor not responding"),
-            ("critical", "PUMP_ERROR", "Water pump malfunction detected"),
-        ]
-
         while self.running:
-            weights = [0.4, 0.3, 0.1, 0.08, 0.07, 0.03, 0.02]
-            severity, code, message = random.choices(alerts, weights=weights)[0]
-
-            event = self.servicer.generate_alert_event(severity, code, message)
+            event = self.next_alert_event()
             self.servicer.broadcast_event(event)
 
-            icon = {"info": "ℹ", "warning": "⚠", "critical": "🚨"}.get(severity, "?")
-            print(f"[Alert] {icon} [{severity.upper()}] {code}: {message}")
+            alert = event.alert
+            icon = {"info": "ℹ", "warning": "⚠", "critical": "🚨"}.get(alert.severity, "?")
+            logger.info("[Alert] %s [%s] %s: %s", icon, alert.severity.upper(), alert.code, alert.message)
 
             time.sleep(interval)
 
 
+class MockFleetGenerator:
+    """
+    Publishes a whole VirtualFleet tick in bulk, paced to one tick per
+    interval of wall time.
+    """
+
+    def __init__(self, servicer: MockMCUBusServicer, fleet):
+        self.servicer = servicer
+        self.fleet = fleet
+        self.running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, interval: float = 1.0):
+        self.running = True
+        self._thread = threading.Thread(target=self._fleet_loop, args=(interval,), daemon=True, name="FleetLoop")
+        self._thread.start()
+
+        logger.info("[Fleet] Started %d virtual MCUs, tick every %ss", len(self.fleet.module_ids), interval)
+
+    def stop(self):
+        self.running = False
+
+    def _fleet_loop(self, interval: float):
+        next_tick = time.monotonic()
+        while self.running:
+            started = time.perf_counter()
+            events = self.fleet.tick_events()
+            self.servicer.broadcast_events(events)
+
+            logger.info(
+                "[Fleet] Tick %d: %d events, %d modules failed, %.1fms",
+                self.fleet.ticks,
+                len(events),
+                self.fleet.failed,
+                (time.perf_counter() - started) * 1000,
+            )
+
+            next_tick += interval
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+
+
 def serve(port: int = 50051,
           sensor_interval: float = 2.0,
           control_interval: float = 10.0,
-          alert_interval: float = 30.0):
+          alert_interval: float = 30.0,
+          fleet_config=None):
+    # Per event lines are throttled, a fast generator must not wait on the terminal
+    setup_logging(json_output=False, rate_limits={logger.name: 5.0})
+
     # build service
     config = MockSensorConfig(
         base_temperature=26.0,
@@ -308,13 +418,20 @@ def serve(port: int = 50051,
     )
     servicer = MockMCUBusServicer(config)
 
-    # build event generator
-    generator = MockEventGenerator(servicer)
-    generator.start(
-        sensor_interval=sensor_interval,
-        control_interval=control_interval,
-        alert_interval=alert_interval
-    )
+    # build event generator, a fleet replaces the single sensor module
+    if fleet_config:
+        # NumPy is only needed for fleet mode
+        from mock_fleet import VirtualFleet
+
+        generator = MockFleetGenerator(servicer, VirtualFleet(fleet_config, config))
+        generator.start(interval=sensor_interval)
+    else:
+        generator = MockEventGenerator(servicer)
+        generator.start(
+            sensor_interval=sensor_interval,
+            control_interval=control_interval,
+            alert_interval=alert_interval
+        )
 
     # activate gRPC Server
     server = grpc.server(
@@ -331,9 +448,13 @@ def serve(port: int = 50051,
     print("=" * 60)
     print(f"🌱 Mock MCU Bus Daemon running on port {port}")
     print("=" * 60)
-    print(f"  Sensor interval:  {sensor_interval}s")
-    print(f"  Control interval: {control_interval}s")
-    print(f"  Alert interval:   {alert_interval}s")
+    if fleet_config:
+        print(f"  Fleet:            {fleet_config.modules} virtual MCUs")
+        print(f"  Tick interval:    {sensor_interval}s")
+    else:
+        print(f"  Sensor interval:  {sensor_interval}s")
+        print(f"  Control interval: {control_interval}s")
+        print(f"  Alert interval:   {alert_interval}s")
     print("=" * 60)
     print("Waiting for subscribers...")
     print()
@@ -355,12 +476,29 @@ if __name__ == "__main__":
     parser.add_argument("-s", "--sensor-interval", type=float, default=2.0, help="Sensor event interval in seconds")
     parser.add_argument("-c", "--control-interval", type=float, default=10.0, help="Control event interval in seconds")
     parser.add_argument("-a", "--alert-interval", type=float, default=30.0, help="Alert event interval in seconds")
+    parser.add_argument("-f", "--fleet", type=int, default=0, help="Simulate this many MCUs per sensor interval")
+    parser.add_argument("--day-seconds", type=float, default=86400.0, help="Simulated day length for light curves")
+    parser.add_argument("--failure-rate", type=float, default=1e-4, help="Chance per MCU and tick its sensors fail")
+    parser.add_argument("--seed", type=int, default=None, help="Fleet random seed")
 
     args = parser.parse_args()
 
+    fleet_config = None
+    if args.fleet:
+        from mock_fleet import FleetConfig
+
+        fleet_config = FleetConfig(
+            modules=args.fleet,
+            tick=args.sensor_interval,
+            day_seconds=args.day_seconds,
+            failure_rate=args.failure_rate,
+            seed=args.seed,
+        )
+
     serve(
         port=args.port,
         sensor_interval=args.sensor_interval,
         control_interval=args.control_interval,
-        alert_interval=args.alert_interval
+        alert_interval=args.alert_interval,
+        fleet_config=fleet_config,
     )
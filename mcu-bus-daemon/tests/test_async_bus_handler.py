@@ -0,0 +1,72 @@
+import asyncio
+import logging
+import threading
+import time
+
+import pytest
+
+from domain.event_queue import AsyncEventQueue
+from domain.mcu_bus import Subscriber, BusEvent, SensorDataEvent
+from generated.mcubus.v1.messages_pb2 import FlowRequest, SubscribeRequest
+from infrastructure.bus.async_can_bus_handler import AsyncCanBusHandler
+from infrastructure.servicer.async_mcu_bus_servicer import AsyncMCUBusServer
+from infrastructure.servicer.bus_enevt_adapter import encode
+
+
+def _event(i: int) -> BusEvent:
+    return BusEvent(str(i), "m1", time.time_ns(), SensorDataEvent(i, 2, 3, 4, 5, 6))
+
+
+def test_publish_from_ingest_thread_is_handed_to_loop():
+    async def scenario():
+        handler = AsyncCanBusHandler(asyncio.get_running_loop(), encoder=encode)
+        subscriber = Subscriber(queue=AsyncEventQueue())
+        handler.handle_subscriber(subscriber)
+
+        ingest = threading.Thread(target=lambda: [handler.publish(_event(i)) for i in range(100)])
+        ingest.start()
+
+        events = [await asyncio.wait_for(handler.take_event(subscriber.id), 2) for _ in range(100)]
+        ingest.join()
+
+        assert [e.event_id for e in events] == [str(i) for i in range(100)]
+        assert all(e.wire for e in events)
+
+    asyncio.run(scenario())
+
+
+def test_removed_subscriber_wakes_waiting_stream():
+    async def scenario():
+        handler = AsyncCanBusHandler(asyncio.get_running_loop())
+        subscriber = Subscriber(queue=AsyncEventQueue())
+        handler.handle_subscriber(subscriber)
+
+        waiter = asyncio.ensure_future(handler.take_event(subscriber.id))
+        await asyncio.sleep(0.01)
+        handler.remove_subscriber(subscriber.id)
+
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(waiter, 1)
+
+    asyncio.run(scenario())
+
+
+def test_flow_stream_retrieves_a_broken_credit_stream_error(caplog):
+    async def requests():
+        yield FlowRequest(subscribe=SubscribeRequest(), credits=1)
+        await asyncio.sleep(0.01)
+        raise ConnectionResetError("client reset")
+
+    async def scenario():
+        handler = AsyncCanBusHandler(asyncio.get_running_loop(), encoder=encode)
+        servicer = AsyncMCUBusServer(handler, queue_factory=AsyncEventQueue, heartbeat_interval=0.05)
+        stream = servicer.SubscribeEventsFlow(requests(), None)
+        # Idle heartbeats, meanwhile the credit stream breaks
+        for _ in range(3):
+            await asyncio.wait_for(anext(stream), 1)
+        await stream.aclose()
+        assert handler.subscribers == {}
+
+    with caplog.at_level(logging.DEBUG, logger="infrastructure.servicer.async_mcu_bus_servicer"):
+        asyncio.run(scenario())
+    assert "ConnectionResetError('client reset')" in caplog.text
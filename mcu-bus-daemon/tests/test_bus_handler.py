@@ -0,0 +1,137 @@
+import time
+
+from dataclasses import replace
+
+import pytest
+
+from domain.event_queue import EventQueue
+from domain.mcu_bus import Subscriber, BusEvent, SensorDataEvent, AlertEvent
+from domain.predicate import compile_predicate
+from domain.replay_ring import ReplayRing, EVENT_OVERHEAD_BYTES
+from infrastructure.bus.can_bus_handler import CanBusHandler
+
+
+def _event(module_id: str, payload) -> BusEvent:
+    return BusEvent(
+        event_id=f"{module_id}-evt",
+        module_id=module_id,
+        timestamp_ns=time.time_ns(),
+        payload=payload,
+    )
+
+
+SENSOR = SensorDataEvent(25.0, 50.0, 40.0, 800.0, 70.0, 6.5)
+ALERT = AlertEvent("warning", "LOW_WATER", "Water level below 30%")
+
+
+def test_publish_routes_on_module_and_event_type():
+    handler = CanBusHandler()
+    everything = Subscriber()
+    module_1 = Subscriber(module_ids={"m1"})
+    alerts = Subscriber(event_types={"alert"})
+    module_2_alerts = Subscriber(module_ids={"m2"}, event_types={"alert"})
+    for s in (everything, module_1, alerts, module_2_alerts):
+        handler.handle_subscriber(s)
+
+    handler.publish(_event("m1", SENSOR))
+    handler.publish(_event("m2", ALERT))
+
+    assert everything.queue.qsize() == 2
+    assert module_1.queue.qsize() == 1
+    assert alerts.queue.qsize() == 1
+    assert module_2_alerts.queue.qsize() == 1
+
+
+def test_removed_subscriber_is_no_longer_routed():
+    handler = CanBusHandler()
+    subscriber = Subscriber(queue=EventQueue(), module_ids={"m1", "m2"})
+    handler.handle_subscriber(subscriber)
+    handler.remove_subscriber(subscriber.id)
+
+    handler.publish(_event("m1", SENSOR))
+
+    assert subscriber.queue.qsize() == 0
+    assert handler._routes == {}
+
+
+def test_unknown_event_type_is_rejected():
+    handler = CanBusHandler()
+
+    with pytest.raises(ValueError):
+        handler.handle_subscriber(Subscriber(event_types={"weather"}))
+
+    assert not handler.subscribers
+
+
+def test_predicate_subscribers_share_one_evaluation_per_event():
+    handler = CanBusHandler()
+    hot = [Subscriber(predicate=compile_predicate("temperature > 30")) for _ in range(3)]
+    hot_m1 = Subscriber(module_ids={"m1"}, predicate=compile_predicate("temperature>30"))
+    critical = Subscriber(predicate=compile_predicate('severity == "critical"'))
+    for s in (*hot, hot_m1, critical):
+        handler.handle_subscriber(s)
+
+    # Spelled differently, compiled once
+    assert hot_m1.predicate is hot[0].predicate
+    calls = []
+    # The compiled predicate is shared through the cache, restore it whatever happens
+    predicate, test = hot[0].predicate, hot[0].predicate.test
+    object.__setattr__(predicate, "test", lambda p: calls.append(p) or test(p))
+    try:
+        handler.publish(_event("m1", SensorDataEvent(31.0, 50.0, 40.0, 800.0, 70.0, 6.5)))
+        handler.publish(_event("m1", SENSOR))
+        handler.publish(_event("m2", ALERT))
+    finally:
+        object.__setattr__(predicate, "test", test)
+
+    assert [s.queue.qsize() for s in (*hot, hot_m1, critical)] == [1, 1, 1, 1, 0]
+    # Once per sensor event, never for the alert
+    assert len(calls) == 2
+
+    for s in (*hot, hot_m1, critical):
+        handler.remove_subscriber(s.id)
+    assert handler._predicate_routes == {}
+
+
+def test_predicate_outside_the_event_types_is_rejected():
+    handler = CanBusHandler()
+
+    with pytest.raises(ValueError):
+        handler.handle_subscriber(Subscriber(event_types={"alert"}, predicate=compile_predicate("temperature > 30")))
+
+
+def test_publish_assigns_monotonic_seq_and_replays_matching_events():
+    handler = CanBusHandler(replay_ring=ReplayRing(max_events=100))
+    for i in range(3):
+        handler.publish(_event("m1", SENSOR))
+        handler.publish(_event("m2", ALERT))
+
+    subscriber = Subscriber(module_ids={"m1"})
+    handler.handle_subscriber(subscriber)
+
+    assert [e.seq for e in handler.replay_ring.since(0)] == [1, 2, 3, 4, 5, 6]
+    assert [e.seq for e in handler.replay(subscriber.id, after_seq=1)] == [3, 5]
+
+
+def test_replay_ring_is_capped_by_count_and_memory():
+    by_count = ReplayRing(max_events=3)
+    by_memory = ReplayRing(max_events=100, max_bytes=2 * EVENT_OVERHEAD_BYTES)
+    for ring in (by_count, by_memory):
+        handler = CanBusHandler(replay_ring=ring)
+        for _ in range(5):
+            handler.publish(_event("m1", SENSOR))
+
+    assert [e.seq for e in by_count.since(0)] == [3, 4, 5]
+    assert [e.seq for e in by_memory.since(0)] == [4, 5]
+
+
+def test_replay_ring_since_skips_over_seq_gaps():
+    ring = ReplayRing()
+    for seq in (1, 2, 5, 6, 7):
+        ring.append(replace(_event("m1", SENSOR), seq=seq))
+
+    assert [e.seq for e in ring.since(0)] == [1, 2, 5, 6, 7]
+    assert [e.seq for e in ring.since(2)] == [5, 6, 7]
+    assert [e.seq for e in ring.since(3)] == [5, 6, 7]
+    assert [e.seq for e in ring.since(5)] == [6, 7]
+    assert ring.since(7) == []
@@ -0,0 +1,208 @@
+import struct
+import threading
+import time
+
+import can
+import pytest
+
+from domain.deadband import DeadbandFilter
+from domain.event_queue import EventQueue
+from domain.mcu_bus import Subscriber, SensorDataEvent, ControlStatusEvent, AlertEvent
+from infrastructure.bus.can_bus_handler import CanBusHandler
+from infrastructure.bus.can_codec import (
+    CanDecodeError,
+    decode_frame,
+    decode_frames,
+    SENSOR_DATA_ID,
+    CONTROL_STATUS_ID,
+    ALERT_ID,
+)
+from infrastructure.bus.can_ingest import CanIngest, open_can_bus
+
+SENSOR_FRAME = struct.pack("<hBBHBB", 2350, 130, 90, 800, 150, 65)
+
+
+def _wait_for(condition) -> None:
+    deadline = time.monotonic() + 5
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert condition()
+
+
+@pytest.fixture
+def channel(request):
+    # One virtual bus per test
+    return request.node.name
+
+
+def test_decode_frames():
+    event = decode_frame(SENSOR_DATA_ID | 3, SENSOR_FRAME, 1_767_225_600.0)
+    assert event.module_id == "mcu_3"
+    assert event.payload == SensorDataEvent(
+        pytest.approx(23.5), 65.0, 45.0, 800.0, 75.0, pytest.approx(6.5)
+    )
+
+    control = decode_frame(CONTROL_STATUS_ID | 1, struct.pack("<BBHB", 1, 1, 755, 2), 0.0).payload
+    assert control == ControlStatusEvent("water_pump", True, pytest.approx(75.5), "threshold_reached")
+
+    alert = decode_frame(ALERT_ID | 1, struct.pack("<BH", 1, 3), 0.0).payload
+    assert isinstance(alert, AlertEvent) and alert.code == "LOW_WATER" and alert.severity == "warning"
+
+
+@pytest.mark.parametrize("arbitration_id, data", [
+    (0x700 | 1, SENSOR_FRAME),
+    (SENSOR_DATA_ID | 1, b"\x01\x02"),
+    (ALERT_ID | 1, struct.pack("<BH", 9, 3)),
+])
+def test_decode_rejects_bad_frames(arbitration_id, data):
+    with pytest.raises(CanDecodeError):
+        decode_frame(arbitration_id, data, 0.0)
+
+
+def test_batch_decode_keeps_order_and_marks_bad_frames():
+    frames = [
+        (SENSOR_DATA_ID | 1, SENSOR_FRAME, 1.0),
+        (ALERT_ID | 2, struct.pack("<BH", 0, 1), 2.0),
+        (ALERT_ID | 2, struct.pack("<BH", 0, 99), 3.0),
+        (SENSOR_DATA_ID | 3, SENSOR_FRAME + b"\x00", 4.0),
+        (SENSOR_DATA_ID | 4, SENSOR_FRAME[:4], 5.0),
+        (0x700, b"", 6.0),
+    ]
+
+    events = decode_frames(frames)
+
+    assert [e.module_id if e else None for e in events] == ["mcu_1", "mcu_2", None, "mcu_3", None, None]
+    assert events[1].payload.code == "SENSOR_OK"
+    assert events[3] == decode_frame(*frames[3])
+
+
+def test_ingest_publishes_decoded_frames(channel):
+    handler = CanBusHandler()
+    subscriber = Subscriber(queue=EventQueue())
+    handler.handle_subscriber(subscriber)
+
+    ingest = CanIngest(handler, open_can_bus("virtual", channel))
+    ingest.start()
+    sender = can.Bus(interface="virtual", channel=channel)
+    try:
+        sender.send(can.Message(arbitration_id=SENSOR_DATA_ID | 2, data=SENSOR_FRAME, is_extended_id=False))
+        sender.send(can.Message(arbitration_id=0x700, data=b"\x00", is_extended_id=False))
+        sender.send(can.Message(arbitration_id=ALERT_ID | 2, data=struct.pack("<BH", 2, 7), is_extended_id=False))
+
+        first = handler.take_event(subscriber.id)
+        second = handler.take_event(subscriber.id)
+        _wait_for(lambda: ingest.stats().frames == 3)
+    finally:
+        sender.shutdown()
+        ingest.stop()
+
+    assert first.module_id == "mcu_2" and isinstance(first.payload, SensorDataEvent)
+    assert second.payload.code == "PUMP_ERROR"
+    stats = ingest.stats()
+    assert stats.decode_errors == 1
+    assert stats.published == 2
+
+
+def test_ingest_suppresses_unchanged_samples(channel):
+    handler = CanBusHandler()
+    subscriber = Subscriber(queue=EventQueue())
+    handler.handle_subscriber(subscriber)
+
+    ingest = CanIngest(handler, open_can_bus("virtual", channel), deadband=DeadbandFilter())
+    ingest.start()
+    sender = can.Bus(interface="virtual", channel=channel)
+    try:
+        warmer = struct.pack("<hBBHBB", 2400, 130, 90, 800, 150, 65)
+        for data in (SENSOR_FRAME, SENSOR_FRAME, SENSOR_FRAME, warmer):
+            sender.send(can.Message(arbitration_id=SENSOR_DATA_ID | 1, data=data, is_extended_id=False))
+
+        _wait_for(lambda: ingest.stats().published == 2)
+    finally:
+        sender.shutdown()
+        ingest.stop()
+
+    temperatures = [event.payload.temperature for event in subscriber.queue.get_many(10, 0)]
+    assert temperatures == pytest.approx([23.5, 24.0])
+    assert ingest.stats().suppressed == 2
+
+
+class _StuckHandler(CanBusHandler):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def publish(self, event):
+        self.release.wait()
+        return super().publish(event)
+
+
+def test_slow_publish_does_not_stall_reader(channel):
+    handler = _StuckHandler()
+    ingest = CanIngest(handler, open_can_bus("virtual", channel), handoff_capacity=4)
+    ingest.start()
+    sender = can.Bus(interface="virtual", channel=channel)
+    try:
+        for i in range(20):
+            sender.send(can.Message(arbitration_id=SENSOR_DATA_ID | 1, data=SENSOR_FRAME, is_extended_id=False))
+
+        # Reader keeps draining the socket while publish is stuck
+        _wait_for(lambda: ingest.stats().frames == 20)
+        stats = ingest.stats()
+        assert stats.dropped > 0
+    finally:
+        handler.release.set()
+        sender.shutdown()
+        ingest.stop()
+
+
+def test_refused_events_are_not_counted_as_published(channel):
+    handler = CanBusHandler()
+    handler.admission = lambda module_id: module_id != "mcu_2"
+
+    ingest = CanIngest(handler, open_can_bus("virtual", channel))
+    ingest.start()
+    sender = can.Bus(interface="virtual", channel=channel)
+    try:
+        for module in (1, 2):
+            sender.send(can.Message(arbitration_id=SENSOR_DATA_ID | module, data=SENSOR_FRAME, is_extended_id=False))
+        _wait_for(lambda: ingest.stats().frames == 2)
+    finally:
+        sender.shutdown()
+        ingest.stop()
+
+    assert ingest.stats().published == 1
+
+
+class _FlakyBus:
+    """
+    CAN bus whose link is down for the first few reads.
+    """
+
+    def __init__(self, bus, failures: int):
+        self._bus = bus
+        self.failures = failures
+
+    def recv(self, timeout=None):
+        if self.failures:
+            self.failures -= 1
+            raise can.CanOperationError("Network is down")
+        return self._bus.recv(timeout=timeout)
+
+    def shutdown(self):
+        self._bus.shutdown()
+
+
+def test_reader_retries_after_a_can_error(channel):
+    handler = CanBusHandler()
+    flaky = _FlakyBus(open_can_bus("virtual", channel), failures=2)
+    ingest = CanIngest(handler, flaky)
+    ingest.start()
+    sender = can.Bus(interface="virtual", channel=channel)
+    try:
+        sender.send(can.Message(arbitration_id=SENSOR_DATA_ID | 1, data=SENSOR_FRAME, is_extended_id=False))
+        _wait_for(lambda: ingest.stats().published == 1)
+    finally:
+        sender.shutdown()
+        ingest.stop()
+
+    assert ingest.stats().recv_errors == 2
@@ -0,0 +1,53 @@
+import pytest
+
+from domain.deadband import Deadband, DeadbandFilter
+from domain.mcu_bus import BusEvent, SensorDataEvent, AlertEvent
+
+SECOND_NS = 1_000_000_000
+
+
+def _sample(module_id: str = "mcu_1", at: float = 0.0, **changes) -> BusEvent:
+    values = dict(temperature=25.0, humidity=60.0, soil_moisture=50.0, light_level=800.0, water_level=75.0, ph_value=6.5)
+    values.update(changes)
+    return BusEvent("e", module_id, int(at * SECOND_NS), SensorDataEvent(**values))
+
+
+def test_samples_within_deadband_are_suppressed_against_last_published():
+    band = DeadbandFilter({"temperature": Deadband(absolute=0.5), "light_level": Deadband.parse("10%")}, max_silence=60)
+
+    passed = [
+        band.admit(_sample(at=0)),
+        band.admit(_sample(at=1, temperature=25.3)),
+        # Drift adds up against the last published 25.0
+        band.admit(_sample(at=2, temperature=25.6)),
+        band.admit(_sample(at=3, temperature=25.6, light_level=870)),
+        band.admit(_sample(at=4, temperature=25.6, light_level=890)),
+        # A field without a deadband reports any change
+        band.admit(_sample(at=5, temperature=25.6, light_level=890, humidity=60.1)),
+        band.admit(BusEvent("a", "mcu_1", 6 * SECOND_NS, AlertEvent("info", "OK", "ok"))),
+    ]
+
+    assert passed == [True, False, True, False, True, True, True]
+    assert (band.stats.passed, band.stats.suppressed) == (5, 2)
+    assert band.suppressed_by_module == {"mcu_1": 2}
+
+
+def test_max_silence_and_per_module_overrides():
+    band = DeadbandFilter(
+        {"temperature": Deadband(absolute=1.0)},
+        modules={"mcu_2": {"temperature": Deadband(absolute=0.1)}},
+        max_silence=30,
+    )
+
+    assert band.admit(_sample("mcu_1", at=0)) and band.admit(_sample("mcu_2", at=0))
+    assert not band.admit(_sample("mcu_1", at=10, temperature=25.5))
+    assert band.admit(_sample("mcu_2", at=10, temperature=25.5))
+
+    # Unchanged, but silent for max_silence
+    assert not band.admit(_sample("mcu_1", at=29.9))
+    assert band.admit(_sample("mcu_1", at=30))
+
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(ValueError):
+        DeadbandFilter({"wind_speed": Deadband(absolute=1.0)})
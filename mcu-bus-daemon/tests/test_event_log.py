@@ -0,0 +1,132 @@
+import builtins
+import time
+
+from domain.mcu_bus import Subscriber, BusEvent, SensorDataEvent
+from domain.replay_ring import ReplayRing
+from infrastructure.bus.can_bus_handler import CanBusHandler
+from infrastructure.persistence import segmented_event_log
+from infrastructure.persistence.segmented_event_log import SegmentedEventLog, EventLogConfig
+from infrastructure.servicer.bus_enevt_adapter import encode
+
+FAST = EventLogConfig(commit_interval=0.001)
+
+# 2026-01-01T00:00:00Z
+JAN_1_NS = 1_767_225_600 * 10 ** 9
+MINUTE_NS = 60 * 10 ** 9
+
+
+def _event(i: int, timestamp_ns: int = JAN_1_NS) -> BusEvent:
+    return BusEvent(f"e{i}", "m1", timestamp_ns, SensorDataEvent(i, 2, 3, 4, 5, 6))
+
+
+def _wait_appended(log: SegmentedEventLog, n: int) -> None:
+    deadline = time.monotonic() + 5
+    while log.appended < n and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert log.appended >= n
+
+
+def _publish(handler: CanBusHandler, n: int, **kwargs) -> None:
+    for i in range(n):
+        handler.publish(_event(i, **kwargs))
+
+
+def test_events_survive_restart_and_seq_continues(tmp_path):
+    log = SegmentedEventLog(tmp_path, FAST)
+    _publish(CanBusHandler(encoder=encode, event_log=log), 5)
+    log.close()
+
+    reopened = SegmentedEventLog(tmp_path, FAST)
+    handler = CanBusHandler(encoder=encode, event_log=reopened)
+    handler.publish(_event(5))
+    reopened.close()
+
+    assert reopened.last_seq() == 6
+    assert [e.seq for e in SegmentedEventLog(tmp_path, FAST).replay(after_seq=3)] == [4, 5, 6]
+
+
+def test_torn_tail_is_truncated_on_open(tmp_path):
+    log = SegmentedEventLog(tmp_path, FAST)
+    _publish(CanBusHandler(encoder=encode, event_log=log), 3)
+    log.close()
+
+    segment = next(tmp_path.glob("*.log"))
+    with open(segment, "ab") as f:
+        f.write(b"\x40partial")
+
+    reopened = SegmentedEventLog(tmp_path, FAST)
+    assert reopened.last_seq() == 3
+    assert [e.seq for e in reopened.replay()] == [1, 2, 3]
+    reopened.close()
+
+
+def test_zero_filled_tail_is_truncated_on_open(tmp_path):
+    log = SegmentedEventLog(tmp_path, FAST)
+    _publish(CanBusHandler(encoder=encode, event_log=log), 5)
+    log.close()
+
+    # What ext4 leaves after power loss: the size grew, the data never landed
+    segment = next(tmp_path.glob("*.log"))
+    good_size = segment.stat().st_size
+    with open(segment, "ab") as f:
+        f.write(b"\x00" * 64)
+
+    reopened = SegmentedEventLog(tmp_path, FAST)
+    assert reopened.last_seq() == 5
+    assert [e.seq for e in reopened.replay()] == [1, 2, 3, 4, 5]
+    assert segment.stat().st_size == good_size
+    reopened.close()
+
+
+def test_writer_survives_a_segment_that_fails_to_open(tmp_path, monkeypatch):
+    log = SegmentedEventLog(tmp_path, EventLogConfig(segment_bytes=1, commit_interval=0.001))
+    handler = CanBusHandler(encoder=encode, event_log=log)
+    handler.publish(_event(0))
+    _wait_appended(log, 1)
+
+    def unavailable(*args, **kwargs):
+        raise PermissionError("read-only filesystem")
+
+    monkeypatch.setattr(segmented_event_log, "open", unavailable, raising=False)
+    handler.publish(_event(1))
+    time.sleep(0.05)
+    monkeypatch.setattr(segmented_event_log, "open", builtins.open, raising=False)
+
+    handler.publish(_event(2))
+    _wait_appended(log, 2)
+    log.close()
+
+    assert [e.seq for e in SegmentedEventLog(tmp_path, FAST).replay()] == [1, 3]
+
+
+def test_segments_rotate_and_old_ones_are_deleted(tmp_path):
+    config = EventLogConfig(commit_interval=0.001, segment_bytes=200, retention_bytes=600)
+    log = SegmentedEventLog(tmp_path, config)
+    handler = CanBusHandler(encoder=encode, event_log=log)
+    for i in range(40):
+        handler.publish(_event(i))
+        # One commit per event so rotation can happen between them
+        _wait_appended(log, i + 1)
+    log.close()
+
+    segments = sorted(tmp_path.glob("*.log"))
+    replayed = [e.seq for e in SegmentedEventLog(tmp_path, config).replay()]
+
+    assert 1 < len(segments) <= 4
+    assert replayed == list(range(replayed[0], 41))
+    assert replayed[0] > 1
+
+
+def test_handler_replay_reads_log_behind_the_ring(tmp_path):
+    log = SegmentedEventLog(tmp_path, FAST)
+    handler = CanBusHandler(encoder=encode, replay_ring=ReplayRing(max_events=2), event_log=log)
+    for i in range(6):
+        handler.publish(_event(i, timestamp_ns=JAN_1_NS + i * MINUTE_NS))
+    _wait_appended(log, 6)
+
+    subscriber = Subscriber()
+    handler.handle_subscriber(subscriber)
+
+    assert [e.seq for e in handler.replay(subscriber.id, after_seq=1)] == [2, 3, 4, 5, 6]
+    assert [e.seq for e in handler.replay(subscriber.id, since_ns=JAN_1_NS + 3 * MINUTE_NS)] == [4, 5, 6]
+    log.close()
@@ -0,0 +1,81 @@
+import threading
+import time
+
+from domain.event_queue import EventQueue, OverflowPolicy
+from domain.mcu_bus import BusEvent, AlertEvent, SensorDataEvent
+
+
+def _sensor(module_id: str, value: float) -> BusEvent:
+    return BusEvent(
+        event_id=f"{module_id}-{value}",
+        module_id=module_id,
+        timestamp_ns=time.time_ns(),
+        payload=SensorDataEvent(value, 50.0, 40.0, 800.0, 70.0, 6.5),
+    )
+
+
+def _alert(module_id: str) -> BusEvent:
+    return BusEvent(
+        event_id=f"{module_id}-alert",
+        module_id=module_id,
+        timestamp_ns=time.time_ns(),
+        payload=AlertEvent("info", "SENSOR_OK", "ok"),
+    )
+
+
+def test_drop_oldest_keeps_latest_events():
+    q = EventQueue(capacity=2, policy=OverflowPolicy.DROP_OLDEST)
+
+    for i in range(5):
+        q.put(_sensor("m1", i))
+
+    assert [e.payload.temperature for e in q.get_many(10)] == [3, 4]
+    assert q.stats().dropped == 3
+
+
+def test_drop_newest_keeps_first_events():
+    q = EventQueue(capacity=2, policy=OverflowPolicy.DROP_NEWEST)
+
+    accepted = [q.put(_sensor("m1", i)) for i in range(4)]
+
+    assert accepted == [True, True, False, False]
+    assert [e.payload.temperature for e in q.get_many(10)] == [0, 1]
+    assert q.stats().dropped == 2
+
+
+def test_conflate_replaces_pending_value_per_module_and_type():
+    q = EventQueue(capacity=2, policy=OverflowPolicy.CONFLATE)
+
+    q.put(_sensor("m1", 1))
+    q.put(_alert("m1"))
+    q.put(_sensor("m1", 2))
+    q.put(_sensor("m1", 3))
+
+    events = q.get_many(10)
+    assert [type(e.payload) for e in events] == [SensorDataEvent, AlertEvent]
+    assert events[0].payload.temperature == 3
+    assert q.stats().conflated == 2
+    assert q.stats().dropped == 0
+
+
+def test_block_waits_for_consumer_then_times_out():
+    q = EventQueue(capacity=1, policy=OverflowPolicy.BLOCK, block_timeout=0.5)
+    q.put(_sensor("m1", 1))
+
+    threading.Timer(0.05, q.get).start()
+    assert q.put(_sensor("m1", 2))
+
+    started = time.monotonic()
+    q2 = EventQueue(capacity=1, policy=OverflowPolicy.BLOCK, block_timeout=0.05)
+    q2.put(_sensor("m1", 1))
+    assert not q2.put(_sensor("m1", 2))
+    assert time.monotonic() - started >= 0.05
+    assert q2.stats().block_timeouts == 1
+
+
+def test_close_wakes_waiting_consumer():
+    q = EventQueue()
+    threading.Timer(0.05, q.close).start()
+
+    assert q.get() is None
+    assert q.closed
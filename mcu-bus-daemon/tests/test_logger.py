@@ -0,0 +1,60 @@
+import logging
+import queue
+
+from pathlib import Path
+
+import pytest
+
+from infrastructure import logger
+from infrastructure.logger import NonBlockingQueueHandler, RateLimitFilter
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _record(msg: str, *args) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, None)
+
+
+def test_rate_limit_passes_a_burst_then_reports_what_it_suppressed():
+    clock = _Clock()
+    limit = RateLimitFilter(rate=2.0, burst=3, clock=clock)
+
+    passed = [limit.filter(_record("Frame %d dropped", i)) for i in range(10)]
+    assert passed == [True] * 3 + [False] * 7
+
+    # Other messages have their own bucket
+    assert limit.filter(_record("Subscriber %s gone", "s1"))
+
+    clock.now = 0.5
+    record = _record("Frame %d dropped", 10)
+    assert limit.filter(record)
+    assert record.getMessage() == "Frame 10 dropped (7 similar suppressed)"
+    assert not limit.filter(_record("Frame %d dropped", 11))
+
+
+def test_full_log_queue_drops_instead_of_blocking():
+    records = queue.Queue(2)
+    handler = NonBlockingQueueHandler(records)
+
+    for i in range(5):
+        handler.handle(_record("Event %d", i))
+
+    # Formatted by the writer thread, not here
+    first = records.get_nowait()
+    assert first.args == (0,)
+    assert handler.dropped == 3
+
+
+def test_monitor_daemon_copy_is_identical():
+    here = Path(logger.__file__)
+    copy = here.parents[3] / "monitor-daemon" / "src" / "bootstrap" / "logging.py"
+    if not copy.exists():
+        pytest.skip("monitor-daemon not checked out next to mcu-bus-daemon")
+
+    assert copy.read_bytes() == here.read_bytes(), "the logging modules diverged, apply the change to both"
@@ -0,0 +1,235 @@
+import queue
+import time
+
+from concurrent import futures
+
+import grpc
+import pytest
+
+from domain.mcu_bus import BusEvent, SensorDataEvent, AlertEvent
+from domain.replay_ring import ReplayRing
+from generated.mcubus.v1 import mcu_bus_pb2_grpc
+from application.module_registry import ModuleRegistry
+from generated.mcubus.v1.messages_pb2 import SubscribeRequest, GetLatestRequest, GetSnapshotRequest, FlowRequest
+from generated.mcubus.v1.messages_pb2 import RegisterRequest, HeartbeatRequest, UnSubscribeRequest
+from infrastructure.bus.can_bus_handler import CanBusHandler
+from infrastructure.servicer.bus_enevt_adapter import encode
+from infrastructure.servicer.mcu_bus_servicer import MCUBusServer, add_mcu_bus_servicer_to_server
+from infrastructure.servicer.module_registry_client import ModuleRegistryClient
+
+
+def _serve(**servicer_options):
+    handler = CanBusHandler(encoder=encode, replay_ring=ReplayRing())
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    add_mcu_bus_servicer_to_server(MCUBusServer(handler, **servicer_options), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+
+    channel = grpc.insecure_channel(f"127.0.0.1:{port}")
+    yield handler, mcu_bus_pb2_grpc.MCUBusServiceStub(channel)
+
+    channel.close()
+    server.stop(grace=None)
+
+
+@pytest.fixture
+def bus():
+    yield from _serve()
+
+
+@pytest.fixture
+def idle_bus():
+    yield from _serve(heartbeat_interval=0.1)
+
+
+def _wait_for_subscribers(handler, n: int):
+    deadline = time.monotonic() + 5
+    while len(handler.subscribers) != n and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(handler.subscribers) == n
+
+
+def test_subscribe_events_streams_preserialized_events(bus):
+    handler, stub = bus
+    stream = stub.SubscribeEvents(SubscribeRequest(module_ids=["m1"], event_types=["sensor_data"]))
+    _wait_for_subscribers(handler, 1)
+
+    handler.publish(BusEvent("e1", "m2", time.time_ns(), SensorDataEvent(1, 2, 3, 4, 5, 6)))
+    handler.publish(BusEvent("e2", "m1", time.time_ns(), AlertEvent("info", "OK", "ok")))
+    handler.publish(BusEvent("e3", "m1", time.time_ns(), SensorDataEvent(21.5, 2, 3, 4, 5, 6)))
+
+    event = next(stream)
+    stream.cancel()
+
+    assert event.event_id == "e3"
+    assert event.WhichOneof("payload") == "sensor_data"
+    assert event.sensor_data.temperature == pytest.approx(21.5)
+
+
+def test_unknown_event_type_is_invalid_argument(bus):
+    _, stub = bus
+
+    with pytest.raises(grpc.RpcError) as e:
+        next(stub.SubscribeEvents(SubscribeRequest(event_types=["weather"])))
+
+    assert e.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+
+def test_predicate_subscription_receives_only_matching_events(bus):
+    handler, stub = bus
+    stream = stub.SubscribeEvents(SubscribeRequest(predicate="temperature > 30"))
+    _wait_for_subscribers(handler, 1)
+
+    handler.publish(BusEvent("e1", "m1", time.time_ns(), SensorDataEvent(21.5, 2, 3, 4, 5, 6)))
+    handler.publish(BusEvent("e2", "m1", time.time_ns(), AlertEvent("critical", "HOT", "hot")))
+    handler.publish(BusEvent("e3", "m2", time.time_ns(), SensorDataEvent(31.5, 2, 3, 4, 5, 6)))
+
+    event = next(stream)
+    stream.cancel()
+
+    assert event.event_id == "e3"
+
+    with pytest.raises(grpc.RpcError) as e:
+        next(stub.SubscribeEvents(SubscribeRequest(predicate="temperature > 'hot'")))
+    assert e.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+
+def test_subscribe_event_batches_fills_up_to_max_batch_size(bus):
+    handler, stub = bus
+    stream = stub.SubscribeEventBatches(SubscribeRequest(max_batch_size=3, max_linger_ms=200))
+    _wait_for_subscribers(handler, 1)
+
+    for i in range(5):
+        handler.publish(BusEvent(f"e{i}", "m1", time.time_ns(), SensorDataEvent(i, 2, 3, 4, 5, 6)))
+
+    first, second = next(stream), next(stream)
+    stream.cancel()
+
+    assert [e.event_id for e in first.events] == ["e0", "e1", "e2"]
+    assert [e.event_id for e in second.events] == ["e3", "e4"]
+
+
+def test_resume_after_seq_replays_missed_events_before_live_ones(bus):
+    handler, stub = bus
+    for i in range(4):
+        handler.publish(BusEvent(f"e{i}", "m1", time.time_ns(), SensorDataEvent(i, 2, 3, 4, 5, 6)))
+
+    stream = stub.SubscribeEvents(SubscribeRequest(resume_after_seq=2))
+    _wait_for_subscribers(handler, 1)
+    handler.publish(BusEvent("live", "m1", time.time_ns(), SensorDataEvent(9, 2, 3, 4, 5, 6)))
+
+    events = [next(stream) for _ in range(3)]
+    stream.cancel()
+
+    assert [(e.seq, e.event_id) for e in events] == [(3, "e2"), (4, "e3"), (5, "live")]
+
+
+def test_flow_stream_sends_only_as_many_events_as_credits(bus):
+    handler, stub = bus
+    requests = queue.Queue()
+    requests.put(FlowRequest(subscribe=SubscribeRequest(module_ids=["m1"]), credits=2))
+    stream = stub.SubscribeEventsFlow(iter(requests.get, None))
+    _wait_for_subscribers(handler, 1)
+
+    for i in range(5):
+        handler.publish(BusEvent(f"e{i}", "m1", time.time_ns(), SensorDataEvent(i, 2, 3, 4, 5, 6)))
+
+    received = [next(stream).event_id for _ in range(2)]
+    time.sleep(0.2)
+    (stats,) = handler.subscriber_stats().values()
+
+    # Out of credits: the rest waits in the subscriber queue
+    assert received == ["e0", "e1"]
+    assert (stats.enqueued, stats.delivered) == (5, 2)
+
+    requests.put(FlowRequest(credits=3))
+    received += [next(stream).event_id for _ in range(3)]
+    requests.put(None)
+    stream.cancel()
+
+    assert received == ["e0", "e1", "e2", "e3", "e4"]
+
+
+def test_flow_stream_without_subscribe_is_invalid_argument(bus):
+    _, stub = bus
+
+    with pytest.raises(grpc.RpcError) as e:
+        next(stub.SubscribeEventsFlow(iter([FlowRequest(credits=10)])))
+
+    assert e.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+
+def test_get_latest_and_snapshot_return_newest_value_per_kind(bus):
+    handler, stub = bus
+    handler.publish(BusEvent("old", "m1", time.time_ns(), SensorDataEvent(1, 2, 3, 4, 5, 6)))
+    handler.publish(BusEvent("alert", "m1", time.time_ns(), AlertEvent("info", "OK", "ok")))
+    handler.publish(BusEvent("new", "m1", time.time_ns(), SensorDataEvent(2, 2, 3, 4, 5, 6)))
+    handler.publish(BusEvent("other", "m2", time.time_ns(), SensorDataEvent(3, 2, 3, 4, 5, 6)))
+
+    latest = stub.GetLatest(GetLatestRequest(module_ids=["m1", "unknown"]))
+    snapshot = stub.GetSnapshot(GetSnapshotRequest())
+
+    assert [e.event_id for e in latest.events] == ["alert", "new"]
+    assert latest.events[1].sensor_data.temperature == pytest.approx(2)
+    assert [e.event_id for e in snapshot.events] == ["alert", "new", "other"]
+    assert snapshot.last_seq == 4
+
+
+def test_idle_streams_send_heartbeats(idle_bus):
+    handler, stub = idle_bus
+    handler.publish(BusEvent("e1", "m1", time.time_ns(), SensorDataEvent(1, 2, 3, 4, 5, 6)))
+    events = stub.SubscribeEvents(SubscribeRequest())
+    batches = stub.SubscribeEventBatches(SubscribeRequest())
+
+    heartbeat, batch = next(events), next(batches)
+    events.cancel()
+    batches.cancel()
+
+    assert heartbeat.WhichOneof("payload") is None
+    assert heartbeat.seq == 1
+    assert not batch.events
+
+
+def test_cancelled_idle_stream_releases_its_worker(idle_bus):
+    handler, stub = idle_bus
+    streams = [stub.SubscribeEvents(SubscribeRequest()) for _ in range(4)]
+    _wait_for_subscribers(handler, 4)
+
+    for stream in streams:
+        stream.cancel()
+    _wait_for_subscribers(handler, 0)
+
+    # All four workers are free again for a new stream
+    stream = stub.SubscribeEvents(SubscribeRequest())
+    _wait_for_subscribers(handler, 1)
+    handler.publish(BusEvent("e1", "m1", time.time_ns(), SensorDataEvent(1, 2, 3, 4, 5, 6)))
+    event = next(e for e in stream if e.WhichOneof("payload"))
+    stream.cancel()
+
+    assert event.event_id == "e1"
+
+
+def test_worker_forwards_module_registration_to_the_ingest_registry():
+    # The ingest process' side: the one registry, behind its loopback server
+    modules = ModuleRegistry(CanBusHandler(encoder=encode))
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    add_mcu_bus_servicer_to_server(MCUBusServer(modules.bus_handler, module_registry=modules), server)
+    target = f"127.0.0.1:{server.add_insecure_port('127.0.0.1:0')}"
+    server.start()
+
+    client = ModuleRegistryClient(target)
+    worker = _serve(module_registry=client)
+    _, stub = next(worker)
+    try:
+        reply = stub.Register(RegisterRequest(module_id="mcu_7", module_type="sensor_node", lease_ms=5000))
+        assert reply.success and reply.assigned_id == "mcu_7" and reply.lease_ms == 5000
+        assert [lease.module_type for lease in modules.modules()] == ["sensor_node"]
+
+        assert stub.Heartbeat(HeartbeatRequest(module_id="mcu_7")).success
+        assert stub.UnRegister(UnSubscribeRequest(module_id="mcu_7")).success
+        assert not stub.Heartbeat(HeartbeatRequest(module_id="mcu_7")).success
+        assert len(modules) == 0
+    finally:
+        next(worker, None)
+        client.stop()
+        server.stop(grace=None)
@@ -0,0 +1,72 @@
+import time
+import urllib.request
+
+from domain.event_queue import EventQueue
+from domain.mcu_bus import Subscriber, BusEvent, SensorDataEvent, AlertEvent
+from domain.metrics import MetricsRegistry
+from infrastructure.bus.can_bus_handler import CanBusHandler
+from infrastructure.metrics_server import start_metrics_server
+from infrastructure.servicer.bus_enevt_adapter import encode
+
+
+def test_render_text_exposition_format():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests", ("path",)).labels('/a"b').inc(3)
+    registry.gauge("depth", "Depth").set(2.5)
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value)
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{path="/a\\"b"} 3' in lines
+    assert "depth 2.5" in lines
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1"} 2' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in lines
+    assert "latency_seconds_sum 5.55" in lines
+    assert "latency_seconds_count 3" in lines
+
+
+def test_bus_handler_reports_publish_and_subscriber_metrics():
+    registry = MetricsRegistry()
+    handler = CanBusHandler(encoder=encode, metrics=registry)
+    kept = Subscriber(queue=EventQueue())
+    gone = Subscriber(queue=EventQueue(capacity=1))
+    handler.handle_subscriber(kept)
+    handler.handle_subscriber(gone)
+
+    handler.publish(BusEvent("e1", "m1", time.time_ns(), SensorDataEvent(1, 2, 3, 4, 5, 6)))
+    handler.publish(BusEvent("e2", "m1", time.time_ns(), AlertEvent("info", "OK", "ok")))
+    handler.remove_subscriber(gone.id)
+    handler.take_event(kept.id)
+
+    lines = registry.render().splitlines()
+
+    assert 'mcubus_events_published_total{type="sensor_data"} 1' in lines
+    assert 'mcubus_events_published_total{type="alert"} 1' in lines
+    assert "mcubus_subscribers_added_total 2" in lines
+    assert "mcubus_subscribers_removed_total 1" in lines
+    assert "mcubus_subscribers 1" in lines
+    assert f'mcubus_subscriber_queue_depth{{subscriber="{kept.id}"}} 1' in lines
+    assert "mcubus_events_dropped_total 1" in lines
+    assert "mcubus_publish_seconds_count 2" in lines
+    assert "mcubus_encode_seconds_count 2" in lines
+    assert "mcubus_take_event_wait_seconds_count 1" in lines
+
+
+def test_metrics_endpoint_serves_registry():
+    registry = MetricsRegistry()
+    registry.counter("up_total", "Up").inc()
+    server = start_metrics_server(registry, 0, host="127.0.0.1")
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            body = response.read().decode()
+            content_type = response.headers["Content-Type"]
+    finally:
+        server.shutdown()
+
+    assert "up_total 1" in body.splitlines()
+    assert content_type.startswith("text/plain")
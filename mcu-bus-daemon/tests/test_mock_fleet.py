@@ -0,0 +1,27 @@
+from mock_fleet import FleetConfig, VirtualFleet, HIGH, LIGHT, LOW
+
+
+def test_fleet_step_stays_within_bounds_and_light_follows_the_sun():
+    fleet = VirtualFleet(FleetConfig(modules=500, tick=600.0, seed=3))
+
+    readings = [fleet.step() for _ in range(144)]
+
+    assert all(r.shape == (500, 6) for r in readings)
+    assert all((r >= LOW).all() and (r <= HIGH).all() for r in readings)
+    # Midnight is dark, noon is not
+    assert readings[-1][:, LIGHT].mean() < 50
+    assert readings[71][:, LIGHT].mean() > 500
+
+
+def test_failed_modules_alert_and_stop_reporting():
+    fleet = VirtualFleet(FleetConfig(modules=200, failure_rate=0.5, recovery_rate=0.0, seed=1))
+
+    events = fleet.tick_events()
+    readings = [e for e in events if e.WhichOneof("payload") == "sensor_data"]
+    alerts = [e for e in events if e.WhichOneof("payload") == "alert"]
+
+    assert len(alerts) == fleet.failed > 0
+    assert {a.alert.code for a in alerts} == {"SENSOR_FAIL"}
+    assert len(readings) == 200 - fleet.failed
+    assert not {a.module_id for a in alerts} & {r.module_id for r in readings}
+    assert readings[0].timestamp == alerts[-1].timestamp
@@ -0,0 +1,99 @@
+import random
+import time
+
+from application.module_registry import ModuleRegistry, OFFLINE_ALERT_CODE
+from domain.event_queue import EventQueue
+from domain.mcu_bus import Subscriber, BusEvent, SensorDataEvent
+from domain.timing_wheel import TimingWheel
+from generated.mcubus.v1.messages_pb2 import RegisterRequest, HeartbeatRequest, UnSubscribeRequest
+from infrastructure.bus.can_bus_handler import CanBusHandler
+from infrastructure.servicer.mcu_bus_servicer import register_module, renew_module, unregister_module
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _sensor(module_id: str) -> BusEvent:
+    return BusEvent(f"{module_id}_e", module_id, time.time_ns(), SensorDataEvent(1, 2, 3, 4, 5, 6))
+
+
+def _drain(subscriber: Subscriber) -> list:
+    return subscriber.queue.get_many(1024, 0)
+
+
+def test_timing_wheel_fires_every_timer_on_its_tick():
+    random.seed(3)
+    wheel = TimingWheel(tick=1.0, start=0.0, slots=8, levels=2)
+    due = {}
+    for item in range(500):
+        # Most within range, some past it (cascaded again from the top level)
+        deadline = random.uniform(0, 150)
+        wheel.schedule(item, deadline)
+        due[item] = max(int(-(-deadline // 1)), 1)
+
+    for now in range(1, 160):
+        fired = wheel.advance(now)
+        assert sorted(fired) == sorted(item for item, tick in due.items() if tick == now)
+
+    assert len(wheel) == 0
+
+
+def test_silent_module_expires_with_offline_alert_and_is_no_longer_routed():
+    clock = FakeClock()
+    handler = CanBusHandler()
+    modules = ModuleRegistry(handler, default_lease=5.0, tick=0.5, clock=clock)
+    subscriber = Subscriber(queue=EventQueue())
+    handler.handle_subscriber(subscriber)
+
+    modules.register("mcu_1", "sensor_node")
+    modules.register("mcu_2", "sensor_node")
+
+    # Traffic keeps mcu_1 alive, a heartbeat keeps mcu_2 alive, for a while
+    for _ in range(4):
+        clock.now += 2.0
+        assert modules.expire() == []
+        handler.publish(_sensor("mcu_1"))
+        modules.heartbeat("mcu_2")
+
+    clock.now += 4.0
+    assert modules.expire() == []
+    handler.publish(_sensor("mcu_1"))
+    clock.now += 2.0
+    assert modules.expire() == ["mcu_2"]
+    assert [m.module_id for m in modules.modules()] == ["mcu_1"]
+
+    events = _drain(subscriber)
+    alert = events[-1]
+    assert alert.module_id == "mcu_2"
+    assert alert.payload.code == OFFLINE_ALERT_CODE
+    assert [e.payload.code for e in handler.latest(["mcu_2"])[0]] == [OFFLINE_ALERT_CODE]
+
+    # Offline: dropped until it registers again, unknown modules pass
+    handler.publish(_sensor("mcu_2"))
+    handler.publish(_sensor("can_node"))
+    assert [e.module_id for e in _drain(subscriber)] == ["can_node"]
+
+    modules.register("mcu_2")
+    handler.publish(_sensor("mcu_2"))
+    assert [e.module_id for e in _drain(subscriber)] == ["mcu_2"]
+
+
+def test_register_heartbeat_and_unregister_replies():
+    modules = ModuleRegistry(CanBusHandler(), default_lease=30.0, max_lease=60.0)
+
+    assigned = register_module(modules, RegisterRequest(module_type="sensor_node"))
+    requested = register_module(modules, RegisterRequest(module_id="mcu_7", metadata={"fw": "1.2"}, lease_ms=900_000))
+
+    assert assigned.success and assigned.assigned_id.startswith("module_")
+    assert assigned.lease_ms == 30_000
+    assert requested.assigned_id == "mcu_7" and requested.lease_ms == 60_000
+    assert renew_module(modules, HeartbeatRequest(module_id="mcu_7")).success
+
+    assert unregister_module(modules, UnSubscribeRequest(module_id="mcu_7")).success
+    assert not unregister_module(modules, UnSubscribeRequest(module_id="mcu_7")).success
+    assert not renew_module(modules, HeartbeatRequest(module_id="mcu_7")).success
@@ -0,0 +1,41 @@
+import pytest
+
+from domain.mcu_bus import SensorDataEvent, AlertEvent
+from domain.predicate import compile_predicate
+
+
+def test_predicate_compiles_to_a_normalized_shared_filter():
+    hot = compile_predicate("temperature>30 and (humidity < 40 or not ph_value == 7)")
+
+    assert hot.source == "temperature > 30 and (humidity < 40 or not ph_value == 7)"
+    assert hot == compile_predicate("temperature > 30 and (humidity<40 or not ph_value==7)")
+    assert hot.kinds == {"sensor_data"}
+    assert hot(SensorDataEvent(31, 60, 1, 1, 1, 6.5))
+    assert not hot(SensorDataEvent(31, 60, 1, 1, 1, 7))
+    assert not hot(AlertEvent("critical", "HIGH_TEMP", "hot"))
+
+    critical = compile_predicate('severity == "critical"')
+    assert critical.kinds == {"alert"}
+    assert critical(AlertEvent("critical", "PUMP_ERROR", "pump"))
+    assert compile_predicate("-5 < temperature <= 3.5")(SensorDataEvent(0, 1, 1, 1, 1, 1))
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "temperature >",
+        "foo > 1",
+        "temperature",
+        "temperature + 1 > 2",
+        "__import__('os').system('true') == 0",
+        "1 < 2",
+        "severity > 3",
+        'temperature > 30 and severity == "critical"',
+        'reason == -"x"',
+        "is_active == -True",
+        "temperature > --1",
+    ],
+)
+def test_invalid_predicates_are_rejected(text):
+    with pytest.raises(ValueError):
+        compile_predicate(text)
@@ -0,0 +1,120 @@
+import builtins
+import time
+
+from domain.event_queue import EventQueue
+from domain.mcu_bus import Subscriber, BusEvent, SensorDataEvent
+from infrastructure.bus.can_bus_handler import CanBusHandler
+from infrastructure.bus.ring_bus import RingBusHandler, RingRelay
+from infrastructure.bus import shm_ring
+from infrastructure.bus.shm_ring import SharedEventRing
+from infrastructure.servicer.bus_enevt_adapter import decode, encode
+
+
+def _sensor(module_id: str, value: float) -> BusEvent:
+    return BusEvent(
+        event_id=f"{module_id}-{value}",
+        module_id=module_id,
+        timestamp_ns=time.time_ns(),
+        payload=SensorDataEvent(value, 50.0, 40.0, 800.0, 70.0, 6.5),
+    )
+
+
+def test_reader_sees_records_across_the_wrap():
+    ring = SharedEventRing.create(256)
+    try:
+        reader = SharedEventRing.attach(ring.name).reader()
+        seen = []
+        for seq in range(1, 41):
+            ring.append(seq, bytes([seq]) * (seq % 13 + 1))
+            seen.extend(reader.read())
+
+        assert [seq for seq, _ in seen] == list(range(1, 41))
+        assert all(payload == bytes([seq]) * (seq % 13 + 1) for seq, payload in seen)
+        assert reader.lost == 0
+    finally:
+        ring.close()
+
+
+def test_lapped_reader_skips_ahead_and_counts_lost():
+    ring = SharedEventRing.create(256)
+    try:
+        reader = ring.reader()
+        for seq in range(1, 101):
+            ring.append(seq, b"x" * 16)
+        assert reader.read() == []
+
+        ring.append(101, b"y")
+        ring.append(102, b"z")
+        assert reader.read() == [(101, b"y"), (102, b"z")]
+        assert reader.lost == 100
+    finally:
+        ring.close()
+
+
+class _Unpublished:
+    """
+    Write position that never gets published, as if the writer were paused
+    after writing a record and before announcing it.
+    """
+
+    def __init__(self, real):
+        self._real = real
+
+    def pack_into(self, *args) -> None:
+        ...
+
+    def unpack_from(self, *args):
+        return self._real.unpack_from(*args)
+
+
+def test_reader_drops_a_record_the_writer_overwrites_while_it_is_copied(monkeypatch):
+    ring = SharedEventRing.create(256)
+    try:
+        reader = ring.reader()
+        # Four 64 byte records fill the ring, the oldest is still unread
+        for seq in range(1, 5):
+            ring.append(seq, bytes([seq]) * 40)
+
+        def lap_then_copy(data):
+            # Checks passed, now the writer starts over the first record
+            monkeypatch.undo()
+            monkeypatch.setattr(shm_ring, "_WRITE_POS", _Unpublished(shm_ring._WRITE_POS))
+            ring.append(5, b"\xff" * 40)
+            monkeypatch.undo()
+            return builtins.bytes(data)
+
+        monkeypatch.setattr(shm_ring, "bytes", lap_then_copy, raising=False)
+        records = reader.read()
+
+        assert records == [(seq, bytes([seq]) * 40) for seq in range(2, 5)]
+        assert reader.lost == 1
+    finally:
+        ring.close()
+
+
+def test_relay_serves_ingest_events_in_a_worker_handler():
+    ring = SharedEventRing.create(64 * 1024)
+    try:
+        ingest = RingBusHandler(ring, encoder=encode)
+        worker = CanBusHandler(encoder=encode)
+        subscriber = Subscriber(queue=EventQueue(), module_ids={"m1"})
+        worker.handle_subscriber(subscriber)
+        relay = RingRelay(worker, SharedEventRing.attach(ring.name), decode)
+        relay.start()
+
+        ingest.publish(_sensor("m2", 1.0))
+        ingest.publish(_sensor("m1", 2.0))
+
+        events = subscriber.queue.get_many(10, timeout=2.0)
+        relay.stop()
+        assert len(events) == 1
+        event = events[0]
+
+        # Seq and bytes as the ingest process assigned them
+        assert event.seq == 2
+        assert event.wire == encode(event)
+        assert event.payload.temperature == 2.0
+        assert relay.relayed == 2
+        assert worker.latest(["m2"])[0][0].seq == 1
+    finally:
+        ring.close()
@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import random
+
+from application.monitor_service import MonitorService
+
+logger = logging.getLogger(__name__)
+
+
+class MonitorPoller:
+    """
+    Polls the monitor service in the background, each sensor on its own
+    interval, so HTTP handlers only ever read the snapshot. Sensor reads
+    run in a worker thread, never on the event loop. Jitter spreads sensors
+    sharing an interval apart over time instead of reading them in bursts.
+    """
+
+    def __init__(
+            self,
+            service: MonitorService,
+            interval: float = 2.0,
+            intervals: dict[str, float] | None = None,
+            jitter: float = 0.1,
+            rng: random.Random | None = None,
+    ):
+        intervals = intervals or {}
+        if any(i <= 0 for i in (interval, *intervals.values())):
+            raise ValueError("Poll intervals must be positive")
+        if not 0 <= jitter < 1:
+            raise ValueError("Jitter must be a fraction of the interval, in [0, 1)")
+
+        self._service = service
+        self._interval = interval
+        self._intervals = intervals
+        self._jitter = jitter
+        self._rng = rng or random.Random()
+        self._task: asyncio.Task | None = None
+
+    def interval(self, sensor_id: str) -> float:
+        """
+        Seconds until the sensor's next read, its interval give or take the jitter.
+        """
+        interval = self._intervals.get(sensor_id, self._interval)
+        return interval * (1 + self._rng.uniform(-self._jitter, self._jitter))
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        due_at: dict[str, float] = {}
+
+        while True:
+            now = loop.time()
+            # Sensors come and go with their modules, new ones are due at once
+            due_at = {sid: due_at.get(sid, now) for sid in self._service.sensor_ids()}
+            due = {sid for sid, at in due_at.items() if at <= now}
+
+            if due:
+                try:
+                    await asyncio.to_thread(self._service.poll, due)
+                except Exception:
+                    logger.exception("Polling %s failed", sorted(due))
+                now = loop.time()
+                for sid in due:
+                    due_at[sid] = now + self.interval(sid)
+
+            wake_at = min(due_at.values(), default=now + self._interval)
+            await asyncio.sleep(max(wake_at - loop.time(), 0))
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(), name="monitor-poller")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
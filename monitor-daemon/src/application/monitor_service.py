@@ -1,3 +1,5 @@
+import asyncio
+import math
 import time
 import threading
 
@@ -8,23 +10,76 @@ from domain.module import SensorModule
 class MonitorService:
     def __init__(self, modules: list[SensorModule]):
         self._lock = threading.Lock()
+        # Sensors share buses, reads go one at a time; snapshot never waits on them
+        self._read_lock = threading.Lock()
         self._modules = modules
         self._latest: dict[str, SensorReading] = {}
         self._updated_at: float | None = None
+        # Monotonic time each sensor was last polled, read or failed, for freshness
+        self._polled_at: dict[str, float] = {}
+        # The on-demand poll in flight, joined by every request arriving meanwhile
+        self._refresh: asyncio.Future | None = None
 
     def add_module(self, module: SensorModule):
         with self._lock:
             self._modules.append(module)
 
-    def poll(self):
+    def sensor_ids(self) -> list[str]:
         with self._lock:
-            for module in self._modules:
+            modules = list(self._modules)
+        return [sid for module in modules if module.is_online() for sid in module.get_sensor_ids()]
+
+    def poll(self, sensor_ids: set[str] | None = None):
+        """
+        Read the given sensors, or all of them, into the snapshot.
+        Blocks on sensor I/O, run it off the event loop.
+        """
+        with self._lock:
+            modules = list(self._modules)
+
+        readings, polled = [], []
+        with self._read_lock:
+            for module in modules:
                 if not module.is_online():
                     continue
-                for reading in module.read_all():
-                    self._latest[reading.sensor_id] = reading
+                if sensor_ids is None:
+                    readings.extend(module.read_all())
+                    polled.extend(module.get_sensor_ids())
+                else:
+                    readings.extend(module.read_sensors(sensor_ids))
+                    polled.extend(sid for sid in module.get_sensor_ids() if sid in sensor_ids)
+
+        polled_at = time.monotonic()
+        with self._lock:
+            for reading in readings:
+                self._latest[reading.sensor_id] = reading
+            # A failed sensor counts as polled too, it would not answer a new poll either
+            for sid in polled:
+                self._polled_at[sid] = polled_at
             self._updated_at = time.time()
 
+    def age(self) -> float:
+        """
+        Seconds since the least recently polled sensor was polled, inf if one never was.
+        """
+        sensor_ids = self.sensor_ids()
+        now = time.monotonic()
+        with self._lock:
+            return max((now - self._polled_at.get(sid, -math.inf) for sid in sensor_ids), default=0.0)
+
+    async def refresh(self, max_age: float = 0.0) -> dict:
+        """
+        Snapshot with no reading older than max_age seconds, polling only if
+        needed. Concurrent callers share one poll: sensor transactions do not
+        grow with the number of requests.
+        """
+        if self.age() > max_age:
+            if self._refresh is None or self._refresh.done():
+                self._refresh = asyncio.ensure_future(asyncio.to_thread(self.poll))
+            # A cancelled request must not cancel the poll others wait for
+            await asyncio.shield(self._refresh)
+        return self.snapshot()
+
     def snapshot(self) -> dict:
         with self._lock:
             return {
@@ -34,6 +89,7 @@ class MonitorService:
                         "type": r.sensor_type.value,
                         "value": r.value,
                         "unit": r.unit,
+                        "timestamp": r.timestamp,
                     }
                     for sid, r in self._latest.items()
                 },
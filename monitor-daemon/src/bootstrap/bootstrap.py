@@ -4,7 +4,7 @@ from bootstrap.clients import init_clients, shoutdown_clients
 from bootstrap.context import AppContext
 from bootstrap.database import init_database, shout_database
 from bootstrap.logging import setup_logging
-from bootstrap.services import init_services
+from bootstrap.services import init_services, start_services, shutdown_services
 
 
 async def bootstrap() -> AppContext:
@@ -20,6 +20,9 @@ async def bootstrap() -> AppContext:
     # Initialize services
     services = await init_services()
 
+    # Background polling, requests only read the snapshot
+    await start_services(services)
+
     return AppContext(
         db=db,
         clients=clients,
@@ -28,5 +31,6 @@ async def bootstrap() -> AppContext:
 
 
 async def shutdown(ctx: AppContext) -> None:
+    await shutdown_services(ctx.services)
     await shout_database(ctx.db)
     await shoutdown_clients(ctx.clients)
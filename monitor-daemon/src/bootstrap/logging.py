@@ -1,9 +1,110 @@
+"""
+Non-blocking, rate-limited logging setup shared by both daemons.
+Kept as two identical copies, mcu-bus-daemon/src/infrastructure/logger.py
+and monitor-daemon/src/bootstrap/logging.py: change both together,
+mcu-bus-daemon's test_logger fails while they differ.
+"""
+import atexit
 import logging
+import queue
+import threading
+import time
+
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Dict, Optional
 
 from pythonjsonlogger.json import JsonFormatter
 
+# Records waiting for the writer thread, more are dropped instead of waited for
+DEFAULT_QUEUE_SIZE = 10_000
+
+# Distinct messages a RateLimitFilter keeps buckets for before starting over
+MAX_BUCKETS = 1024
+
+_listener: Optional[QueueListener] = None
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to the writer thread as they are. Message args are merged
+    by the formatter there, so logged args must not be mutated afterwards.
+    A full queue drops the record rather than stalling the caller.
+    """
+
+    def __init__(self, records: queue.Queue):
+        super().__init__(records)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per message template: `rate` records a second pass, in
+    bursts of up to `burst`. The next record let through reports how many
+    were suppressed in between.
+    """
+
+    def __init__(self, rate: float, burst: int = 10, clock: Callable[[], float] = time.monotonic):
+        super().__init__()
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._lock = threading.Lock()
+        # msg -> [tokens, last refill, suppressed]
+        self._buckets: Dict[object, list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        now = self._clock()
+        with self._lock:
+            bucket = self._buckets.get(record.msg)
+            if bucket is None:
+                if len(self._buckets) >= MAX_BUCKETS:
+                    self._buckets.clear()
+                bucket = self._buckets[record.msg] = [self.burst, now, 0]
+            else:
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+
+            bucket[0] -= 1
+            suppressed, bucket[2] = bucket[2], 0
+
+        if suppressed:
+            # Rare, formatting this one record here is fine
+            record.msg = f"{record.getMessage()} ({suppressed} similar suppressed)"
+            record.args = None
+            record.suppressed = suppressed
+        return True
+
+
+def setup_logging(
+        level: int = logging.INFO,
+        json_output: bool = True,
+        rate_limits: Optional[Dict[str, float]] = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+) -> NonBlockingQueueHandler:
+    """
+    Log through a bounded queue to a writer thread, so a stalled stderr
+    (SD card, journald) never stalls the threads that log.
+    :param rate_limits: logger name -> records per second for each of its messages
+    :param queue_size: records buffered for the writer thread
+    :return: the handler on the root logger, its dropped count included
+    """
+    global _listener
 
-def setup_logging(level: int = logging.INFO, json_output: bool = True):
     handler = logging.StreamHandler()
 
     if json_output:
@@ -17,7 +118,37 @@ def setup_logging(level: int = logging.INFO, json_output: bool = True):
 
     handler.setFormatter(formatter)
 
+    # Set up again: flush and replace the previous writer thread
+    if _listener is not None:
+        _listener.stop()
+
+    records = queue.Queue(queue_size)
+    queue_handler = NonBlockingQueueHandler(records)
+    _listener = QueueListener(records, handler)
+    _listener.start()
+
     logging.basicConfig(
         level=level,
-        handlers=[handler]
+        handlers=[queue_handler],
+        force=True,
     )
+
+    for name, rate in (rate_limits or {}).items():
+        limited = logging.getLogger(name)
+        for previous in [f for f in limited.filters if isinstance(f, RateLimitFilter)]:
+            limited.removeFilter(previous)
+        limited.addFilter(RateLimitFilter(rate))
+
+    return queue_handler
+
+
+@atexit.register
+def stop_logging() -> None:
+    """
+    Write out what is still queued.
+    """
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
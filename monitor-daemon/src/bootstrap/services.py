@@ -1,40 +1,76 @@
 import os
-import time
 
+from application.monitor_poller import MonitorPoller
 from application.monitor_service import MonitorService
 from infrastructure.module.local_module import LocalSensorModule
 from infrastructure.sensor.mock import MockTemperatureSensor, MockHumiditySensor
 from infrastructure.sensor.sht31 import SHT31Device, SHT31TemperatureSensor, SHT31HumiditySensor
 
-POLL_INTERVAL = 2.0
+# Seconds between reads of a sensor, and per sensor id overrides: "sht31-humidity-sensor=10,..."
+POLL_INTERVAL = float(os.getenv("POLL_INTERVAL", "2.0"))
+POLL_INTERVALS = os.getenv("POLL_INTERVALS", "")
+
+# Fraction of the interval each read is moved by at random
+POLL_JITTER = float(os.getenv("POLL_JITTER", "0.1"))
+
+# Seconds one SHT31 measurement serves both its temperature and humidity sensors
+SHT31_MAX_AGE = float(os.getenv("SHT31_MAX_AGE", "1.0"))
+
+# "single" measures on every read, "periodic" lets the chip measure SHT31_FREQUENCY times a second
+SHT31_MODE = os.getenv("SHT31_MODE", "single")
+SHT31_FREQUENCY = float(os.getenv("SHT31_FREQUENCY", "2"))
 
 
 class Services:
-    def __init__(self, monitor_service: MonitorService):
+    def __init__(self, monitor_service: MonitorService, monitor_poller: MonitorPoller):
         self.monitor_service = monitor_service
+        self.monitor_poller = monitor_poller
 
 
 async def init_services() -> Services:
     local_modules = build_local_module()
+    monitor_service = MonitorService([local_modules])
 
     return Services(
-        monitor_service=MonitorService([local_modules])
+        monitor_service=monitor_service,
+        monitor_poller=MonitorPoller(
+            monitor_service,
+            interval=POLL_INTERVAL,
+            intervals=parse_intervals(POLL_INTERVALS),
+            jitter=POLL_JITTER,
+        ),
     )
 
 
-def start_polling(service: MonitorService):
-    while True:
-        service.poll()
-        time.sleep(POLL_INTERVAL)
+async def start_services(services: Services) -> None:
+    services.monitor_poller.start()
+
+
+async def shutdown_services(services: Services) -> None:
+    await services.monitor_poller.stop()
+
+
+def parse_intervals(text: str) -> dict[str, float]:
+    """
+    "sensor_id=seconds,..." into {sensor_id: seconds}
+    """
+    intervals = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        sensor_id, sep, seconds = item.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid poll interval {item!r}, expected sensor_id=seconds")
+        intervals[sensor_id.strip()] = float(seconds)
+    return intervals
 
 
 def build_local_module():
     runtime = os.getenv("RUNTIME_ENV", "mock")
+    backend = os.getenv("SENSOR_BACKEND", "")
 
     module = LocalSensorModule()
 
-    if runtime == "rasp":
-        device = SHT31Device()
+    if runtime == "rasp" or backend in ("rasp", "sht31"):
+        device = SHT31Device(max_age=SHT31_MAX_AGE, mode=SHT31_MODE, frequency=SHT31_FREQUENCY)
         module.add_sensor(SHT31TemperatureSensor(device))
         module.add_sensor(SHT31HumiditySensor(device))
 
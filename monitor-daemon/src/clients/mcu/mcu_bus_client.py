@@ -5,6 +5,11 @@ from generated.mcubus.v1.messages_pb2 import SubscribeRequest
 
 
 class MCUBusClient:
+    """
+    Event streams of the mcu-bus daemon. Idle streams carry heartbeats,
+    an event without payload or an empty batch, consumers never see them.
+    """
+
     def __init__(self, channel: grpc.aio.Channel):
         self._stub = mcu_bus_pb2_grpc.MCUBusServiceStub(channel)
 
@@ -12,4 +17,14 @@ class MCUBusClient:
         async for event in self._stub.SubscribeEvents(
                 SubscribeRequest()
         ):
+            if event.WhichOneof("payload") is None:
+                continue
             yield event
+
+    async def subscribe_event_batches(self):
+        async for batch in self._stub.SubscribeEventBatches(
+                SubscribeRequest()
+        ):
+            if not batch.events:
+                continue
+            yield batch
@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import Protocol, runtime_checkable
-from sensor import Sensor, SensorReading
+from domain.sensor import Sensor, SensorReading
 
 
 class ModuleType(Enum):
@@ -51,5 +51,8 @@ class SensorModule(Protocol):
     def read_all(self) -> list[SensorReading]:
         ...
 
+    def read_sensors(self, sensor_ids: set[str]) -> list[SensorReading]:
+        ...
+
     def is_online(self) -> bool:
         ...
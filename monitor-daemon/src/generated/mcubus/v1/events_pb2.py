@@ -25,7 +25,7 @@ _sym_db = _symbol_database.Default()
 from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x16mcubus/v1/events.proto\x12\tmcubus.v1\x1a\x1fgoogle/protobuf/timestamp.proto\"\xf3\x01\n\x08\x42usEvent\x12\x10\n\x08\x65vent_id\x18\x01 \x01(\t\x12\x11\n\tmodule_id\x18\x02 \x01(\t\x12-\n\ttimestamp\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12,\n\x0bsensor_data\x18\n \x01(\x0b\x32\x15.mcubus.v1.SensorDataH\x00\x12\x32\n\x0e\x63ontrol_status\x18\x0b \x01(\x0b\x32\x18.mcubus.v1.ControlStatusH\x00\x12&\n\x05\x61lert\x18\x0c \x01(\x0b\x32\x15.mcubus.v1.AlertEventH\x00\x42\t\n\x07payload\"\x86\x01\n\nSensorData\x12\x13\n\x0btemperature\x18\x01 \x01(\x02\x12\x10\n\x08humidity\x18\x02 \x01(\x02\x12\x15\n\rsoil_moisture\x18\x03 \x01(\x02\x12\x13\n\x0blight_level\x18\x04 \x01(\x02\x12\x13\n\x0bwater_level\x18\x05 \x01(\x02\x12\x10\n\x08ph_value\x18\x06 \x01(\x02\"W\n\rControlStatus\x12\x0e\n\x06\x64\x65vice\x18\x01 \x01(\t\x12\x11\n\tis_active\x18\x02 \x01(\x08\x12\x13\n\x0bpower_level\x18\x03 \x01(\x02\x12\x0e\n\x06reason\x18\x04 \x01(\t\"=\n\nAlertEvent\x12\x10\n\x08severity\x18\x01 \x01(\t\x12\x0c\n\x04\x63ode\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\tb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x16mcubus/v1/events.proto\x12\tmcubus.v1\x1a\x1fgoogle/protobuf/timestamp.proto\"\x80\x02\n\x08\x42usEvent\x12\x10\n\x08\x65vent_id\x18\x01 \x01(\t\x12\x11\n\tmodule_id\x18\x02 \x01(\t\x12-\n\ttimestamp\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x0b\n\x03seq\x18\x04 \x01(\x04\x12,\n\x0bsensor_data\x18\n \x01(\x0b\x32\x15.mcubus.v1.SensorDataH\x00\x12\x32\n\x0e\x63ontrol_status\x18\x0b \x01(\x0b\x32\x18.mcubus.v1.ControlStatusH\x00\x12&\n\x05\x61lert\x18\x0c \x01(\x0b\x32\x15.mcubus.v1.AlertEventH\x00\x42\t\n\x07payload\"4\n\rBusEventBatch\x12#\n\x06\x65vents\x18\x01 \x03(\x0b\x32\x13.mcubus.v1.BusEvent\"E\n\x0cLatestValues\x12#\n\x06\x65vents\x18\x01 \x03(\x0b\x32\x13.mcubus.v1.BusEvent\x12\x10\n\x08last_seq\x18\x02 \x01(\x04\"\x86\x01\n\nSensorData\x12\x13\n\x0btemperature\x18\x01 \x01(\x02\x12\x10\n\x08humidity\x18\x02 \x01(\x02\x12\x15\n\rsoil_moisture\x18\x03 \x01(\x02\x12\x13\n\x0blight_level\x18\x04 \x01(\x02\x12\x13\n\x0bwater_level\x18\x05 \x01(\x02\x12\x10\n\x08ph_value\x18\x06 \x01(\x02\"W\n\rControlStatus\x12\x0e\n\x06\x64\x65vice\x18\x01 \x01(\t\x12\x11\n\tis_active\x18\x02 \x01(\x08\x12\x13\n\x0bpower_level\x18\x03 \x01(\x02\x12\x0e\n\x06reason\x18\x04 \x01(\t\"=\n\nAlertEvent\x12\x10\n\x08severity\x18\x01 \x01(\t\x12\x0c\n\x04\x63ode\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\tb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -33,11 +33,15 @@ _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'mcubus.v1.events_pb2', _glo
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
   _globals['_BUSEVENT']._serialized_start=71
-  _globals['_BUSEVENT']._serialized_end=314
-  _globals['_SENSORDATA']._serialized_start=317
-  _globals['_SENSORDATA']._serialized_end=451
-  _globals['_CONTROLSTATUS']._serialized_start=453
-  _globals['_CONTROLSTATUS']._serialized_end=540
-  _globals['_ALERTEVENT']._serialized_start=542
-  _globals['_ALERTEVENT']._serialized_end=603
+  _globals['_BUSEVENT']._serialized_end=327
+  _globals['_BUSEVENTBATCH']._serialized_start=329
+  _globals['_BUSEVENTBATCH']._serialized_end=381
+  _globals['_LATESTVALUES']._serialized_start=383
+  _globals['_LATESTVALUES']._serialized_end=452
+  _globals['_SENSORDATA']._serialized_start=455
+  _globals['_SENSORDATA']._serialized_end=589
+  _globals['_CONTROLSTATUS']._serialized_start=591
+  _globals['_CONTROLSTATUS']._serialized_end=678
+  _globals['_ALERTEVENT']._serialized_start=680
+  _globals['_ALERTEVENT']._serialized_end=741
 # @@protoc_insertion_point(module_scope)
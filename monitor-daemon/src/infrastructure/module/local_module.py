@@ -1,8 +1,12 @@
+import logging
+
 from typing import List
 
 from domain.sensor import Sensor, SensorReading
 from domain.module import SensorModule, ModuleType, ModuleInfo
 
+logger = logging.getLogger(__name__)
+
 
 class LocalSensorModule(SensorModule):
     """
@@ -49,9 +53,20 @@ class LocalSensorModule(SensorModule):
         return self._sensors
 
     def read_all(self) -> list[SensorReading]:
+        return self._read(self._sensors)
+
+    def read_sensors(self, sensor_ids: set[str]) -> list[SensorReading]:
+        return self._read([s for s in self._sensors if s.sensor_id in sensor_ids])
+
+    def _read(self, sensors: List[Sensor]) -> list[SensorReading]:
         readings = []
-        for sensor in self._sensors:
-            reading = sensor.read()
+        for sensor in sensors:
+            # One failing sensor must not cost the others their readings
+            try:
+                reading = sensor.read()
+            except Exception as e:
+                logger.warning("Sensor %s read failed: %s", sensor.sensor_id, e)
+                continue
 
             readings.append(SensorReading(
                 sensor_id=reading.sensor_id,
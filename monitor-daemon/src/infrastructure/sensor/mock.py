@@ -1,6 +1,9 @@
 import random
+import struct
+import time
 
 from domain.sensor import Sensor, SensorType, SensorReading
+from infrastructure.sensor.sht31 import crc8, SINGLE_SHOT_HIGH, PERIODIC_HIGH, PERIODIC_BREAK, PERIODIC_FETCH
 
 
 class MockTemperatureSensor(Sensor):
@@ -69,3 +72,75 @@ class MockHumiditySensor(Sensor):
             value=round(self._value, 1),
             unit="%"
         )
+
+
+class MockSHT31I2C:
+    """
+    Simulated SHT31 on the I2C bus, to run SHT31Device without hardware.
+    Conversions take as long as the chip's and reading before one is done
+    is refused like the chip's NACK. Counts bus transactions.
+    In periodic mode a fetch gets the latest result once, later fetches are
+    refused until the next one; stalled stops producing results.
+    """
+
+    # Typical high repeatability conversion
+    CONVERSION_SECONDS = 0.0125
+
+    def __init__(self, temperature: float = 26.0, humidity: float = 55.0, clock=time.monotonic):
+        self.temperature = temperature
+        self.humidity = humidity
+        self.transactions = 0
+        self.measurements = 0
+        self.stalled = False
+        self._clock = clock
+        self._ready_at: float | None = None
+        self._period: float | None = None
+        self._started_at = 0.0
+        self._fetched = 0
+        self._fetching = False
+
+    def __enter__(self) -> "MockSHT31I2C":
+        self.transactions += 1
+        return self
+
+    def __exit__(self, *exc) -> None:
+        ...
+
+    def write(self, buf) -> None:
+        (command,) = struct.unpack(">H", bytes(buf))
+        self._fetching = False
+        if command == SINGLE_SHOT_HIGH:
+            self.measurements += 1
+            self._ready_at = self._clock() + self.CONVERSION_SECONDS
+        elif command in PERIODIC_HIGH.values():
+            frequency = next(f for f, c in PERIODIC_HIGH.items() if c == command)
+            self._period = 1 / frequency
+            self._started_at = self._clock()
+            self._fetched = 0
+        elif command == PERIODIC_BREAK:
+            self._period = None
+        elif command == PERIODIC_FETCH:
+            self._fetching = True
+
+    def readinto(self, buf) -> None:
+        if self._fetching:
+            self._fetching = False
+            if self._period is None or self.stalled:
+                raise OSError("SHT31 NACK, not measuring")
+            # Results completed since periodic mode started, the newest not fetched yet
+            done = int((self._clock() - self._started_at - self.CONVERSION_SECONDS) // self._period) + 1
+            if done <= self._fetched:
+                raise OSError("SHT31 NACK, no new measurement")
+            self.measurements += done - self._fetched
+            self._fetched = done
+        elif self._ready_at is None or self._clock() < self._ready_at:
+            raise OSError("SHT31 NACK, no measurement ready")
+        else:
+            self._ready_at = None
+        buf[:6] = self.encode(self.temperature, self.humidity)
+
+    @staticmethod
+    def encode(temperature: float, humidity: float) -> bytes:
+        t = struct.pack(">H", round((temperature + 45) / 175 * 65535))
+        h = struct.pack(">H", round(humidity / 100 * 65535))
+        return t + bytes([crc8(t)]) + h + bytes([crc8(h)])
@@ -1,26 +1,159 @@
+import struct
+import threading
+import time
+
 from domain.sensor import Sensor, SensorType, SensorReading
 
+SHT31_ADDRESS = 0x44
+
+# Commands, see the SHT3x-DIS datasheet
+SINGLE_SHOT_HIGH = 0x2400
+PERIODIC_BREAK = 0x3093
+PERIODIC_FETCH = 0xE000
+SOFT_RESET = 0x30A2
+
+# Periodic acquisition, high repeatability: measurements per second -> start command
+PERIODIC_HIGH = {0.5: 0x2032, 1: 0x2130, 2: 0x2236, 4: 0x2334, 10: 0x2737}
+
+MODE_SINGLE = "single"
+MODE_PERIODIC = "periodic"
+
+# Longest high repeatability conversion
+CONVERSION_SECONDS = 0.0155
+
+# How long a measurement is served to every sensor reading the device
+DEFAULT_MAX_AGE = 1.0
+
+# Periods without a new periodic measurement before its data counts as stale
+STALE_PERIODS = 3
+
+
+def crc8(data: bytes) -> int:
+    crc = 0xFF
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x31) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+    return crc
+
+
+def decode(data: bytes) -> tuple[float, float]:
+    """
+    Six bytes as sent by the chip, into (temperature °C, relative humidity %).
+    :raise OSError: CRC mismatch
+    """
+    for word in (data[0:3], data[3:6]):
+        if crc8(word[:2]) != word[2]:
+            raise OSError("SHT31 CRC mismatch")
+    raw_temperature, raw_humidity = struct.unpack(">HxHx", data)
+    return -45 + 175 * raw_temperature / 65535, 100 * raw_humidity / 65535
+
 
 class SHT31Device:
     """
     Internal shared device wrapper.
-    Only this class touches I2C / adafruit.
+    Only this class touches I2C. The chip measures temperature and humidity
+    together, the pair is kept for max_age seconds so both sensors read in
+    one poll share a single bus transaction.
+
+    In periodic mode the chip measures on its own at the given frequency and
+    reads only fetch the latest result, without waiting for a conversion.
+    The pair is then kept for one period, nothing newer exists before.
     """
 
-    def __init__(self):
-        # Delayed import for Raspberry Pi environment
-        import board
-        import busio
-        import adafruit_sht31d
+    def __init__(
+            self,
+            max_age: float = DEFAULT_MAX_AGE,
+            i2c_device=None,
+            mode: str = MODE_SINGLE,
+            frequency: float = 2,
+    ):
+        if mode not in (MODE_SINGLE, MODE_PERIODIC):
+            raise ValueError(f"Unknown SHT31 mode {mode!r}")
+        if mode == MODE_PERIODIC and frequency not in PERIODIC_HIGH:
+            raise ValueError(f"SHT31 periodic frequency must be one of {sorted(PERIODIC_HIGH)}")
+
+        if i2c_device is None:
+            # Delayed import for Raspberry Pi environment
+            import board
+            import busio
+            from adafruit_bus_device.i2c_device import I2CDevice
+
+            i2c_device = I2CDevice(busio.I2C(board.SCL, board.SDA), SHT31_ADDRESS)
+
+        self._i2c = i2c_device
+        self._mode = mode
+        self._period = 1 / frequency
+        self._max_age = self._period if mode == MODE_PERIODIC else max_age
+        self._lock = threading.Lock()
+        self._measurement: tuple[float, float] | None = None
+        self._measured_at = float("-inf")
+
+        self._command(PERIODIC_BREAK)
+        time.sleep(0.001)
+        self._command(SOFT_RESET)
+        time.sleep(0.0015)
+
+        if mode == MODE_PERIODIC:
+            self._command(PERIODIC_HIGH[frequency])
+            # The first result is ready one period and a conversion later
+            self._updated_at = time.monotonic() + self._period + CONVERSION_SECONDS
 
-        i2c = busio.I2C(board.SCL, board.SDA)
-        self._dev = adafruit_sht31d.SHT31D(i2c)
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    def _command(self, command: int) -> None:
+        with self._i2c as i2c:
+            i2c.write(struct.pack(">H", command))
+
+    def _measure(self) -> tuple[float, float]:
+        self._command(SINGLE_SHOT_HIGH)
+        time.sleep(CONVERSION_SECONDS)
+        data = bytearray(6)
+        with self._i2c as i2c:
+            i2c.readinto(data)
+        return decode(data)
+
+    def _fetch(self) -> tuple[float, float]:
+        """
+        Latest periodic result, the previous one while the chip has nothing newer.
+        :raise OSError: no new result for STALE_PERIODS periods
+        """
+        if self._measurement is None:
+            # Right after start, wait for the first result rather than fail
+            time.sleep(max(self._updated_at - time.monotonic(), 0))
+
+        self._command(PERIODIC_FETCH)
+        data = bytearray(6)
+        try:
+            with self._i2c as i2c:
+                i2c.readinto(data)
+        except OSError:
+            # The chip NACKs a fetch when no result came since the last one
+            silent = time.monotonic() - self._updated_at
+            if self._measurement is None or silent > STALE_PERIODS * self._period:
+                raise OSError(f"SHT31 data stale, no new measurement for {silent:.1f}s") from None
+            return self._measurement
+
+        self._updated_at = time.monotonic()
+        return decode(data)
+
+    def read(self) -> tuple[float, float]:
+        """
+        (temperature, humidity), measured at most max_age seconds ago.
+        """
+        with self._lock:
+            if time.monotonic() - self._measured_at > self._max_age:
+                self._measurement = self._fetch() if self._mode == MODE_PERIODIC else self._measure()
+                self._measured_at = time.monotonic()
+            return self._measurement
 
     def read_temperature(self) -> float:
-        return float(self._dev.temperature)
+        return self.read()[0]
 
     def read_humidity(self) -> float:
-        return float(self._dev.relative_humidity)
+        return self.read()[1]
 
 
 class SHT31TemperatureSensor(Sensor):
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from application.monitor_service import MonitorService
 from interface.http.dependencies import get_monitor_service
@@ -12,6 +12,9 @@ router = APIRouter(
 @router.get("/all-status")
 async def get_all_status(
         service: MonitorService = Depends(get_monitor_service),
+        max_age: float | None = Query(None, ge=0, description="Poll first if a reading is older, in seconds"),
 ):
-    service.poll()
-    return service.snapshot()
+    if max_age is None:
+        # Polled in the background, never waits on a sensor
+        return service.snapshot()
+    return await service.refresh(max_age)
@@ -76,6 +76,9 @@ class MonitorClient:
             for event in event_stream:
                 if not self._running:
                     break
+                # Heartbeat of an idle stream
+                if event.WhichOneof("payload") is None:
+                    continue
                 self._handle_event(event)
 
         except grpc.RpcError as e:
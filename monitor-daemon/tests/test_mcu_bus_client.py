@@ -0,0 +1,39 @@
+import asyncio
+
+from clients.mcu.mcu_bus_client import MCUBusClient
+from generated.mcubus.v1.events_pb2 import BusEvent, BusEventBatch, SensorData
+
+
+class FakeStub:
+    def __init__(self, events):
+        self.events = events
+
+    async def SubscribeEvents(self, request):
+        for event in self.events:
+            yield event
+
+    async def SubscribeEventBatches(self, request):
+        for event in self.events:
+            yield BusEventBatch(events=[event] if event.WhichOneof("payload") else [])
+
+
+def _client(events) -> MCUBusClient:
+    client = MCUBusClient.__new__(MCUBusClient)
+    client._stub = FakeStub(events)
+    return client
+
+
+async def _collect(stream) -> list:
+    return [item async for item in stream]
+
+
+def test_heartbeats_are_not_passed_to_consumers():
+    sample = BusEvent(seq=1, module_id="mcu_1", sensor_data=SensorData(temperature=21.5))
+    heartbeat = BusEvent(seq=1)
+    client = _client([heartbeat, sample, heartbeat])
+
+    events = asyncio.run(_collect(client.subscribe_events()))
+    batches = asyncio.run(_collect(client.subscribe_event_batches()))
+
+    assert events == [sample]
+    assert [list(batch.events) for batch in batches] == [[sample]]
@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+from application.monitor_poller import MonitorPoller
+from application.monitor_service import MonitorService
+from domain.sensor import SensorType, SensorReading
+from infrastructure.module.local_module import LocalSensorModule
+
+
+class CountingSensor:
+    def __init__(self, sensor_id: str, latency: float = 0.0):
+        self.sensor_id = sensor_id
+        self.sensor_type = SensorType.TEMPERATURE
+        self.latency = latency
+        self.reads = 0
+
+    def read(self) -> SensorReading:
+        time.sleep(self.latency)
+        self.reads += 1
+        return SensorReading(self.sensor_id, self.sensor_type, float(self.reads), "°C")
+
+
+def test_poller_reads_each_sensor_on_its_own_interval_off_the_event_loop():
+    fast, slow = CountingSensor("fast"), CountingSensor("slow", latency=0.2)
+    module = LocalSensorModule(module_id="test_module")
+    module.add_sensor(fast)
+    module.add_sensor(slow)
+    service = MonitorService(modules=[module])
+    poller = MonitorPoller(service, interval=60.0, intervals={"fast": 0.05}, jitter=0.2)
+
+    async def scenario():
+        poller.start()
+        # Requests meanwhile see the snapshot right away, not the sensor latency
+        latencies = []
+        for _ in range(20):
+            started = time.perf_counter()
+            service.snapshot()
+            latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(0.03)
+        await poller.stop()
+        return max(latencies)
+
+    worst = asyncio.run(scenario())
+
+    assert worst < 0.05
+    assert slow.reads == 1
+    assert fast.reads >= 4
+    snapshot = service.snapshot()
+    assert snapshot["readings"]["fast"]["module"] == "test_module"
+    assert snapshot["readings"]["slow"]["value"] == 1.0
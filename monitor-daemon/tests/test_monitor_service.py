@@ -1,3 +1,4 @@
+import asyncio
 import time
 
 from application.monitor_service import MonitorService
@@ -25,3 +26,54 @@ def test_monitor_service_poll_and_snapshot():
 
     # Assert
     assert len(snapshot) > 0
+
+
+def test_concurrent_refreshes_share_one_poll_and_fresh_snapshots_skip_it():
+    sensor = MockTemperatureSensor(base=26.5)
+    reads = []
+    read = sensor.read
+    sensor.read = lambda: reads.append(time.sleep(0.1)) or read()
+
+    module = LocalSensorModule(module_id="test_module")
+    module.add_sensor(sensor)
+    service = MonitorService(modules=[module])
+
+    async def scenario():
+        snapshots = await asyncio.gather(*(service.refresh(max_age=5.0) for _ in range(12)))
+        assert len(reads) == 1
+        assert all(s == snapshots[0] for s in snapshots)
+
+        # Fresh enough, served from the snapshot
+        await service.refresh(max_age=5.0)
+        assert len(reads) == 1
+
+        await service.refresh(max_age=0.0)
+        assert len(reads) == 2
+
+    asyncio.run(scenario())
+
+
+def test_a_failing_sensor_does_not_force_a_poll_per_refresh():
+    sensor = MockTemperatureSensor(base=26.5)
+    broken = MockHumiditySensor(base=55.2)
+    reads = []
+    read = sensor.read
+    sensor.read = lambda: reads.append(1) or read()
+
+    def fail():
+        raise OSError("SHT31 data stale")
+
+    broken.read = fail
+
+    module = LocalSensorModule(module_id="test_module")
+    module.add_sensor(sensor)
+    module.add_sensor(broken)
+    service = MonitorService(modules=[module])
+
+    async def scenario():
+        for _ in range(3):
+            snapshot = await service.refresh(max_age=5.0)
+        assert len(reads) == 1
+        assert list(snapshot["readings"]) == [sensor.sensor_id]
+
+    asyncio.run(scenario())
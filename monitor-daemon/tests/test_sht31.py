@@ -0,0 +1,105 @@
+import time
+
+import pytest
+
+from application.monitor_service import MonitorService
+from infrastructure.module.local_module import LocalSensorModule
+from infrastructure.sensor.mock import MockHumiditySensor, MockSHT31I2C
+from infrastructure.sensor.sht31 import SHT31Device, SHT31TemperatureSensor, SHT31HumiditySensor, decode
+
+
+def test_both_sensors_share_one_measurement_per_poll():
+    bus = MockSHT31I2C(temperature=24.3, humidity=61.5)
+    device = SHT31Device(max_age=0.2, i2c_device=bus)
+    module = LocalSensorModule(module_id="test_module")
+    module.add_sensor(SHT31TemperatureSensor(device))
+    module.add_sensor(SHT31HumiditySensor(device))
+    service = MonitorService(modules=[module])
+    setup = bus.transactions
+
+    service.poll()
+
+    readings = service.snapshot()["readings"]
+    assert readings["sht31-temperature-sensor"]["value"] == pytest.approx(24.3, abs=0.01)
+    assert readings["sht31-humidity-sensor"]["value"] == pytest.approx(61.5, abs=0.01)
+    # Command and read, once for both
+    assert bus.measurements == 1
+    assert bus.transactions - setup == 2
+
+    time.sleep(0.2)
+    service.poll()
+    assert bus.measurements == 2
+
+
+def test_corrupted_measurement_is_rejected():
+    data = bytearray(MockSHT31I2C.encode(24.3, 61.5))
+    data[4] ^= 0x01
+
+    with pytest.raises(OSError):
+        decode(data)
+
+
+def _read_latency(device: SHT31Device, reads: int, gap: float) -> float:
+    # Reads a period apart, each one goes to the bus
+    latencies = []
+    for _ in range(reads):
+        time.sleep(gap)
+        started = time.perf_counter()
+        device.read()
+        latencies.append(time.perf_counter() - started)
+    return max(latencies)
+
+
+def test_periodic_mode_reads_are_fetch_only():
+    bus = MockSHT31I2C(temperature=24.3)
+    single = SHT31Device(max_age=0.0, i2c_device=MockSHT31I2C())
+    periodic = SHT31Device(i2c_device=bus, mode="periodic", frequency=10)
+
+    # The first periodic read waits for the chip's first result
+    assert periodic.read_temperature() == pytest.approx(24.3, abs=0.01)
+
+    fetched = bus.measurements
+    single_latency = _read_latency(single, 5, gap=0.0)
+    periodic_latency = _read_latency(periodic, 5, gap=0.1)
+
+    assert single_latency >= 0.015
+    assert periodic_latency < 0.005
+    assert bus.measurements - fetched >= 5
+
+
+def test_periodic_mode_detects_stale_data():
+    bus = MockSHT31I2C()
+    device = SHT31Device(i2c_device=bus, mode="periodic", frequency=10)
+    device.read()
+
+    # A missed result or two is tolerated, the last one is served
+    bus.stalled = True
+    time.sleep(0.15)
+    device.read()
+
+    time.sleep(0.2)
+    with pytest.raises(OSError, match="stale"):
+        device.read()
+
+    bus.stalled = False
+    time.sleep(0.1)
+    device.read()
+
+
+def test_stalled_sht31_does_not_block_other_sensors():
+    bus = MockSHT31I2C()
+    device = SHT31Device(i2c_device=bus, mode="periodic", frequency=10)
+    module = LocalSensorModule(module_id="test_module")
+    module.add_sensor(SHT31TemperatureSensor(device))
+    module.add_sensor(MockHumiditySensor())
+    service = MonitorService(modules=[module])
+    service.poll()
+    before = service.snapshot()["readings"]
+
+    bus.stalled = True
+    time.sleep(0.4)
+    service.poll()
+
+    after = service.snapshot()["readings"]
+    assert after["mock_humidity_sensor"]["timestamp"] > before["mock_humidity_sensor"]["timestamp"]
+    assert after["sht31-temperature-sensor"] == before["sht31-temperature-sensor"]